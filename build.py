@@ -1,18 +1,142 @@
 import os
 import sys
+import json
+import time
 import platform
+import argparse
+import statistics
 import subprocess
+import tempfile
 from pathlib import Path
 import shutil
 
 # -------- User Configuration --------
 MAIN_SCRIPT = "main.py"  # Change if your main script is different
+APP_NAME = "main"  # Name of the built executable
 ASSETS_SRC = Path("assets")  # Relative to this script's location
 ICON_PATH = ASSETS_SRC / "images" / "logo.ico"  # Path to your icon file for exe
 DIST_DIR = Path("dist")
 BUILD_DIR = Path("build")
+REPORT_FILE = DIST_DIR / "build-report.json"
+# Honored by gui.py: the value is a marker file written once the window is shown
+STARTUP_PROBE_ENV = "CP_DATASET_GUI_STARTUP_PROBE"
+STARTUP_PROBE_MARKER = "startup-probe.ok"
+STARTUP_RUNS = 5
+STARTUP_TIMEOUT = 120
+# Honored by main.py: imports every lazily loaded module, exits non-zero if any is missing
+SELFTEST_IMPORTS_FLAG = "--selftest-imports"
 # ------------------------------------
 
+# The app only uses QtCore/QtGui/QtWidgets; everything else PyQt6 ships is dead
+# weight that the onefile bootloader would unpack on every launch. QtSvg stays:
+# matplotlib's qt_compat imports it unconditionally.
+QT_EXCLUDES = [
+    "PyQt6.QtBluetooth",
+    "PyQt6.QtDBus",
+    "PyQt6.QtDesigner",
+    "PyQt6.QtHelp",
+    "PyQt6.QtMultimedia",
+    "PyQt6.QtMultimediaWidgets",
+    "PyQt6.QtNetwork",
+    "PyQt6.QtNfc",
+    "PyQt6.QtOpenGL",
+    "PyQt6.QtOpenGLWidgets",
+    "PyQt6.QtPdf",
+    "PyQt6.QtPdfWidgets",
+    "PyQt6.QtPositioning",
+    "PyQt6.QtPrintSupport",
+    "PyQt6.QtQml",
+    "PyQt6.QtQuick",
+    "PyQt6.QtQuick3D",
+    "PyQt6.QtQuickWidgets",
+    "PyQt6.QtRemoteObjects",
+    "PyQt6.QtSensors",
+    "PyQt6.QtSerialPort",
+    "PyQt6.QtSpatialAudio",
+    "PyQt6.QtSql",
+    "PyQt6.QtSvgWidgets",
+    "PyQt6.QtTest",
+    "PyQt6.QtTextToSpeech",
+    "PyQt6.QtWebChannel",
+    "PyQt6.QtWebSockets",
+    "PyQt6.QtXml",
+    "PyQt6.uic",
+]
+
+# Charts render through Agg (report), SVG (report) and QtAgg (dialog) only.
+MATPLOTLIB_EXCLUDES = [
+    "matplotlib.backends.backend_cairo",
+    "matplotlib.backends.backend_gtk3",
+    "matplotlib.backends.backend_gtk3agg",
+    "matplotlib.backends.backend_gtk3cairo",
+    "matplotlib.backends.backend_gtk4",
+    "matplotlib.backends.backend_gtk4agg",
+    "matplotlib.backends.backend_gtk4cairo",
+    "matplotlib.backends.backend_macosx",
+    "matplotlib.backends.backend_nbagg",
+    "matplotlib.backends.backend_pgf",
+    "matplotlib.backends.backend_qtcairo",
+    "matplotlib.backends.backend_template",
+    "matplotlib.backends.backend_tkagg",
+    "matplotlib.backends.backend_tkcairo",
+    "matplotlib.backends.backend_webagg",
+    "matplotlib.backends.backend_webagg_core",
+    "matplotlib.backends.backend_wx",
+    "matplotlib.backends.backend_wxagg",
+    "matplotlib.backends.backend_wxcairo",
+    "matplotlib.pyplot",
+    "tkinter",
+    "IPython",
+    "PIL.ImageTk",
+]
+
+# Qt plugin directories the app never loads. PyInstaller has no command-line
+# switch for these, so they are pruned from onedir builds after the fact.
+QT_PLUGIN_EXCLUDES = [
+    "designer",
+    "generic",
+    "multimedia",
+    "networkinformation",
+    "position",
+    "printsupport",
+    "qmltooling",
+    "sensors",
+    "sqldrivers",
+    "texttospeech",
+    "tls",
+    "virtualkeyboard",
+    "webview",
+]
+
+# Build profiles. "onefile" is the historical default; "onedir" variants skip
+# the per-launch unpack into a temp directory and usually start much faster.
+PROFILES = {
+    "onefile": {
+        "description": "Single executable, everything bundled (original build)",
+        "onefile": True,
+        "excludes": False,
+        "optimize": 0,
+    },
+    "onefile-lean": {
+        "description": "Single executable without unused Qt modules/backends",
+        "onefile": True,
+        "excludes": True,
+        "optimize": 1,
+    },
+    "onedir": {
+        "description": "Folder build, everything bundled",
+        "onefile": False,
+        "excludes": False,
+        "optimize": 0,
+    },
+    "onedir-lean": {
+        "description": "Folder build without unused Qt modules/plugins/backends",
+        "onefile": False,
+        "excludes": True,
+        "optimize": 1,
+    },
+}
+
 
 def check_pyinstaller():
     try:
@@ -22,78 +146,321 @@ def check_pyinstaller():
         subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller"])
 
 
-def build_command(current_platform):
+def build_command(current_platform, profile="onefile", precompile=None):
+    """Return the PyInstaller command line for a build profile."""
+    options = PROFILES[profile]
+    assets = ASSETS_SRC.resolve()
     # Set --add-data flag syntax and icon flag
     if os.name == "nt":  # Windows
-        add_data = f"{ASSETS_SRC}{os.pathsep}assets"
-        icon_flag = ["--icon", str(ICON_PATH)] if ICON_PATH.exists() else []
+        add_data = f"{assets}{os.pathsep}assets"
+        icon_flag = ["--icon", str(ICON_PATH.resolve())] if ICON_PATH.exists() else []
     else:  # POSIX (Linux/macOS)
-        add_data = f"{ASSETS_SRC}:assets"
+        add_data = f"{assets}:assets"
         # .ico icons are not supported on Linux/macOS for PyInstaller, use .icns for macOS if available
         if current_platform == "darwin" and ICON_PATH.with_suffix(".icns").exists():
-            icon_flag = ["--icon", str(ICON_PATH.with_suffix(".icns"))]
+            icon_flag = ["--icon", str(ICON_PATH.with_suffix(".icns").resolve())]
         else:
             icon_flag = []
 
+    exclude_flags = []
+    if options["excludes"]:
+        for module in QT_EXCLUDES + MATPLOTLIB_EXCLUDES:
+            exclude_flags += ["--exclude-module", module]
+    optimize = options["optimize"] if precompile is None else precompile
+    # Bytecode optimization level for the bundled .pyc files (PyInstaller >= 6.6)
+    optimize_flag = ["--optimize", str(optimize)] if optimize else []
+
     cmd = [
         "pyinstaller",
-        "--onefile",
+        "--noconfirm",
+        "--onefile" if options["onefile"] else "--onedir",
         "--windowed",
+        "--name",
+        APP_NAME,
+        "--distpath",
+        str(DIST_DIR / profile),
+        "--workpath",
+        str(BUILD_DIR / profile),
+        "--specpath",
+        str(BUILD_DIR / profile),
         "--add-data",
         add_data,
         *icon_flag,
+        *exclude_flags,
+        *optimize_flag,
         MAIN_SCRIPT,
     ]
+    if current_platform == "linux":
+        # Stripping symbols shrinks the shared libraries the loader has to map
+        cmd.insert(-1, "--strip")
     return cmd
 
 
-def copy_assets_to_dist():
+def artifact_path(profile):
+    """Path to the executable a profile produces."""
+    exe = APP_NAME + (".exe" if os.name == "nt" else "")
+    if PROFILES[profile]["onefile"]:
+        return DIST_DIR / profile / exe
+    return DIST_DIR / profile / APP_NAME / exe
+
+
+def prune_qt_plugins(profile):
+    """Remove unused Qt plugin directories from an onedir build."""
+    if PROFILES[profile]["onefile"] or not PROFILES[profile]["excludes"]:
+        return 0
+    removed = 0
+    for plugins in (DIST_DIR / profile).rglob("plugins"):
+        if plugins.parent.name != "Qt6":
+            continue
+        for name in QT_PLUGIN_EXCLUDES:
+            target = plugins / name
+            if target.is_dir():
+                shutil.rmtree(target)
+                removed += 1
+    return removed
+
+
+def copy_assets_to_dist(profile):
     """
-    Ensure the assets folder is present in the dist directory after build.
+    Ensure the assets folder is present next to the built executable.
     """
-    dist_assets = DIST_DIR / "assets"
+    dist_assets = artifact_path(profile).parent / "assets"
     if dist_assets.exists():
         shutil.rmtree(dist_assets)
     shutil.copytree(ASSETS_SRC, dist_assets)
     print(f"Copied {ASSETS_SRC} to {dist_assets}.")
 
 
-def clean():
-    if DIST_DIR.exists():
-        shutil.rmtree(DIST_DIR)
-    if BUILD_DIR.exists():
-        shutil.rmtree(BUILD_DIR)
+def clean(profiles=None):
+    """Remove build outputs, either everything or just the given profiles."""
+    if profiles is None:
+        targets = [DIST_DIR, BUILD_DIR]
+    else:
+        targets = [d / p for p in profiles for d in (DIST_DIR, BUILD_DIR)]
+    for target in targets:
+        if target.exists():
+            shutil.rmtree(target)
     for spec in Path(".").glob("*.spec"):
         spec.unlink()
     print("Cleaned previous builds.")
 
 
-def main():
-    print("One-click PyInstaller build script.")
-    print("This script must be run on the OS you want to build for.")
-    print("---------------------------------------------------------")
-    print("1. Clean previous build")
-    print("2. Build for current platform")
-    print("---------------------------------------------------------")
-    clean()
-    check_pyinstaller()
-    current_platform = platform.system().lower()
-    cmd = build_command(current_platform)
+def bundle_size(profile):
+    """Return (total bytes, file count) of what a profile ships."""
+    root = artifact_path(profile)
+    if PROFILES[profile]["onefile"]:
+        return root.stat().st_size, 1
+    files = [p for p in root.parent.rglob("*") if p.is_file()]
+    return sum(p.stat().st_size for p in files), len(files)
+
+
+def probe_env():
+    """Environment for launching a built artifact, headless where needed."""
+    env = dict(os.environ)
+    if platform.system() == "Linux" and not env.get("DISPLAY"):
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return env
+
+
+def check_imports(profile):
+    """
+    Run the artifact's import self-test. The startup probe only covers what
+    the app loads before its window is shown; chart backends and other
+    modules imported on first use would otherwise only fail in front of a
+    user. Raises RuntimeError naming the modules that are missing.
+    """
+    exe = artifact_path(profile).resolve()
+    with tempfile.TemporaryDirectory() as cwd:
+        result = subprocess.run(
+            [str(exe), SELFTEST_IMPORTS_FLAG],
+            cwd=cwd,
+            env=probe_env(),
+            timeout=STARTUP_TIMEOUT,
+            capture_output=True,
+            text=True,
+        )
+    if result.returncode != 0:
+        failed = [line for line in result.stdout.splitlines() if "FAILED" in line]
+        details = "\n".join(failed) or f"exit code {result.returncode}"
+        raise RuntimeError(f"{exe} {SELFTEST_IMPORTS_FLAG} failed:\n{details}")
+
+
+def measure_startup(profile, runs=STARTUP_RUNS):
+    """
+    Launch the built app `runs` times and time how long it takes until the
+    main window is shown. Each run uses a fresh working directory so the
+    database is created from scratch and the user's data is never touched.
+    A run only counts if the app wrote the probe marker after showing its
+    window, so an artifact that crashes on startup raises instead of
+    looking fast.
+    """
+    exe = artifact_path(profile).resolve()
+    env = probe_env()
+    timings = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as cwd:
+            shutil.copytree(ASSETS_SRC, Path(cwd) / "assets")
+            marker = Path(cwd) / STARTUP_PROBE_MARKER
+            env[STARTUP_PROBE_ENV] = str(marker)
+            start = time.perf_counter()
+            subprocess.run(
+                [str(exe)],
+                cwd=cwd,
+                env=env,
+                check=True,
+                timeout=STARTUP_TIMEOUT,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            elapsed = time.perf_counter() - start
+            if not marker.exists():
+                raise RuntimeError(
+                    f"{exe} exited without showing its main window "
+                    f"(no {STARTUP_PROBE_MARKER} written)"
+                )
+            timings.append(elapsed)
+    return timings
+
+
+def write_report(profiles, runs=STARTUP_RUNS):
+    """Measure built profiles, print a comparison table and save it as JSON."""
+    rows = []
+    for profile in profiles:
+        if not artifact_path(profile).exists():
+            print(f"Skipping {profile}: {artifact_path(profile)} not found.")
+            continue
+        size, files = bundle_size(profile)
+        error = None
+        try:
+            check_imports(profile)
+            timings = measure_startup(profile, runs) if runs else []
+        except (RuntimeError, subprocess.SubprocessError) as e:
+            # A broken artifact is reported, never ranked
+            print(f"Probe failed for {profile}: {e}")
+            timings, error = [], str(e)
+        rows.append(
+            {
+                "profile": profile,
+                "artifact": str(artifact_path(profile)),
+                "bytes": size,
+                "files": files,
+                "startup_median": statistics.median(timings) if timings else None,
+                "startup_min": min(timings) if timings else None,
+                "startup_runs": timings,
+                "startup_error": error,
+            }
+        )
+    if not rows:
+        return []
+    rows.sort(
+        key=lambda r: (
+            r["startup_median"] is None,
+            r["startup_median"] or 0,
+            r["bytes"],
+        )
+    )
+    print()
+    print(f"{'profile':<14} {'size (MB)':>10} {'files':>7} {'startup (s)':>12}")
+    for row in rows:
+        startup = "failed" if row["startup_error"] else "-"
+        if row["startup_median"] is not None:
+            startup = f"{row['startup_median']:.2f}"
+        print(
+            f"{row['profile']:<14} {row['bytes'] / 2**20:>10.1f} "
+            f"{row['files']:>7} {startup:>12}"
+        )
+    if rows[0]["startup_median"] is not None:
+        print(f"\nFastest launch: {rows[0]['profile']} ({rows[0]['artifact']})")
+    DIST_DIR.mkdir(exist_ok=True)
+    report = {"platform": platform.system().lower(), "profiles": rows}
+    REPORT_FILE.write_text(json.dumps(report, indent=2))
+    print(f"Report written to {REPORT_FILE}.")
+    return rows
+
+
+def build(profile, current_platform, precompile=None):
+    """Build one profile and copy the assets next to its executable."""
+    cmd = build_command(current_platform, profile, precompile)
     print(f"Running: {' '.join(map(str, cmd))}")
     subprocess.check_call(cmd)
-    # Copy assets folder to dist so it is available for the onefile binary
-    copy_assets_to_dist()
-    if current_platform == "windows":
-        print("Your EXE and assets are in the dist/ folder.")
-    elif current_platform == "linux":
-        print("Your Linux binary and assets are in the dist/ folder.")
-    elif current_platform == "darwin":
-        print("Your macOS binary and assets are in the dist/ folder.")
-    else:
+    pruned = prune_qt_plugins(profile)
+    if pruned:
+        print(f"Pruned {pruned} unused Qt plugin folders.")
+    # Copy assets folder so it is available next to the binary
+    copy_assets_to_dist(profile)
+    if PROFILES[profile]["excludes"]:
+        # Excluding modules by name can drop one the app imports later on
+        check_imports(profile)
+        print(f"Import self-test passed for {profile}.")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="One-click PyInstaller build script. "
+        "Must be run on the OS you want to build for."
+    )
+    parser.add_argument(
+        "--profile",
+        action="append",
+        choices=[*PROFILES, "all"],
+        help="Build profile (repeatable, default: onefile)",
+    )
+    parser.add_argument(
+        "--precompile",
+        type=int,
+        choices=[0, 1, 2],
+        help="Override the bytecode optimization level of the profile",
+    )
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Measure bundle size and startup time of the built profiles",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=STARTUP_RUNS,
+        help=f"Launches per profile when measuring startup (default {STARTUP_RUNS})",
+    )
+    parser.add_argument(
+        "--no-build",
+        action="store_true",
+        help="Skip building; only report on existing artifacts",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="List build profiles and exit"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.list:
+        for name, options in PROFILES.items():
+            print(f"{name:<14} {options['description']}")
+        return
+    profiles = args.profile or ["onefile"]
+    if "all" in profiles:
+        profiles = list(PROFILES)
+    profiles = list(dict.fromkeys(profiles))
+    current_platform = platform.system().lower()
+    if current_platform not in ("windows", "linux", "darwin"):
         print(f"Unsupported platform: {current_platform}")
         sys.exit(1)
+
+    if not args.no_build:
+        print("One-click PyInstaller build script.")
+        print("This script must be run on the OS you want to build for.")
+        print("---------------------------------------------------------")
+        clean(profiles)
+        check_pyinstaller()
+        for profile in profiles:
+            build(profile, current_platform, args.precompile)
+            print(f"Built {profile}: {artifact_path(profile)}")
+    if args.report:
+        write_report(profiles, args.runs)
     print("Done!")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
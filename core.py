@@ -0,0 +1,4170 @@
+"""Database, import/export and indexing code shared by the GUI and the command line.
+
+Nothing here may import Qt: the command line and the process pools import this
+module on machines without a display.
+"""
+
+import abc
+import sys
+import os
+import re
+import sqlite3
+import json
+import csv
+import heapq
+import hashlib
+import tempfile
+import copy
+import time
+import zlib
+import gzip
+import zipfile
+import asyncio
+import ssl
+import urllib.parse
+import multiprocessing
+import queue
+import mmap
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:  # optional, only needed for the zstd compression codec
+    zstandard = None
+
+try:
+    import duckdb
+except ImportError:  # optional, only needed for the duckdb storage backend
+    duckdb = None
+
+
+# Implementation code can exceed the csv module's default field size limit
+csv.field_size_limit(2**31 - 1)
+
+
+DB_FILE = "cp_dataset.db"
+
+# Extra dataset files attached read-only next to DB_FILE (see connect_federated)
+ATTACHED_DATABASES = []
+# SQLite's default SQLITE_LIMIT_ATTACHED
+MAX_ATTACHED_DATABASES = 10
+
+
+def federation_schemas():
+    """Return ``(schema, path)`` for the main database and every attached one."""
+    return [("main", DB_FILE)] + [
+        (f"fed{i}", path) for i, path in enumerate(ATTACHED_DATABASES, 1)
+    ]
+
+
+def connect_federated():
+    """Open DB_FILE with every database in ATTACHED_DATABASES attached read-only.
+
+    Attached databases are available as schemas ``fed1``, ``fed2``, ... so queries
+    can be run against each of them in turn without copying any data.
+    """
+    conn = sqlite3.connect(DB_FILE)
+    for schema, path in federation_schemas()[1:]:
+        uri = f"file:{urllib.parse.quote(os.path.abspath(path))}?mode=ro"
+        conn.execute(f"ATTACH DATABASE ? AS {schema}", (uri,))
+    return conn
+
+
+def grouped_counts(rows, counts=None):
+    """Add ``(*key, count)`` rows to a ``{key: count}`` dict and return it.
+
+    Rows grouped by several columns are keyed by tuples.
+    """
+    counts = {} if counts is None else counts
+    for *key, count in rows:
+        key = tuple(key) if len(key) > 1 else key[0]
+        counts[key] = counts.get(key, 0) + count
+    return counts
+
+
+def federated_counts(query, schemas=None, backend=None):
+    """Run a ``key, COUNT(*) ... GROUP BY key`` query on every database and merge it.
+
+    ``query`` uses ``{schema}`` in place of the schema name, so each database
+    aggregates its own rows and only the per-key counts are combined. Queries
+    grouping by several columns are keyed by tuples. ``schemas`` limits the
+    query to some of the databases. With a storage ``backend`` the main
+    database is aggregated by it instead of by SQLite.
+    """
+    counts = {}
+    conn = connect_federated()
+    try:
+        for schema, _ in schemas or federation_schemas():
+            if schema == "main" and backend is not None:
+                for key, count in backend.aggregate(query).items():
+                    counts[key] = counts.get(key, 0) + count
+            else:
+                grouped_counts(conn.execute(query.format(schema=schema)), counts)
+    finally:
+        conn.close()
+    return counts
+
+
+def chart_filter_condition(field, value):
+    """Return an SQL condition on ``problems p`` matching a chart bar.
+
+    The condition may contain ``{schema}`` for the database being queried.
+    "Unknown" bars match missing values.
+    """
+    if field == "tag":
+        escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        # Tags are matched as whole comma separated items
+        return (
+            "(',' || REPLACE(REPLACE(p.tags, ', ', ','), ' ,', ',') || ',') LIKE ? ESCAPE '\\'",
+            [f"%,{escaped},%"],
+        )
+    if field == "difficulty":
+        if value == "Unknown":
+            return "COALESCE(p.difficulty, '') = ''", []
+        return "p.difficulty = ?", [value]
+    if field == "language":
+        condition = (
+            "COALESCE(language, '') = ''" if value == "Unknown" else "language = ?"
+        )
+        return (
+            f"p.id IN (SELECT problem_id FROM {{schema}}.solutions WHERE {condition})",
+            [] if value == "Unknown" else [value],
+        )
+    if field in CODE_METRIC_COLUMNS:
+        match = re.fullmatch(r"(\d+)(?:(\+)|-(\d+))?", value)
+        if not match:
+            return "0", []
+        lo = int(match[1])
+        hi = None if match[2] else int(match[3] or lo)
+        condition = f"i.{field} >= ?" + ("" if hi is None else f" AND i.{field} <= ?")
+        return (
+            f"p.id IN (SELECT s.problem_id FROM {{schema}}.solutions s JOIN {{schema}}.implementations i ON i.solution_id = s.id WHERE {condition})",
+            [lo] if hi is None else [lo, hi],
+        )
+    raise ValueError(f"Unknown chart filter field: {field}")
+
+
+PROBLEM_CACHE_MAX_BYTES = 64 * 1024 * 1024
+IMPLEMENTATION_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+
+def estimate_size(obj):
+    """Roughly estimate the memory held by a tree of dicts, lists and strings."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in obj.items())
+    elif isinstance(obj, list):
+        size += sum(estimate_size(v) for v in obj)
+    return size
+
+
+class ByteBoundedCache:
+    """Least-recently-used cache of dicts and lists, bounded in bytes."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        # Callers may modify the tree they get, so hand out a copy
+        return copy.deepcopy(entry[0])
+
+    def put(self, key, tree):
+        size = estimate_size(tree)
+        if size > self.max_bytes:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self.entries[key] = (copy.deepcopy(tree), size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+            self.invalidations += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class ProblemTreeCache(ByteBoundedCache):
+    """Least-recently-used cache of assembled problem trees, bounded in bytes.
+
+    Keys are ``(schema, problem_id, lazy)``. Entries are invalidated from the
+    changelog, so every write path only has to call ``sync`` after committing.
+    """
+
+    def __init__(self, max_bytes=PROBLEM_CACHE_MAX_BYTES):
+        super().__init__(max_bytes)
+        # Changelog sequence already accounted for, per schema
+        self.synced_seq = {}
+
+    def invalidate(self, schema, problem_ids):
+        """Drop the cached trees of the given problems."""
+        for pid in problem_ids:
+            self.discard((schema, pid, False))
+            self.discard((schema, pid, True))
+
+    def clear(self):
+        super().clear()
+        self.synced_seq.clear()
+
+    def sync(self, conn):
+        """Invalidate cached problems that have changelog entries since the last sync."""
+        for schema, _ in federation_schemas():
+            try:
+                max_seq = conn.execute(
+                    f"SELECT COALESCE(MAX(seq), 0) FROM {schema}.changelog"
+                ).fetchone()[0]
+            except sqlite3.OperationalError:
+                continue
+            last_seq = self.synced_seq.get(schema)
+            self.synced_seq[schema] = max_seq
+            if last_seq == max_seq:
+                continue
+            cached = sorted({key[1] for key in self.entries if key[0] == schema})
+            if last_seq is None:
+                self.invalidate(schema, cached)
+                continue
+            for start in range(0, len(cached), 900):
+                chunk = cached[start : start + 900]
+                changed = [
+                    row[0]
+                    for row in conn.execute(
+                        f"SELECT DISTINCT problem_id FROM {schema}.changelog WHERE seq > ? AND problem_id IN ({', '.join('?' * len(chunk))})",
+                        (last_seq, *chunk),
+                    )
+                ]
+                self.invalidate(schema, changed)
+
+
+problem_cache = ProblemTreeCache()
+# Heavy implementation columns loaded on demand, keyed by implementation ID. The
+# changelog only records problem IDs, so this is cleared on every write instead
+implementation_cache = ByteBoundedCache(IMPLEMENTATION_CACHE_MAX_BYTES)
+
+
+def diagnostics_report():
+    """Return a plain-text report on the database and the in-memory caches."""
+    lines = [f"Database: {os.path.abspath(DB_FILE)}"]
+    conn = connect_federated()
+    try:
+        c = conn.cursor()
+        page_size = c.execute("PRAGMA page_size").fetchone()[0]
+        page_count = c.execute("PRAGMA page_count").fetchone()[0]
+        freelist = c.execute("PRAGMA freelist_count").fetchone()[0]
+        lines.append(
+            f"  Size: {page_size * page_count / 1e6:.2f} MB "
+            f"({page_count} pages, {freelist} free)"
+        )
+        for table in ("problems", "solutions", "implementations", "changelog"):
+            count = c.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            lines.append(f"  {table}: {count} rows")
+        lines.append(f"  Compression: {_compression['codec']}")
+        pending = c.execute(
+            "SELECT COUNT(*) FROM implementations WHERE code_lines IS NULL"
+        ).fetchone()[0]
+        lines.append(f"  Code metrics: {pending} implementations pending")
+        mode = c.execute("PRAGMA auto_vacuum").fetchone()[0]
+        lines.append(f"  Auto-vacuum: {AUTO_VACUUM_MODES.get(mode, mode)}")
+        lines.append("  Last maintenance runs:")
+        for row in c.execute("""
+            SELECT task, started_at, duration_ms, page_count, free_before,
+                free_after, fragmentation, result
+            FROM main.maintenance_log
+            WHERE id IN (SELECT MAX(id) FROM main.maintenance_log GROUP BY task)
+            ORDER BY task
+        """):
+            entry = dict(zip(MAINTENANCE_LOG_FIELDS, row))
+            when = datetime.fromtimestamp(entry["started_at"]).strftime(
+                "%Y-%m-%d %H:%M"
+            )
+            lines.append(f"    {when} {format_maintenance_entry(entry)}")
+        for schema, path in federation_schemas()[1:]:
+            count = c.execute(f"SELECT COUNT(*) FROM {schema}.problems").fetchone()[0]
+            lines.append(f"Attached ({schema}): {path}, {count} problems")
+    finally:
+        conn.close()
+    stats = problem_cache.stats()
+    lines.append("Problem tree cache:")
+    lines.append(
+        f"  {stats['entries']} entries, {stats['bytes'] / 1e6:.2f} / "
+        f"{stats['max_bytes'] / 1e6:.0f} MB"
+    )
+    lines.append(
+        f"  Hit rate: {stats['hit_rate']:.1%} ({stats['hits']} hits, "
+        f"{stats['misses']} misses)"
+    )
+    lines.append(
+        f"  Evictions: {stats['evictions']}, invalidations: {stats['invalidations']}"
+    )
+    lines.append(f"Loaded implementation bodies: {len(implementation_cache)}")
+    stats = similarity_index.stats()
+    lines.append(
+        f"Similarity index: {stats['documents']} implementations, "
+        f"{stats['tombstones']} tombstones, {stats['segments']} segments, "
+        f"{stats['bytes'] / 1e6:.2f} MB"
+    )
+    lines.append(f"Quick-open index: {len(quick_open_index)} problems")
+    return "\n".join(lines)
+
+
+def load_implementation(impl):
+    """Return a lazily listed implementation with its code, explanation and notes loaded."""
+    impl_id = impl["id"]
+    details = implementation_cache.get(impl_id)
+    if details is None:
+        conn = sqlite3.connect(DB_FILE)
+        c = conn.cursor()
+        c.execute(
+            "SELECT explanation, code, notes FROM implementations WHERE id=?",
+            (impl_id,),
+        )
+        row = c.fetchone()
+        conn.close()
+        if row is None:
+            raise LookupError(f"Implementation {impl_id} no longer exists")
+        details = {
+            "Explanation": decode_text(row[0]),
+            "code": decode_text(row[1]),
+            "notes": decode_text(row[2]),
+        }
+        implementation_cache.put(impl_id, details)
+    return {
+        "id": impl_id,
+        "method_name": impl.get("method_name", ""),
+        "url": impl.get("url", ""),
+        **details,
+    }
+
+
+def format_size(num_chars):
+    """Return a short human readable size for a character count."""
+    if num_chars < 1024:
+        return f"{num_chars} chars"
+    if num_chars < 1024 * 1024:
+        return f"{num_chars / 1024:.1f}K chars"
+    return f"{num_chars / (1024 * 1024):.1f}M chars"
+
+
+# Compressed values are stored as BLOBs starting with this marker; plain TEXT values
+# are left untouched, so compressed and uncompressed rows can be mixed freely
+COMPRESSION_MAGIC = b"\x00cpz"
+COMPRESSION_CODECS = ["none", "zlib", "zstd"]
+# Values shorter than this are never worth compressing
+COMPRESSION_MIN_BYTES = 128
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 9
+ZSTD_DICT_SIZE = 112 * 1024
+ZSTD_DICT_SAMPLES = 5000
+
+# Active write codec, loaded from the settings table by init_db
+_compression = {"codec": "none", "dict_id": None}
+# zstd dictionaries by dictionary ID, loaded on first use
+_zstd_dicts = {}
+_zstd_compressors = {}
+_zstd_decompressors = {}
+
+
+# Counter bumped by rewrites that change what readers see but are kept out of
+# the changelog (code metric backfills). Copies synced from the changelog
+# reload everything when it moves.
+REWRITE_VERSION_SETTING = "rewrite_version"
+
+
+def bump_rewrite_version(c):
+    """Record a rewrite that bypasses the changelog."""
+    version = int(get_setting(c, REWRITE_VERSION_SETTING, 0))
+    set_setting(c, REWRITE_VERSION_SETTING, version + 1)
+
+
+def get_setting(c, key, default=None):
+    """Return a value from the settings table."""
+    row = c.execute("SELECT value FROM settings WHERE key=?", (key,)).fetchone()
+    return row[0] if row else default
+
+
+def set_setting(c, key, value):
+    """Store a value in the settings table."""
+    c.execute(
+        "INSERT INTO settings (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+        (key, str(value)),
+    )
+
+
+def transaction_writer(conn):
+    """Return a ``write(fn, solo=False)`` that runs writes directly on ``conn``.
+
+    Long-running jobs read on their own connection and hand every write to a
+    ``write`` callable, so the GUI can pass ``DatabaseWriter.call`` instead and
+    keep all writes on its writer thread. ``fn(cursor)`` runs in one committed
+    transaction; with ``solo=True`` it gets the connection, outside any
+    transaction, for VACUUM and the like.
+    """
+
+    def write(fn, solo=False):
+        if solo:
+            return fn(conn)
+        c = conn.cursor()
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(c)
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+        return result
+
+    return write
+
+
+def load_compression_settings(c):
+    """Load the active compression codec from the settings table.
+
+    Returns a warning for the caller to show when the configured codec is not
+    available, otherwise None.
+    """
+    codec = get_setting(c, "compression_codec", "none")
+    dict_id = get_setting(c, "compression_dict_id")
+    warning = None
+    if codec == "zstd" and zstandard is None:
+        warning = "zstandard is not installed; new values will be stored uncompressed."
+        codec = "none"
+    _compression["codec"] = codec
+    _compression["dict_id"] = int(dict_id) if dict_id else None
+    return warning
+
+
+def _zstd_dict(dict_id):
+    """Return the zstd dictionary with the given ID, loading it from the database."""
+    if dict_id not in _zstd_dicts:
+        row = None
+        for _, path in federation_schemas():
+            conn = sqlite3.connect(path)
+            try:
+                row = conn.execute(
+                    "SELECT data FROM compression_dicts WHERE dict_id=?", (dict_id,)
+                ).fetchone()
+            except sqlite3.OperationalError:
+                row = None
+            conn.close()
+            if row is not None:
+                break
+        if row is None:
+            raise LookupError(f"Missing zstd dictionary {dict_id}")
+        _zstd_dicts[dict_id] = zstandard.ZstdCompressionDict(row[0])
+    return _zstd_dicts[dict_id]
+
+
+def _require_zstandard():
+    if zstandard is None:
+        raise RuntimeError("The zstd codec requires the 'zstandard' package.")
+
+
+def _zstd_compressor(dict_id):
+    _require_zstandard()
+    if dict_id not in _zstd_compressors:
+        dict_data = _zstd_dict(dict_id) if dict_id else None
+        _zstd_compressors[dict_id] = zstandard.ZstdCompressor(
+            level=ZSTD_LEVEL, dict_data=dict_data
+        )
+    return _zstd_compressors[dict_id]
+
+
+def _zstd_decompressor(dict_id):
+    _require_zstandard()
+    if dict_id not in _zstd_decompressors:
+        dict_data = _zstd_dict(dict_id) if dict_id else None
+        _zstd_decompressors[dict_id] = zstandard.ZstdDecompressor(dict_data=dict_data)
+    return _zstd_decompressors[dict_id]
+
+
+def compress_text(value, codec, dict_id=None):
+    """Compress a string with the given codec, returning it unchanged if not worth it."""
+    if codec == "none" or not isinstance(value, str):
+        return value
+    raw = value.encode("utf-8")
+    if len(raw) < COMPRESSION_MIN_BYTES:
+        return value
+    if codec == "zlib":
+        blob = COMPRESSION_MAGIC + b"z" + zlib.compress(raw, ZLIB_LEVEL)
+    elif codec == "zstd" and dict_id:
+        blob = (
+            COMPRESSION_MAGIC
+            + b"d"
+            + dict_id.to_bytes(4, "little")
+            + _zstd_compressor(dict_id).compress(raw)
+        )
+    elif codec == "zstd":
+        blob = COMPRESSION_MAGIC + b"s" + _zstd_compressor(None).compress(raw)
+    else:
+        raise ValueError(f"Unknown compression codec '{codec}'")
+    return blob if len(blob) < len(raw) else value
+
+
+def encode_text(value):
+    """Compress a value for storage with the active codec."""
+    return compress_text(value, _compression["codec"], _compression["dict_id"])
+
+
+def decode_text(value):
+    """Return the text of a stored value, decompressing it if needed."""
+    if not isinstance(value, bytes) or not value.startswith(COMPRESSION_MAGIC):
+        return value
+    tag = value[4:5]
+    if tag == b"z":
+        raw = zlib.decompress(value[5:])
+    elif tag == b"s":
+        raw = _zstd_decompressor(None).decompress(value[5:])
+    elif tag == b"d":
+        dict_id = int.from_bytes(value[5:9], "little")
+        raw = _zstd_decompressor(dict_id).decompress(value[9:])
+    else:
+        raise ValueError(f"Unknown compression tag {tag!r}")
+    return raw.decode("utf-8")
+
+
+def text_length(value):
+    """Return the character count of a stored value, decompressing it if needed."""
+    if value is None:
+        return 0
+    return len(decode_text(value))
+
+
+def train_zstd_dictionary(c, sample_count=ZSTD_DICT_SAMPLES):
+    """Train a zstd dictionary on a sample of implementation code and store it.
+
+    Returns the dictionary ID, or None when there is too little code to train on.
+    """
+    samples = [
+        raw
+        for (value,) in c.execute(
+            "SELECT code FROM implementations WHERE code IS NOT NULL ORDER BY RANDOM() LIMIT ?",
+            (sample_count,),
+        )
+        if (raw := (decode_text(value) or "").encode("utf-8"))
+    ]
+    if len(samples) < 10:
+        return None
+    try:
+        dict_data = zstandard.train_dictionary(ZSTD_DICT_SIZE, samples)
+    except zstandard.ZstdError:
+        return None
+    dict_id = dict_data.dict_id()
+    c.execute(
+        "INSERT OR REPLACE INTO compression_dicts (dict_id, codec, data, created_at) VALUES (?, 'zstd', ?, ?)",
+        (dict_id, dict_data.as_bytes(), time.time()),
+    )
+    _zstd_dicts[dict_id] = dict_data
+    return dict_id
+
+
+def migrate_compression(conn, codec, use_dict=True, batch_size=500, vacuum=True):
+    """Re-encode all compressible columns with a new codec and make it the default.
+
+    Rows are rewritten in ID-ordered batches, one transaction per batch, so the
+    migration can be interrupted and re-run. ``codec="none"`` decompresses everything.
+    Returns the database file size before and after.
+    """
+    if codec not in COMPRESSION_CODECS:
+        raise ValueError(f"Unknown compression codec '{codec}'")
+    if codec == "zstd":
+        _require_zstandard()
+    size_before = os.path.getsize(DB_FILE)
+    c = conn.cursor()
+    dict_id = train_zstd_dictionary(c) if codec == "zstd" and use_dict else None
+    set_setting(c, "compression_codec", codec)
+    set_setting(c, "compression_dict_id", dict_id or "")
+    conn.commit()
+    load_compression_settings(c)
+    for table, columns in (
+        ("implementations", ["explanation", "code", "notes"]),
+        ("problems", ["problem_description"]),
+    ):
+        last_id = 0
+        while True:
+            rows = c.execute(
+                f"SELECT id, {', '.join(columns)} FROM {table} WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            updates = [
+                (*(encode_text(decode_text(value)) for value in row[1:]), *row)
+                for row in rows
+            ]
+            # Take the write lock before reading last_seq so no other writer's
+            # changelog rows can land above it and be deleted with ours
+            c.execute("BEGIN IMMEDIATE")
+            last_seq = c.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM changelog"
+            ).fetchone()[0]
+            # Rows changed since they were read keep the newer content
+            c.executemany(
+                f"UPDATE {table} SET {', '.join(f'{col}=?' for col in columns)} "
+                f"WHERE id=? AND {' AND '.join(f'{col} IS ?' for col in columns)}",
+                updates,
+            )
+            # Re-encoding does not change any content, so keep it out of the
+            # changelog; decoded copies stay valid, so no rewrite version bump
+            c.execute("DELETE FROM changelog WHERE seq > ?", (last_seq,))
+            conn.commit()
+            last_id = rows[-1][0]
+    if vacuum:
+        conn.execute("VACUUM")
+    return size_before, os.path.getsize(DB_FILE)
+
+
+def benchmark_compression(conn, sample_size=1000):
+    """Measure size savings and read latency of each codec on a sample of the data.
+
+    Returns one result dict per codec with the raw and stored sizes and the mean
+    and 95th percentile time to decode a single value.
+    """
+    c = conn.cursor()
+    values = []
+    for code, explanation, notes in c.execute(
+        "SELECT code, explanation, notes FROM implementations ORDER BY RANDOM() LIMIT ?",
+        (sample_size,),
+    ):
+        values.extend(decode_text(v) for v in (code, explanation, notes) if v)
+    for (description,) in c.execute(
+        "SELECT problem_description FROM problems ORDER BY RANDOM() LIMIT ?",
+        (sample_size,),
+    ):
+        if description:
+            values.append(decode_text(description))
+    candidates = [("none", None), ("zlib", None)]
+    if zstandard is not None:
+        candidates.append(("zstd", None))
+        dict_id = train_zstd_dictionary(c)
+        conn.rollback()
+        if dict_id:
+            candidates.append(("zstd+dict", dict_id))
+    raw_bytes = sum(len(v.encode("utf-8")) for v in values)
+    results = []
+    for name, dict_id in candidates:
+        codec = name.split("+")[0]
+        start = time.perf_counter()
+        stored = [compress_text(v, codec, dict_id) for v in values]
+        encode_seconds = time.perf_counter() - start
+        timings = []
+        for value in stored:
+            start = time.perf_counter()
+            decode_text(value)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        stored_bytes = sum(
+            len(v) if isinstance(v, bytes) else len(v.encode("utf-8")) for v in stored
+        )
+        results.append(
+            {
+                "codec": name,
+                "values": len(values),
+                "raw_bytes": raw_bytes,
+                "stored_bytes": stored_bytes,
+                "ratio": raw_bytes / stored_bytes if stored_bytes else 1.0,
+                "encode_mb_s": (
+                    (raw_bytes / 1e6) / encode_seconds if encode_seconds else 0.0
+                ),
+                "decode_mean_us": 1e6 * sum(timings) / len(timings) if timings else 0.0,
+                "decode_p95_us": (
+                    1e6 * timings[int(len(timings) * 0.95)] if timings else 0.0
+                ),
+            }
+        )
+    return results
+
+
+# Cheap complexity metrics of implementations.code, stored next to the code so
+# they can be charted and filtered without decoding it. NULL means not computed
+# yet; existing rows are filled in by backfill_code_metrics.
+CODE_METRIC_COLUMNS = ("code_bytes", "code_lines", "code_branches", "code_depth")
+# Words counted as branch points, plus the && and || operators. Punctuation is
+# translated to spaces so words can be split out without a regex scan.
+CODE_BRANCH_WORDS = frozenset(
+    ("if", "elif", "for", "foreach", "while", "case", "catch", "except", "and", "or")
+)
+CODE_PUNCTUATION = {
+    i: " " for i in range(128) if not (chr(i).isalnum() or chr(i) == "_")
+}
+CODE_INDENT_RE = re.compile(r"^[ \t]*(?=\S)", re.MULTILINE)
+CODE_METRICS_BATCH = 2000
+CODE_METRICS_CACHE_KB = 128 * 1024
+IMPLEMENTATION_INSERT = f"INSERT INTO implementations (solution_id, method_name, explanation, url, code, notes, {', '.join(CODE_METRIC_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+
+def code_metrics(code):
+    """Return ``(bytes, lines, branches, depth)`` for a piece of source code.
+
+    Branches counts conditionals, loops, case labels, handlers and boolean
+    operators, a rough stand-in for cyclomatic complexity. Depth is the
+    deepest indentation in units of the smallest indentation step.
+    """
+    code = code or ""
+    widths = {len(indent.expandtabs(4)) for indent in set(CODE_INDENT_RE.findall(code))}
+    step = min((w for w in widths if w), default=0)
+    words = code.translate(CODE_PUNCTUATION).split()
+    return (
+        len(code.encode("utf-8")),
+        code.count("\n") + (bool(code) and not code.endswith("\n")),
+        sum(map(CODE_BRANCH_WORDS.__contains__, words))
+        + code.count("&&")
+        + code.count("||"),
+        max(widths) // step if step else 0,
+    )
+
+
+def implementation_values(solution_id, impl):
+    """Return the ``IMPLEMENTATION_INSERT`` parameters for an implementation dict."""
+    code = impl.get("code", "")
+    return (
+        solution_id,
+        impl.get("method_name", ""),
+        encode_text(impl.get("Explanation", "")),
+        impl.get("url", ""),
+        encode_text(code),
+        encode_text(impl.get("notes", "")),
+        *code_metrics(code),
+    )
+
+
+def add_code_metric_columns(c):
+    """Add the code metric columns and their indexes if the database lacks them."""
+    columns = [row[1] for row in c.execute("PRAGMA table_info(implementations)")]
+    for column in CODE_METRIC_COLUMNS:
+        if column not in columns:
+            c.execute(f"ALTER TABLE implementations ADD COLUMN {column} INTEGER")
+        c.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_implementations_{column} ON implementations({column})"
+        )
+
+
+def code_metric_schemas():
+    """Return the federation schemas whose implementations have metric columns."""
+    conn = connect_federated()
+    try:
+        return [
+            (schema, path)
+            for schema, path in federation_schemas()
+            if {
+                row[1]
+                for row in conn.execute(f"PRAGMA {schema}.table_info(implementations)")
+            }
+            >= set(CODE_METRIC_COLUMNS)
+        ]
+    finally:
+        conn.close()
+
+
+def _code_metrics_rows(rows):
+    """Compute metrics for ``(id, stored code)`` rows; run in a worker process."""
+    return [(*code_metrics(decode_text(code)), impl_id) for impl_id, code in rows]
+
+
+def backfill_code_metrics(
+    conn,
+    batch_size=CODE_METRICS_BATCH,
+    workers=None,
+    progress=None,
+    should_stop=None,
+    write=None,
+):
+    """Compute the metrics of every implementation that has none yet.
+
+    Batches are decoded and measured in worker processes while the parent
+    reads ahead and writes finished batches back through ``write`` (see
+    ``transaction_writer``, the default). Filling in derived columns does not
+    change any content, so the writes are kept out of the changelog; the
+    rewrite version is bumped once when the run ends instead. Returns the
+    number of implementations updated.
+    """
+    write = write or transaction_writer(conn)
+    c = conn.cursor()
+    total = c.execute(
+        "SELECT COUNT(*) FROM implementations WHERE code_lines IS NULL"
+    ).fetchone()[0]
+    if not total:
+        return 0
+    workers = workers or os.cpu_count() or 1
+    assignments = ", ".join(f"{col}=?" for col in CODE_METRIC_COLUMNS)
+    # cache_size of the writing connection before the run
+    cache_size = []
+
+    def write_batch(c, results):
+        if not cache_size:
+            # The four metric indexes are updated in ID order, i.e. at random
+            # positions
+            cache_size.append(c.execute("PRAGMA cache_size").fetchone()[0])
+            c.execute(f"PRAGMA cache_size = -{CODE_METRICS_CACHE_KB}")
+        last_seq = c.execute("SELECT COALESCE(MAX(seq), 0) FROM changelog").fetchone()[
+            0
+        ]
+        # Rows replaced in the meantime already got their metrics on insert
+        c.executemany(
+            f"UPDATE implementations SET {assignments} WHERE id=? AND code_lines IS NULL",
+            results,
+        )
+        c.execute("DELETE FROM changelog WHERE seq > ?", (last_seq,))
+
+    def finish(c):
+        # Once per run, not per batch: every bump makes a DuckDB copy reload
+        # in full the next time it is opened
+        bump_rewrite_version(c)
+        c.execute(f"PRAGMA cache_size = {cache_size[0]}")
+
+    done = 0
+    last_id = 0
+    pending = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_db_worker,
+        initargs=(os.path.abspath(DB_FILE),),
+    ) as pool:
+        try:
+            while True:
+                # Keep every worker busy with one batch queued behind it
+                while len(pending) < 2 * workers and last_id is not None:
+                    rows = c.execute(
+                        "SELECT id, code FROM implementations WHERE code_lines IS NULL AND id > ? ORDER BY id LIMIT ?",
+                        (last_id, batch_size),
+                    ).fetchall()
+                    if not rows:
+                        last_id = None
+                        break
+                    last_id = rows[-1][0]
+                    pending.append(pool.submit(_code_metrics_rows, rows))
+                if not pending:
+                    break
+                results = pending.pop(0).result()
+                write(lambda c: write_batch(c, results))
+                done += len(results)
+                if progress:
+                    progress(done, total)
+                if should_stop and should_stop():
+                    break
+        finally:
+            for future in pending:
+                future.cancel()
+            if done:
+                write(finish)
+    return done
+
+
+def insert_solutions(c, problem_id, solutions):
+    """Insert solutions and their implementations for a problem.
+
+    Implementations listed lazily (see ``get_problem_full``) are copied from their
+    existing row inside SQLite instead of being passed through Python.
+    """
+    for sol in solutions:
+        c.execute(
+            "INSERT INTO solutions (problem_id, language) VALUES (?, ?)",
+            (problem_id, sol.get("language", "")),
+        )
+        solution_id = c.lastrowid
+        impls = sol.get("implementations", [])
+        if not any(impl.get("lazy") for impl in impls):
+            c.executemany(
+                IMPLEMENTATION_INSERT,
+                [implementation_values(solution_id, impl) for impl in impls],
+            )
+            continue
+        for impl in impls:
+            if impl.get("lazy"):
+                c.execute(
+                    f"INSERT INTO implementations (solution_id, method_name, explanation, url, code, notes, {', '.join(CODE_METRIC_COLUMNS)}) SELECT ?, method_name, explanation, url, code, notes, {', '.join(CODE_METRIC_COLUMNS)} FROM implementations WHERE id=?",
+                    (solution_id, impl["id"]),
+                )
+                if c.rowcount != 1:
+                    # Deleted by another process since the dialog loaded it
+                    raise LookupError(f"Implementation {impl['id']} no longer exists")
+            else:
+                c.execute(
+                    IMPLEMENTATION_INSERT, implementation_values(solution_id, impl)
+                )
+
+
+def problem_values(obj):
+    """Return the problem column values of a problem dict, in schema order."""
+    tags = obj.get("tags", "")
+    if isinstance(tags, list):
+        tags = ", ".join(tags)
+    return (
+        obj.get("platform", ""),
+        obj.get("title", ""),
+        encode_text(obj.get("problem_description", "")),
+        obj.get("url", ""),
+        obj.get("difficulty", ""),
+        tags,
+    )
+
+
+def insert_problem_tree(c, obj):
+    """Insert a problem with its solutions and implementations; return the new ID."""
+    c.execute(
+        "INSERT INTO problems (platform, title, problem_description, url, difficulty, tags) VALUES (?, ?, ?, ?, ?, ?)",
+        problem_values(obj),
+    )
+    problem_id = c.lastrowid
+    insert_solutions(c, problem_id, obj.get("solutions", []))
+    return problem_id
+
+
+def next_row_id(c, table):
+    """Return the ID that AUTOINCREMENT would give the next row of ``table``."""
+    return c.execute(
+        f"SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name=?), 0), COALESCE((SELECT MAX(id) FROM {table}), 0)) + 1",
+        (table,),
+    ).fetchone()[0]
+
+
+def insert_problem_trees(c, trees):
+    """Insert fully loaded problem trees with one ``executemany`` per table.
+
+    Problem and solution IDs are assigned up front from the current maximum, so
+    the connection must already hold the write lock (``BEGIN IMMEDIATE``).
+    Returns the number of problems inserted.
+    """
+    problem_id = next_row_id(c, "problems")
+    solution_id = next_row_id(c, "solutions")
+    problems, solutions, implementations = [], [], []
+    for obj in trees:
+        problems.append((problem_id, *problem_values(obj)))
+        for sol in obj.get("solutions", []):
+            solutions.append((solution_id, problem_id, sol.get("language", "")))
+            implementations.extend(
+                implementation_values(solution_id, impl)
+                for impl in sol.get("implementations", [])
+            )
+            solution_id += 1
+        problem_id += 1
+    c.executemany(
+        "INSERT INTO problems (id, platform, title, problem_description, url, difficulty, tags) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        problems,
+    )
+    c.executemany(
+        "INSERT INTO solutions (id, problem_id, language) VALUES (?, ?, ?)", solutions
+    )
+    c.executemany(IMPLEMENTATION_INSERT, implementations)
+    return len(problems)
+
+
+def update_problem_tree(c, problem_id, data):
+    """Replace a problem's fields, solutions and implementations with ``data``."""
+    c.execute(
+        "UPDATE problems SET platform=?, title=?, problem_description=?, url=?, difficulty=?, tags=? WHERE id=?",
+        (
+            data["platform"],
+            data["title"],
+            encode_text(data["problem_description"]),
+            data["url"],
+            data["difficulty"],
+            ", ".join(data["tags"]),
+            problem_id,
+        ),
+    )
+    c.execute("SELECT id FROM solutions WHERE problem_id=?", (problem_id,))
+    old_solution_ids = [row[0] for row in c.fetchall()]
+    # Insert the new rows before deleting the old ones so implementations
+    # that were never opened can be copied inside SQLite without loading them
+    insert_solutions(c, problem_id, data["solutions"])
+    for sol_id in old_solution_ids:
+        c.execute("DELETE FROM implementations WHERE solution_id=?", (sol_id,))
+        c.execute("DELETE FROM solutions WHERE id=?", (sol_id,))
+
+
+# Streaming import: compressed and archived inputs are decompressed and split
+# into lines on a reader thread while the caller parses and inserts
+IMPORT_READ_BUFFER = 4 * 1024 * 1024
+IMPORT_QUEUE_DEPTH = 8
+JSONL_IMPORT_SUFFIXES = (".jsonl", ".jsonl.gz", ".jsonl.zst", ".zip")
+
+
+def open_decompressed(f, name):
+    """Wrap a binary stream so it yields the decompressed bytes of ``name``."""
+    if name.endswith(".gz"):
+        return gzip.GzipFile(fileobj=f, mode="rb")
+    if name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("Reading .zst files requires the 'zstandard' package.")
+        return zstandard.ZstdDecompressor().stream_reader(
+            f, read_size=IMPORT_READ_BUFFER, read_across_frames=True
+        )
+    return f
+
+
+def iter_jsonl_sources(path):
+    """Yield ``(name, stream)`` for every JSONL shard in a file or zip archive.
+
+    Zip members ending in .jsonl, .jsonl.gz or .jsonl.zst are read in name
+    order, without extracting them to disk.
+    """
+    if path.lower().endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            members = sorted(
+                name
+                for name in archive.namelist()
+                if name.lower().endswith(JSONL_IMPORT_SUFFIXES[:3])
+            )
+            for name in members:
+                with archive.open(name) as member:
+                    with open_decompressed(member, name.lower()) as stream:
+                        yield f"{os.path.basename(path)}/{name}", stream
+        return
+    with open(path, "rb", buffering=IMPORT_READ_BUFFER) as f:
+        with open_decompressed(f, path.lower()) as stream:
+            yield os.path.basename(path), stream
+
+
+def _read_jsonl_blocks(path, out, stop):
+    """Reader thread: put ``(name, first line number, lines)`` blocks on ``out``."""
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    try:
+        for name, stream in iter_jsonl_sources(path):
+            line_no = 1
+            tail = b""
+            while True:
+                block = stream.read(IMPORT_READ_BUFFER)
+                if not block:
+                    break
+                data = tail + block
+                cut = data.rfind(b"\n") + 1
+                tail = data[cut:]
+                if cut:
+                    lines = data[: cut - 1].split(b"\n")
+                    if not put((name, line_no, lines)):
+                        return
+                    line_no += len(lines)
+            if tail.strip() and not put((name, line_no, [tail])):
+                return
+        put(None)
+    except Exception as e:
+        put(e)
+
+
+def iter_jsonl_records(path):
+    """Yield ``(source, line number, record)`` for the records in a JSONL input.
+
+    Plain, gzip and zstd compressed files and zip archives of shards are
+    streamed; decompression runs on a separate thread and stays up to
+    ``IMPORT_QUEUE_DEPTH`` blocks ahead of the consumer.
+    """
+    blocks = queue.Queue(IMPORT_QUEUE_DEPTH)
+    stop = threading.Event()
+    reader = threading.Thread(
+        target=_read_jsonl_blocks, args=(path, blocks, stop), daemon=True
+    )
+    reader.start()
+    try:
+        while (item := blocks.get()) is not None:
+            if isinstance(item, Exception):
+                raise item
+            name, line_no, lines = item
+            for offset, line in enumerate(lines):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"{name} line {line_no + offset}: {e}") from e
+                yield name, line_no + offset, record
+    finally:
+        stop.set()
+        reader.join()
+
+
+def import_jsonl_file(c, file_path):
+    """Insert every problem in a JSONL input (see ``iter_jsonl_records``); return the count."""
+    count = 0
+    for _, _, record in iter_jsonl_records(file_path):
+        insert_problem_tree(c, record)
+        count += 1
+    return count
+
+
+# JSONL preview: a line-offset index over a memory-mapped file, so any record
+# can be shown or imported without decoding the rest of the file
+JSONL_INDEX_SUFFIX = ".lineidx.npz"
+JSONL_INDEX_CHUNK = 64 * 1024 * 1024
+JSONL_SAMPLE_SIZE = 1000
+
+
+class JsonlLineIndex:
+    """Byte offsets of the lines of a memory-mapped JSONL file.
+
+    ``starts[i]`` is where line ``i`` begins. The offsets are found in one
+    vectorised pass over the mapping and cached in ``<file>.lineidx.npz``,
+    which is reused while the file's size and modification time match.
+    """
+
+    def __init__(self, path, starts, mm):
+        self.path = path
+        self.starts = starts
+        self.mm = mm
+        self.size = len(mm) if mm is not None else 0
+
+    @classmethod
+    def open(cls, path, progress=None):
+        """Map ``path`` and load or build its line index.
+
+        ``progress(done, total)`` is called with bytes scanned while building.
+        """
+        stat = os.stat(path)
+        if stat.st_size == 0:
+            return cls(path, np.empty(0, np.int64), None)
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        starts = cls.load_cache(path, stat)
+        if starts is None:
+            starts = cls.scan(mm, progress)
+            cls.save_cache(path, stat, starts)
+        return cls(path, starts, mm)
+
+    @staticmethod
+    def scan(mm, progress=None, chunk=JSONL_INDEX_CHUNK):
+        size = len(mm)
+        parts = [np.zeros(1, np.int64)]
+        for pos in range(0, size, chunk):
+            block = np.frombuffer(mm, np.uint8, min(chunk, size - pos), pos)
+            parts.append(np.flatnonzero(block == 10).astype(np.int64) + (pos + 1))
+            del block  # The mapping cannot be closed while a view exists
+            if progress:
+                progress(min(pos + chunk, size), size)
+        starts = np.concatenate(parts)
+        # A trailing newline does not start another line
+        return starts[:-1] if starts[-1] == size else starts
+
+    @staticmethod
+    def load_cache(path, stat):
+        try:
+            with np.load(path + JSONL_INDEX_SUFFIX) as cached:
+                if (
+                    int(cached["size"]) == stat.st_size
+                    and int(cached["mtime_ns"]) == stat.st_mtime_ns
+                ):
+                    return cached["starts"]
+        except (OSError, KeyError, ValueError):
+            pass
+        return None
+
+    @staticmethod
+    def save_cache(path, stat, starts):
+        try:
+            with open(path + JSONL_INDEX_SUFFIX, "wb") as f:
+                np.savez(f, starts=starts, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        except OSError:
+            # Read-only locations just rebuild the index next time
+            pass
+
+    def __len__(self):
+        return len(self.starts)
+
+    def span(self, i):
+        end = self.starts[i + 1] - 1 if i + 1 < len(self.starts) else self.size
+        return int(self.starts[i]), int(end)
+
+    def line(self, i, limit=None):
+        """Return line ``i`` as text, optionally only its first ``limit`` bytes."""
+        start, end = self.span(i)
+        if limit is not None:
+            end = min(end, start + limit)
+        return self.mm[start:end].decode("utf-8", errors="replace").rstrip("\r")
+
+    def record(self, i):
+        """Return record ``i`` parsed, or None for a blank line."""
+        start, end = self.span(i)
+        raw = self.mm[start:end]
+        return json.loads(raw) if raw.strip() else None
+
+    def close(self):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+
+
+def parse_record_ranges(text, total):
+    """Parse ranges like ``"1-100, 250, 1000-"`` of 1-based record numbers.
+
+    Returns sorted, merged ``(start, stop)`` pairs of 0-based line indices.
+    An empty string or ``"all"`` selects everything.
+    """
+    text = text.strip().lower()
+    if text in ("", "all"):
+        return [(0, total)] if total else []
+    ranges = []
+    for part in text.split(","):
+        match = re.fullmatch(r"\s*(\d+)\s*(?:(-)\s*(\d*)\s*)?", part)
+        if not match:
+            raise ValueError(f"Invalid range '{part.strip()}'")
+        first = int(match[1])
+        last = int(match[3]) if match[3] else (total if match[2] else first)
+        if first < 1 or last < first:
+            raise ValueError(f"Invalid range '{part.strip()}'")
+        ranges.append((first - 1, min(last, total)))
+    return merge_ranges(ranges)
+
+
+def merge_ranges(ranges):
+    """Sort ``(start, stop)`` ranges and merge overlapping or adjacent ones."""
+    merged = []
+    for start, stop in sorted(ranges):
+        if start >= stop:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+def format_record_ranges(ranges):
+    return ", ".join(
+        str(start + 1) if stop - start == 1 else f"{start + 1}-{stop}"
+        for start, stop in ranges
+    )
+
+
+def sample_jsonl(index, k=JSONL_SAMPLE_SIZE, seed=0):
+    """Parse a random sample of records and summarise their schema and contents."""
+    lines = np.random.default_rng(seed).choice(
+        len(index), min(k, len(index)), replace=False
+    )
+    fields = {}
+    platforms = {}
+    languages = {}
+    stats = {
+        "lines": len(index),
+        "bytes": index.size,
+        "sampled": 0,
+        "blank": 0,
+        "errors": [],
+        "solutions": 0,
+        "implementations": 0,
+    }
+    for i in np.sort(lines):
+        try:
+            obj = index.record(int(i))
+        except ValueError as e:
+            stats["errors"].append((int(i) + 1, str(e)))
+            continue
+        if obj is None:
+            stats["blank"] += 1
+            continue
+        if not isinstance(obj, dict):
+            stats["errors"].append((int(i) + 1, "Record is not a JSON object"))
+            continue
+        stats["sampled"] += 1
+        for key, value in obj.items():
+            types = fields.setdefault(key, {})
+            types[type(value).__name__] = types.get(type(value).__name__, 0) + 1
+        platform = obj.get("platform") or "Unknown"
+        platforms[platform] = platforms.get(platform, 0) + 1
+        for sol in obj.get("solutions") or []:
+            stats["solutions"] += 1
+            lang = sol.get("language") or "Unknown"
+            languages[lang] = languages.get(lang, 0) + 1
+            stats["implementations"] += len(sol.get("implementations") or [])
+    stats["fields"] = fields
+    stats["platforms"] = dict(sorted(platforms.items(), key=lambda x: -x[1]))
+    stats["languages"] = dict(sorted(languages.items(), key=lambda x: -x[1]))
+    return stats
+
+
+def import_jsonl_ranges(c, index, ranges):
+    """Insert the records in ``ranges`` of an indexed JSONL file; return the count."""
+    count = 0
+    for start, stop in ranges:
+        for i in range(start, stop):
+            try:
+                obj = index.record(i)
+            except ValueError as e:
+                raise ValueError(f"Record {i + 1}: {e}") from e
+            if obj is None:
+                continue
+            insert_problem_tree(c, obj)
+            count += 1
+    return count
+
+
+# Column layout shared by export_csv and import_csv: one row per implementation
+CSV_COLUMNS = [
+    "platform",
+    "title",
+    "problem_description",
+    "url",
+    "difficulty",
+    "tags",
+    "language",
+    "method_name",
+    "Explanation",
+    "impl_url",
+    "code",
+    "notes",
+]
+CSV_PROBLEM_FIELDS = 6
+# Rows buffered in memory per sorted run when a CSV has to be externally sorted
+CSV_SORT_RUN_BYTES = 64 * 1024 * 1024
+# Bloom filter bytes per byte of CSV input when checking that rows are grouped
+CSV_BLOOM_BYTES_PER_INPUT_BYTE = 1 / 32
+CSV_BLOOM_MIN_BYTES = 2 * 1024 * 1024
+CSV_BLOOM_MAX_BYTES = 128 * 1024 * 1024
+# Problems inserted per executemany round when importing a CSV file
+CSV_INSERT_BATCH = 500
+
+
+class UngroupedCSVError(Exception):
+    """Raised when the rows of one problem are not consecutive in a CSV file."""
+
+
+class BloomFilter:
+    """Fixed-size set membership filter with no false negatives."""
+
+    def __init__(self, num_bits=1 << 24, num_hashes=4):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray(num_bits // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key, digest_size=8 * self.num_hashes).digest()
+        for i in range(self.num_hashes):
+            chunk = digest[i * 8 : (i + 1) * 8]
+            yield int.from_bytes(chunk, "little") % self.num_bits
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        return all(
+            self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key)
+        )
+
+
+class SeenProblemKeys:
+    """Exact set of finished CSV problem keys with bounded memory.
+
+    Key digests are stored in a temporary table of the import connection; a
+    Bloom filter in front answers almost every lookup without touching it, so
+    only its rare false positives cost a query.
+    """
+
+    def __init__(self, c, num_bits=1 << 24):
+        self.c = c
+        self.bloom = BloomFilter(num_bits)
+        c.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS csv_seen_keys (digest BLOB PRIMARY KEY) WITHOUT ROWID"
+        )
+        c.execute("DELETE FROM temp.csv_seen_keys")
+
+    @staticmethod
+    def _digest(key):
+        return hashlib.blake2b(key, digest_size=16).digest()
+
+    def add(self, key):
+        self.bloom.add(key)
+        self.c.execute(
+            "INSERT OR IGNORE INTO temp.csv_seen_keys VALUES (?)", (self._digest(key),)
+        )
+
+    def __contains__(self, key):
+        if key not in self.bloom:
+            return False
+        return (
+            self.c.execute(
+                "SELECT 1 FROM temp.csv_seen_keys WHERE digest=?", (self._digest(key),)
+            ).fetchone()
+            is not None
+        )
+
+    def close(self):
+        self.c.execute("DROP TABLE IF EXISTS temp.csv_seen_keys")
+
+
+def iter_csv_rows(f):
+    """Yield rows of an exported CSV file normalised to the ``CSV_COLUMNS`` order."""
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        return
+    missing = [col for col in CSV_COLUMNS if col not in header]
+    if missing:
+        raise ValueError(f"Missing CSV column(s): {', '.join(missing)}")
+    index = [header.index(col) for col in CSV_COLUMNS]
+    for row in reader:
+        if not row:
+            continue
+        row += [""] * (len(header) - len(row))
+        yield [row[i] for i in index]
+
+
+def group_csv_rows(rows, seen=None):
+    """Group consecutive flattened CSV rows back into problem trees.
+
+    Yields one problem dict at a time, so only the rows of the current problem are
+    held in memory. Consecutive rows with the same language form one solution.
+    With ``seen``, a set-like of finished problem keys (``SeenProblemKeys``),
+    ``UngroupedCSVError`` is raised when a problem resumes later on.
+    """
+    key = None
+    obj = None
+    for row in rows:
+        row_key = tuple(row[:CSV_PROBLEM_FIELDS])
+        if row_key != key:
+            if obj is not None:
+                yield obj
+                if seen is not None:
+                    seen.add("\x1f".join(key).encode("utf-8"))
+            if seen is not None and "\x1f".join(row_key).encode("utf-8") in seen:
+                raise UngroupedCSVError(f"Rows of problem '{row[1]}' are not grouped")
+            key = row_key
+            platform, title, description, url, difficulty, tags = row_key
+            obj = {
+                "platform": platform,
+                "title": title,
+                "problem_description": description,
+                "url": url,
+                "difficulty": difficulty,
+                "tags": tags,
+                "solutions": [],
+            }
+        language = row[6]
+        solutions = obj["solutions"]
+        if not solutions or solutions[-1]["language"] != language:
+            solutions.append({"language": language, "implementations": []})
+        solutions[-1]["implementations"].append(
+            {
+                "method_name": row[7],
+                "Explanation": row[8],
+                "url": row[9],
+                "code": row[10],
+                "notes": row[11],
+            }
+        )
+    if obj is not None:
+        yield obj
+
+
+def external_sort_csv_rows(rows, run_bytes=CSV_SORT_RUN_BYTES):
+    """Yield rows sorted by problem and language, otherwise keeping the file order.
+
+    Rows of the same problem and language end up adjacent, so they are regrouped
+    into a single solution. Rows are sorted in bounded runs that are spilled to temporary files and then
+    merged lazily, so memory use does not depend on the size of the input.
+    """
+    with tempfile.TemporaryDirectory(prefix="cp_csv_sort_") as tmp_dir:
+        run_paths = []
+        run = []
+        run_size = 0
+        for seq, row in enumerate(rows):
+            run.append((row[: CSV_PROBLEM_FIELDS + 1], seq, row))
+            run_size += sum(len(field) for field in row)
+            if run_size >= run_bytes:
+                run_paths.append(_write_sorted_run(tmp_dir, len(run_paths), run))
+                run = []
+                run_size = 0
+        if run:
+            run_paths.append(_write_sorted_run(tmp_dir, len(run_paths), run))
+        files = [open(path, "r", encoding="utf-8", newline="") for path in run_paths]
+        try:
+            runs = [
+                (
+                    (row[1 : CSV_PROBLEM_FIELDS + 2], int(row[0]), row[1:])
+                    for row in csv.reader(f)
+                )
+                for f in files
+            ]
+            for _, _, row in heapq.merge(*runs, key=lambda item: (item[0], item[1])):
+                yield row
+        finally:
+            for f in files:
+                f.close()
+
+
+def _write_sorted_run(tmp_dir, index, run):
+    """Sort one run of keyed rows and write it to a temporary CSV file."""
+    run.sort(key=lambda item: (item[0], item[1]))
+    path = os.path.join(tmp_dir, f"run_{index:05d}.csv")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        for _, seq, row in run:
+            writer.writerow([seq, *row])
+    return path
+
+
+def import_csv_file(conn, file_path):
+    """Import an exported CSV file into the database and return the problem count.
+
+    The file is streamed and grouped in one pass; finished problems are inserted
+    in batches of ``CSV_INSERT_BATCH`` with ``insert_problem_trees``. If the rows
+    of a problem turn out not to be consecutive, the partial import is rolled back
+    and the file is imported again through an external sort. Everything is written
+    in a single ``BEGIN IMMEDIATE`` transaction, so a failed import leaves nothing
+    behind.
+    """
+    c = conn.cursor()
+
+    def insert_all(problems):
+        count = 0
+        for batch in batched_trees(problems, CSV_INSERT_BATCH):
+            count += insert_problem_trees(c, batch)
+        return count
+
+    bloom_bytes = int(os.path.getsize(file_path) * CSV_BLOOM_BYTES_PER_INPUT_BYTE)
+    bloom_bytes = min(max(bloom_bytes, CSV_BLOOM_MIN_BYTES), CSV_BLOOM_MAX_BYTES)
+    c.execute("BEGIN IMMEDIATE")
+    seen = SeenProblemKeys(c, bloom_bytes * 8)
+    try:
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            count = insert_all(group_csv_rows(iter_csv_rows(f), seen))
+    except UngroupedCSVError:
+        conn.rollback()
+        c.execute("BEGIN IMMEDIATE")
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            count = insert_all(group_csv_rows(external_sort_csv_rows(iter_csv_rows(f))))
+    finally:
+        seen.close()
+    conn.commit()
+    return count
+
+
+SPLIT_NAMES = ["train", "validation", "test"]
+DEFAULT_SPLIT_RATIOS = (0.8, 0.1, 0.1)
+# Problems assembled per round trip when exporting shards
+SHARD_FETCH_BATCH = 1000
+
+
+def fetch_problem_trees(c, problem_ids, schema="main", with_ids=False):
+    """Return full problem dicts for many problem IDs using one query per table.
+
+    The dicts have the same layout as ``MainWindow.get_problem_full`` and are
+    returned in the order of ``problem_ids``, skipping missing problems. With
+    ``with_ids`` they come as ``(id, dict)`` pairs.
+    """
+    if not problem_ids:
+        return []
+    marks = ", ".join("?" * len(problem_ids))
+    problems = {}
+    for pid, platform, title, description, url, difficulty, tags in c.execute(
+        f"SELECT id, platform, title, problem_description, url, difficulty, tags FROM {schema}.problems WHERE id IN ({marks})",
+        problem_ids,
+    ):
+        problems[pid] = {
+            "platform": platform,
+            "title": title,
+            "problem_description": decode_text(description),
+            "url": url,
+            "difficulty": difficulty,
+            "tags": [t.strip() for t in tags.split(",")] if tags else [],
+            "solutions": [],
+        }
+    solutions = {}
+    for sid, pid, language in c.execute(
+        f"SELECT id, problem_id, language FROM {schema}.solutions WHERE problem_id IN ({marks}) ORDER BY id",
+        problem_ids,
+    ):
+        if pid in problems:
+            solutions[sid] = {"language": language, "implementations": []}
+            problems[pid]["solutions"].append(solutions[sid])
+    solution_ids = list(solutions)
+    for start in range(0, len(solution_ids), 900):
+        chunk = solution_ids[start : start + 900]
+        for sid, m, exp, u, code, notes in c.execute(
+            f"SELECT solution_id, method_name, explanation, url, code, notes FROM {schema}.implementations WHERE solution_id IN ({', '.join('?' * len(chunk))}) ORDER BY id",
+            chunk,
+        ):
+            solutions[sid]["implementations"].append(
+                {
+                    "method_name": m,
+                    "Explanation": decode_text(exp),
+                    "url": u,
+                    "code": decode_text(code),
+                    "notes": decode_text(notes),
+                }
+            )
+    if with_ids:
+        return [(pid, problems[pid]) for pid in problem_ids if pid in problems]
+    return [problems[pid] for pid in problem_ids if pid in problems]
+
+
+def stable_hash(text):
+    """Return a 64-bit hash of a string that is stable across runs and machines."""
+    return int.from_bytes(
+        hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def assign_split(problem, ratios=DEFAULT_SPLIT_RATIOS):
+    """Return the split of a problem from a stable hash of its platform and URL/title."""
+    identity = (problem.get("url") or problem.get("title") or "").strip().lower()
+    key = f"{(problem.get('platform') or '').strip().lower()}\x1f{identity}"
+    point = stable_hash(key) / 2**64
+    cumulative = 0.0
+    for name, ratio in zip(SPLIT_NAMES, ratios):
+        cumulative += ratio
+        if point < cumulative:
+            return name
+    return SPLIT_NAMES[len(ratios) - 1]
+
+
+def parse_split_ratios(text):
+    """Parse ratios such as ``80/10/10`` into fractions that sum to one."""
+    parts = [float(p) for p in text.replace(",", "/").split("/") if p.strip()]
+    if not 1 <= len(parts) <= len(SPLIT_NAMES) or any(p < 0 for p in parts):
+        raise ValueError(f"Invalid split ratios '{text}'")
+    total = sum(parts)
+    if total <= 0:
+        raise ValueError(f"Invalid split ratios '{text}'")
+    return tuple(p / total for p in parts)
+
+
+def _init_db_worker(db_file):
+    """Point a freshly spawned worker process at the right database file."""
+    global DB_FILE
+    DB_FILE = db_file
+    conn = sqlite3.connect(DB_FILE)
+    load_compression_settings(conn.cursor())
+    conn.close()
+
+
+def export_shard(db_file, out_dir, shard, num_shards, mode, id_range, ratios):
+    """Write one shard of the dataset and its manifest; run in a worker process.
+
+    In ``hash`` mode the shard holds the problems whose mixed ID hashes to
+    ``shard``; in ``range`` mode it holds the IDs in ``id_range`` (inclusive start,
+    exclusive end). Records go to ``<out_dir>/<split>/shard-XXXXX-of-YYYYY.jsonl``.
+    """
+    conn = sqlite3.connect(
+        f"file:{urllib.parse.quote(os.path.abspath(db_file))}?mode=ro", uri=True
+    )
+    c = conn.cursor()
+    name = f"shard-{shard:05d}-of-{num_shards:05d}.jsonl"
+    files = {}
+    stats = {}
+    try:
+        last_id = 0 if mode == "hash" else id_range[0] - 1
+        while True:
+            if mode == "hash":
+                # Knuth multiplicative hash spreads consecutive IDs over the shards
+                rows = c.execute(
+                    "SELECT id FROM problems WHERE id > ? AND ((id * 2654435761) % 4294967296) % ? = ? ORDER BY id LIMIT ?",
+                    (last_id, num_shards, shard, SHARD_FETCH_BATCH),
+                ).fetchall()
+            else:
+                rows = c.execute(
+                    "SELECT id FROM problems WHERE id > ? AND id < ? ORDER BY id LIMIT ?",
+                    (last_id, id_range[1], SHARD_FETCH_BATCH),
+                ).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            for obj in fetch_problem_trees(c, [row[0] for row in rows]):
+                split = assign_split(obj, ratios)
+                if split not in files:
+                    os.makedirs(os.path.join(out_dir, split), exist_ok=True)
+                    files[split] = open(os.path.join(out_dir, split, name), "wb")
+                    stats[split] = {
+                        "path": f"{split}/{name}",
+                        "problems": 0,
+                        "solutions": 0,
+                        "implementations": 0,
+                        "bytes": 0,
+                        "sha256": hashlib.sha256(),
+                    }
+                line = (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+                files[split].write(line)
+                entry = stats[split]
+                entry["problems"] += 1
+                entry["solutions"] += len(obj["solutions"])
+                entry["implementations"] += sum(
+                    len(sol["implementations"]) for sol in obj["solutions"]
+                )
+                entry["bytes"] += len(line)
+                entry["sha256"].update(line)
+    finally:
+        conn.close()
+        for f in files.values():
+            f.close()
+    for entry in stats.values():
+        entry["sha256"] = entry["sha256"].hexdigest()
+    manifest = {
+        "shard": shard,
+        "num_shards": num_shards,
+        "mode": mode,
+        "id_range": list(id_range) if mode == "range" else None,
+        "files": stats,
+    }
+    os.makedirs(os.path.join(out_dir, "manifests"), exist_ok=True)
+    with open(
+        os.path.join(out_dir, "manifests", name.replace(".jsonl", ".json")),
+        "w",
+        encoding="utf-8",
+    ) as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def export_shards(
+    out_dir,
+    num_shards,
+    mode="hash",
+    ratios=DEFAULT_SPLIT_RATIOS,
+    workers=None,
+    progress=None,
+):
+    """Export the dataset as ``num_shards`` shards written in parallel processes.
+
+    Every problem is assigned to a train/validation/test split by ``assign_split``,
+    so the same problem lands in the same split on every run. Each shard gets a
+    manifest with per-split counts and SHA-256 checksums, and ``manifest.json``
+    in ``out_dir`` summarises the whole export. ``progress(done, total)`` is
+    called as shards finish. Returns the summary manifest.
+    """
+    if mode not in ("hash", "range"):
+        raise ValueError(f"Unknown shard mode '{mode}'")
+    if num_shards < 1:
+        raise ValueError("At least one shard is required")
+    os.makedirs(out_dir, exist_ok=True)
+    conn = sqlite3.connect(DB_FILE)
+    lo, hi = conn.execute("SELECT MIN(id), MAX(id) FROM problems").fetchone()
+    conn.close()
+    lo, hi = (lo or 1), (hi or 0) + 1
+    step = max(1, -(-(hi - lo) // num_shards))
+    ranges = [(lo + k * step, min(hi, lo + (k + 1) * step)) for k in range(num_shards)]
+    db_file = os.path.abspath(DB_FILE)
+    manifests = []
+    # Spawned workers avoid forking a process that is running Qt threads
+    with ProcessPoolExecutor(
+        max_workers=min(workers or os.cpu_count() or 1, num_shards),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_db_worker,
+        initargs=(db_file,),
+    ) as pool:
+        futures = [
+            pool.submit(
+                export_shard, db_file, out_dir, k, num_shards, mode, ranges[k], ratios
+            )
+            for k in range(num_shards)
+        ]
+        for done, future in enumerate(futures, 1):
+            manifests.append(future.result())
+            if progress:
+                progress(done, num_shards)
+    totals = {
+        split: {"problems": 0, "solutions": 0, "implementations": 0, "bytes": 0}
+        for split in SPLIT_NAMES[: len(ratios)]
+    }
+    for manifest in manifests:
+        for split, entry in manifest["files"].items():
+            for key in totals[split]:
+                totals[split][key] += entry[key]
+    summary = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "source": db_file,
+        "num_shards": num_shards,
+        "mode": mode,
+        "split_ratios": dict(zip(SPLIT_NAMES, ratios)),
+        "totals": totals,
+        "shards": manifests,
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+# Every write to these tables is recorded in the changelog by triggers, together
+# with the problem it belongs to (expressions for NEW and OLD rows)
+CHANGELOG_TRIGGERS = [
+    ("problems", "NEW.id", "OLD.id"),
+    ("solutions", "NEW.problem_id", "OLD.problem_id"),
+    (
+        "implementations",
+        "(SELECT problem_id FROM solutions WHERE id = NEW.solution_id)",
+        "(SELECT problem_id FROM solutions WHERE id = OLD.solution_id)",
+    ),
+]
+# Unix time with sub-second precision, usable in SQLite before 3.42
+CHANGELOG_NOW = "(julianday('now') - 2440587.5) * 86400.0"
+CHANGELOG_RETENTION_DAYS = 30
+
+
+def changed_problem_ids(c, since_seq, until_seq):
+    """Return the IDs of problems touched by changelog entries in (since, until]."""
+    return [
+        row[0]
+        for row in c.execute(
+            "SELECT DISTINCT problem_id FROM changelog WHERE seq > ? AND seq <= ? AND problem_id IS NOT NULL ORDER BY problem_id",
+            (since_seq, until_seq),
+        )
+    ]
+
+
+def advance_delta_watermark(c, until_seq):
+    """Store the delta export watermark and prune changelog entries behind it."""
+    set_setting(c, "delta_export_watermark", until_seq)
+    c.execute(
+        f"DELETE FROM changelog WHERE seq <= ? AND changed_at < {CHANGELOG_NOW} - ?",
+        (until_seq, CHANGELOG_RETENTION_DAYS * 86400),
+    )
+
+
+def export_delta(conn, file_path, since_seq=None, advance=True, write=None):
+    """Write the problems changed since the stored watermark to a JSONL file.
+
+    Changed problems are written in full with ``"op": "upsert"`` and their ``id``;
+    deleted problems become ``{"op": "delete", "id": ...}`` tombstones. The
+    watermark is only advanced, through ``write`` (see ``transaction_writer``,
+    the default), once the file has been written completely. Returns
+    ``(upserts, deletes, new_watermark)``.
+    """
+    c = conn.cursor()
+    if since_seq is None:
+        since_seq = int(get_setting(c, "delta_export_watermark", 0))
+    until_seq = c.execute("SELECT COALESCE(MAX(seq), 0) FROM changelog").fetchone()[0]
+    problem_ids = changed_problem_ids(c, since_seq, until_seq)
+    upserts = deletes = 0
+    part_path = file_path + ".part"
+    with open(part_path, "w", encoding="utf-8") as f:
+        for start in range(0, len(problem_ids), SHARD_FETCH_BATCH):
+            batch = problem_ids[start : start + SHARD_FETCH_BATCH]
+            # The IDs come from the same query as the trees, so a delete in
+            # between cannot pair a tree with the wrong ID
+            trees = dict(fetch_problem_trees(c, batch, with_ids=True))
+            for pid in batch:
+                if pid in trees:
+                    record = {"op": "upsert", "id": pid, **trees[pid]}
+                    upserts += 1
+                else:
+                    record = {"op": "delete", "id": pid}
+                    deletes += 1
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    os.replace(part_path, file_path)
+    if advance:
+        write = write or transaction_writer(conn)
+        write(lambda c: advance_delta_watermark(c, until_seq))
+    return upserts, deletes, until_seq
+
+
+# Storage backends: the SQLite file is the source of truth; other engines serve
+# read-heavy analytics and exports from a copy kept in sync through the changelog
+PROBLEM_GROUP_COLUMNS = ("platform", "difficulty")
+PROBLEM_COLUMNS = (
+    "id",
+    "platform",
+    "title",
+    "problem_description",
+    "url",
+    "difficulty",
+    "tags",
+)
+SOLUTION_COLUMNS = ("id", "problem_id", "language")
+IMPLEMENTATION_COLUMNS = (
+    "id",
+    "solution_id",
+    "method_name",
+    "explanation",
+    "url",
+    "code",
+    "notes",
+) + CODE_METRIC_COLUMNS
+TABLE_COLUMNS = {
+    "problems": PROBLEM_COLUMNS,
+    "solutions": SOLUTION_COLUMNS,
+    "implementations": IMPLEMENTATION_COLUMNS,
+}
+INTEGER_COLUMNS = {"id", "problem_id", "solution_id", *CODE_METRIC_COLUMNS}
+# Columns stored compressed in SQLite and as plain text elsewhere
+ENCODED_COLUMNS = {"problem_description", "explanation", "code", "notes"}
+# Rows that belong to the dataset. Foreign keys are not enforced, so
+# solutions and implementations can outlive a deleted problem; backends skip
+# such orphans.
+DATASET_ROWS = {
+    "problems": "problems p",
+    "solutions": "solutions s JOIN problems p ON p.id = s.problem_id",
+    "implementations": (
+        "implementations i JOIN solutions s ON s.id = i.solution_id "
+        "JOIN problems p ON p.id = s.problem_id"
+    ),
+}
+
+
+def problem_tree(row):
+    """Return the problem dict layout of ``fetch_problem_trees`` for a problems row."""
+    _, platform, title, description, url, difficulty, tags = row
+    return {
+        "platform": platform,
+        "title": title,
+        "problem_description": description,
+        "url": url,
+        "difficulty": difficulty,
+        "tags": [t.strip() for t in tags.split(",")] if tags else [],
+        "solutions": [],
+    }
+
+
+def implementation_tree(row):
+    """Return the implementation dict layout of ``fetch_problem_trees``."""
+    _, _, method_name, explanation, url, code, notes = row[:7]
+    return {
+        "method_name": method_name,
+        "Explanation": explanation,
+        "url": url,
+        "code": code,
+        "notes": notes,
+    }
+
+
+class StorageBackend(abc.ABC):
+    """Read interface over problems, solutions and implementations.
+
+    Problems come back as the dicts written to JSONL exports, in the layout of
+    ``fetch_problem_trees``. Subclasses implement the queries; scans and
+    exports have generic versions built on them.
+    """
+
+    name = None
+
+    @abc.abstractmethod
+    def counts(self):
+        """Return the number of rows of each table."""
+
+    @abc.abstractmethod
+    def problem_ids(self):
+        """Return all problem IDs in ascending order."""
+
+    @abc.abstractmethod
+    def fetch_problems(self, problem_ids):
+        """Return the problems with the given IDs in that order, skipping missing ones."""
+
+    @abc.abstractmethod
+    def problem_counts(self, column):
+        """Return the number of problems per value of a column in PROBLEM_GROUP_COLUMNS."""
+
+    @abc.abstractmethod
+    def language_counts(self):
+        """Return the number of solutions per language."""
+
+    @abc.abstractmethod
+    def metric_summary(self, column):
+        """Return ``(count, mean, max)`` of a code metric over all implementations."""
+
+    @abc.abstractmethod
+    def scan_columns(self, table, columns):
+        """Yield tuples of some columns of a table's DATASET_ROWS in ID order.
+
+        Columns in ENCODED_COLUMNS come back as plain text.
+        """
+
+    @abc.abstractmethod
+    def aggregate(self, query):
+        """Run a ``key, COUNT(*) ... GROUP BY key`` query; return ``{key: count}``.
+
+        The query is written for ``federated_counts``, with ``{schema}`` in
+        place of the schema name.
+        """
+
+    @abc.abstractmethod
+    def close(self):
+        """Release the connection."""
+
+    @staticmethod
+    def check_columns(table, columns):
+        if table not in TABLE_COLUMNS:
+            raise ValueError(f"Unknown table '{table}'")
+        unknown = set(columns) - set(TABLE_COLUMNS[table])
+        if unknown:
+            raise ValueError(f"Unknown {table} columns: {', '.join(sorted(unknown))}")
+
+    def iter_problems(self, batch_size=SHARD_FETCH_BATCH):
+        """Yield every problem in ID order without holding them all in memory."""
+        ids = self.problem_ids()
+        for start in range(0, len(ids), batch_size):
+            yield from self.fetch_problems(ids[start : start + batch_size])
+
+    def export_jsonl(self, path):
+        """Write every problem to a JSONL file; return the number written."""
+        count = 0
+        part_path = path + ".part"
+        with open(part_path, "w", encoding="utf-8") as f:
+            for problem in self.iter_problems():
+                f.write(json.dumps(problem, ensure_ascii=False) + "\n")
+                count += 1
+        os.replace(part_path, path)
+        return count
+
+
+class SqliteBackend(StorageBackend):
+    """The dataset file itself, read through sqlite3."""
+
+    name = "sqlite"
+
+    def __init__(self, path=None, read_only=False):
+        if read_only:
+            uri = f"file:{urllib.parse.quote(os.path.abspath(path or DB_FILE))}?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True)
+        else:
+            self.conn = sqlite3.connect(path or DB_FILE)
+
+    def counts(self):
+        return {
+            table: self.conn.execute(
+                f"SELECT COUNT(*) FROM {DATASET_ROWS[table]}"
+            ).fetchone()[0]
+            for table in DATASET_ROWS
+        }
+
+    def problem_ids(self):
+        return [
+            row[0] for row in self.conn.execute("SELECT id FROM problems ORDER BY id")
+        ]
+
+    def fetch_problems(self, problem_ids):
+        trees = []
+        for start in range(0, len(problem_ids), 900):
+            chunk = problem_ids[start : start + 900]
+            trees += fetch_problem_trees(self.conn.cursor(), chunk)
+        return trees
+
+    def problem_counts(self, column):
+        if column not in PROBLEM_GROUP_COLUMNS:
+            raise ValueError(f"Cannot group problems by '{column}'")
+        return dict(
+            self.conn.execute(f"SELECT {column}, COUNT(*) FROM problems GROUP BY 1")
+        )
+
+    def language_counts(self):
+        return dict(
+            self.conn.execute(
+                f"SELECT language, COUNT(*) FROM {DATASET_ROWS['solutions']} GROUP BY 1"
+            )
+        )
+
+    def metric_summary(self, column):
+        if column not in CODE_METRIC_COLUMNS:
+            raise ValueError(f"Unknown code metric '{column}'")
+        return self.conn.execute(
+            f"SELECT COUNT({column}), AVG({column}), MAX({column}) "
+            f"FROM {DATASET_ROWS['implementations']}"
+        ).fetchone()
+
+    def scan_columns(self, table, columns):
+        self.check_columns(table, columns)
+        # DATASET_ROWS names each table by an alias ("problems p", ...)
+        alias = DATASET_ROWS[table].split()[1]
+        cursor = self.conn.execute(
+            f"SELECT {', '.join(f'{alias}.{col}' for col in columns)} "
+            f"FROM {DATASET_ROWS[table]} ORDER BY {alias}.id"
+        )
+        encoded = [i for i, col in enumerate(columns) if col in ENCODED_COLUMNS]
+        for row in iter_fetchmany(cursor, SHARD_FETCH_BATCH):
+            if encoded:
+                row = list(row)
+                for i in encoded:
+                    row[i] = decode_text(row[i])
+                row = tuple(row)
+            yield row
+
+    def aggregate(self, query):
+        return grouped_counts(self.conn.execute(query.format(schema="main")))
+
+    def close(self):
+        self.conn.close()
+
+
+class DuckDBBackend(StorageBackend):
+    """A columnar DuckDB copy of the dataset for aggregates and full scans.
+
+    The copy lives next to the SQLite file (``cp_dataset.duckdb``) with text
+    stored decompressed. Opening it applies the problems changed since the
+    last sync from the SQLite changelog, or reloads everything when the
+    changelog no longer reaches back that far or a rewrite bypassed it.
+    """
+
+    name = "duckdb"
+
+    def __init__(self, path=None, source=None):
+        if duckdb is None:
+            raise RuntimeError("The duckdb backend requires the 'duckdb' package.")
+        self.source = os.path.abspath(source or DB_FILE)
+        self.path = path or os.path.splitext(self.source)[0] + ".duckdb"
+        self.conn = duckdb.connect(self.path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key VARCHAR PRIMARY KEY, value VARCHAR)"
+        )
+        self.sync()
+
+    def meta(self, key):
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = ?", [key]
+        ).fetchone()
+        return row[0] if row else None
+
+    def sync(self):
+        """Bring the copy up to date with the SQLite file; return the problems loaded."""
+        src = sqlite3.connect(self.source)
+        try:
+            c = src.cursor()
+            max_seq, min_seq = c.execute(
+                "SELECT COALESCE(MAX(seq), 0), COALESCE(MIN(seq), 0) FROM changelog"
+            ).fetchone()
+            synced = self.meta("synced_seq")
+            synced = int(synced) if synced is not None else None
+            rewrites = get_setting(c, REWRITE_VERSION_SETTING, "0")
+            current = (
+                self.meta("source") == self.source
+                and self.meta(REWRITE_VERSION_SETTING) == rewrites
+            )
+            if synced == max_seq and current:
+                return 0
+            full = (
+                synced is None
+                or not current
+                or max_seq < synced
+                or min_seq > synced + 1
+            )
+            self.conn.begin()
+            try:
+                if full:
+                    self.create_tables()
+                    loaded = self.load(c)
+                else:
+                    ids = changed_problem_ids(c, synced, max_seq)
+                    loaded = 0
+                    for start in range(0, len(ids), 900):
+                        chunk = ids[start : start + 900]
+                        for table in ("implementations", "solutions"):
+                            self.conn.execute(
+                                f"DELETE FROM {table} WHERE problem_id IN (SELECT UNNEST(?))",
+                                [chunk],
+                            )
+                        self.conn.execute(
+                            "DELETE FROM problems WHERE id IN (SELECT UNNEST(?))",
+                            [chunk],
+                        )
+                        loaded += self.load(c, chunk)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('synced_seq', ?), ('source', ?), (?, ?)",
+                    [str(max_seq), self.source, REWRITE_VERSION_SETTING, rewrites],
+                )
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+            return loaded
+        finally:
+            src.close()
+
+    def create_tables(self):
+        for table, columns in (
+            ("problems", PROBLEM_COLUMNS),
+            ("solutions", SOLUTION_COLUMNS),
+            # problem_id is stored with each implementation for per-problem deletes
+            ("implementations", IMPLEMENTATION_COLUMNS + ("problem_id",)),
+        ):
+            definitions = ", ".join(
+                f"{col} {'BIGINT' if col in INTEGER_COLUMNS else 'VARCHAR'}"
+                for col in columns
+            )
+            self.conn.execute(f"CREATE OR REPLACE TABLE {table} ({definitions})")
+
+    def load(self, c, problem_ids=None):
+        """Copy rows from SQLite, all of them or those of some problems."""
+        if problem_ids is None:
+            where, params = "", []
+        else:
+            where = f"WHERE p.id IN ({', '.join('?' * len(problem_ids))})"
+            params = problem_ids
+        queries = (
+            (
+                "problems",
+                PROBLEM_COLUMNS,
+                f"SELECT {', '.join(f'p.{col}' for col in PROBLEM_COLUMNS)} FROM problems p {where} ORDER BY p.id",
+            ),
+            (
+                "solutions",
+                SOLUTION_COLUMNS,
+                f"SELECT {', '.join(f's.{col}' for col in SOLUTION_COLUMNS)} FROM {DATASET_ROWS['solutions']} {where} ORDER BY s.id",
+            ),
+            (
+                "implementations",
+                IMPLEMENTATION_COLUMNS + ("problem_id",),
+                f"SELECT {', '.join(f'i.{col}' for col in IMPLEMENTATION_COLUMNS)}, p.id FROM {DATASET_ROWS['implementations']} {where} ORDER BY i.id",
+            ),
+        )
+        loaded = 0
+        with tempfile.TemporaryDirectory() as tmp:
+            for table, columns, query in queries:
+                # Rows are staged as newline-delimited JSON for read_json, which
+                # keeps NULLs and integers and is far faster than row inserts
+                path = os.path.join(tmp, f"{table}.jsonl")
+                count = 0
+                with open(path, "w", encoding="utf-8") as f:
+                    for row in iter_fetchmany(
+                        c.execute(query, params), SHARD_FETCH_BATCH
+                    ):
+                        record = {
+                            col: decode_text(value) if col in ENCODED_COLUMNS else value
+                            for col, value in zip(columns, row)
+                        }
+                        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                        count += 1
+                if not count:
+                    continue
+                types = ", ".join(
+                    f"{col}: '{'BIGINT' if col in INTEGER_COLUMNS else 'VARCHAR'}'"
+                    for col in columns
+                )
+                self.conn.execute(
+                    f"INSERT INTO {table} ({', '.join(columns)}) SELECT {', '.join(columns)} "
+                    f"FROM read_json(?, format = 'newline_delimited', columns = {{{types}}})",
+                    [path],
+                )
+                if table == "problems":
+                    loaded = count
+        return loaded
+
+    def counts(self):
+        return {
+            table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("problems", "solutions", "implementations")
+        }
+
+    def problem_ids(self):
+        return [
+            row[0]
+            for row in self.conn.execute(
+                "SELECT id FROM problems ORDER BY id"
+            ).fetchall()
+        ]
+
+    def fetch_problems(self, problem_ids):
+        if not problem_ids:
+            return []
+        ids = [int(pid) for pid in problem_ids]
+        problems = {
+            row[0]: problem_tree(row)
+            for row in self.conn.execute(
+                f"SELECT {', '.join(PROBLEM_COLUMNS)} FROM problems WHERE id IN (SELECT UNNEST(?))",
+                [ids],
+            ).fetchall()
+        }
+        solutions = {}
+        for sid, pid, language in self.conn.execute(
+            "SELECT id, problem_id, language FROM solutions WHERE problem_id IN (SELECT UNNEST(?)) ORDER BY id",
+            [ids],
+        ).fetchall():
+            solutions[sid] = {"language": language, "implementations": []}
+            problems[pid]["solutions"].append(solutions[sid])
+        for row in self.conn.execute(
+            f"SELECT {', '.join(IMPLEMENTATION_COLUMNS[:7])} FROM implementations WHERE problem_id IN (SELECT UNNEST(?)) ORDER BY id",
+            [ids],
+        ).fetchall():
+            if row[1] in solutions:
+                solutions[row[1]]["implementations"].append(implementation_tree(row))
+        return [problems[pid] for pid in ids if pid in problems]
+
+    def iter_problems(self, batch_size=SHARD_FETCH_BATCH):
+        # One ordered scan per table merged on the problem ID, instead of a
+        # lookup per batch
+        problems = self.conn.cursor().execute(
+            f"SELECT {', '.join(PROBLEM_COLUMNS)} FROM problems ORDER BY id"
+        )
+        solutions = self.conn.cursor().execute(
+            "SELECT id, problem_id, language FROM solutions ORDER BY problem_id, id"
+        )
+        implementations = self.conn.cursor().execute(
+            f"SELECT {', '.join(IMPLEMENTATION_COLUMNS[:7])}, problem_id FROM implementations ORDER BY problem_id, solution_id, id"
+        )
+        solution_rows = iter_fetchmany(solutions, batch_size)
+        impl_rows = iter_fetchmany(implementations, batch_size)
+        solution = next(solution_rows, None)
+        impl = next(impl_rows, None)
+        for row in iter_fetchmany(problems, batch_size):
+            pid = row[0]
+            tree = problem_tree(row)
+            by_id = {}
+            while solution is not None and solution[1] <= pid:
+                if solution[1] == pid:
+                    by_id[solution[0]] = {
+                        "language": solution[2],
+                        "implementations": [],
+                    }
+                    tree["solutions"].append(by_id[solution[0]])
+                solution = next(solution_rows, None)
+            while impl is not None and impl[7] <= pid:
+                if impl[7] == pid and impl[1] in by_id:
+                    by_id[impl[1]]["implementations"].append(implementation_tree(impl))
+                impl = next(impl_rows, None)
+            yield tree
+
+    def problem_counts(self, column):
+        if column not in PROBLEM_GROUP_COLUMNS:
+            raise ValueError(f"Cannot group problems by '{column}'")
+        return dict(
+            self.conn.execute(
+                f"SELECT {column}, COUNT(*) FROM problems GROUP BY 1"
+            ).fetchall()
+        )
+
+    def language_counts(self):
+        return dict(
+            self.conn.execute(
+                "SELECT language, COUNT(*) FROM solutions GROUP BY 1"
+            ).fetchall()
+        )
+
+    def metric_summary(self, column):
+        if column not in CODE_METRIC_COLUMNS:
+            raise ValueError(f"Unknown code metric '{column}'")
+        return self.conn.execute(
+            f"SELECT COUNT({column}), AVG({column}), MAX({column}) FROM implementations"
+        ).fetchone()
+
+    def scan_columns(self, table, columns):
+        # Orphans are never copied, so every row belongs to the dataset
+        self.check_columns(table, columns)
+        cursor = self.conn.cursor().execute(
+            f"SELECT {', '.join(columns)} FROM {table} ORDER BY id"
+        )
+        yield from iter_fetchmany(cursor, SHARD_FETCH_BATCH)
+
+    def aggregate(self, query):
+        # DuckDB's default schema is also called "main"
+        return grouped_counts(self.conn.execute(query.format(schema="main")).fetchall())
+
+    def close(self):
+        self.conn.close()
+
+
+def iter_fetchmany(cursor, size):
+    """Yield the rows of a cursor, fetching ``size`` at a time."""
+    while rows := cursor.fetchmany(size):
+        yield from rows
+
+
+STORAGE_BACKENDS = {"sqlite": SqliteBackend, "duckdb": DuckDBBackend}
+
+
+def open_backend(name="sqlite"):
+    """Open the storage backend with the given name over DB_FILE."""
+    if name not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend '{name}'")
+    return STORAGE_BACKENDS[name]()
+
+
+def batched_trees(trees, size):
+    """Yield lists of up to ``size`` items from an iterator."""
+    batch = []
+    for tree in trees:
+        batch.append(tree)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def init_db():
+    """Initialize the database and create tables if they do not exist.
+
+    Returns the warning of ``load_compression_settings``, if any.
+    """
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    create_schema(c)
+    conn.commit()
+    warning = load_compression_settings(c)
+    conn.close()
+    return warning
+
+
+def create_changelog_triggers(c):
+    """Create the triggers recording writes in the changelog."""
+    for table, new_problem, old_problem in CHANGELOG_TRIGGERS:
+        for op, event, ref, problem_expr in (
+            ("insert", "INSERT", "NEW", new_problem),
+            ("update", "UPDATE", "NEW", new_problem),
+            ("delete", "DELETE", "OLD", old_problem),
+        ):
+            c.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS changelog_{table}_{op}
+                AFTER {event} ON {table}
+                BEGIN
+                    INSERT INTO changelog (table_name, row_id, problem_id, op, changed_at)
+                    VALUES ('{table}', {ref}.id, {problem_expr}, '{op}', {CHANGELOG_NOW});
+                END
+            """)
+
+
+def create_schema(c, triggers=True):
+    """Create the missing tables, columns and indexes of a dataset database.
+
+    ``triggers=False`` leaves out the changelog triggers, for bulk copies into
+    a fresh file that add them once the rows are in.
+    """
+    # Only takes effect on a new, empty database; see maintain_vacuum
+    c.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS problems (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            platform TEXT,
+            title TEXT,
+            problem_description TEXT,
+            url TEXT,
+            difficulty TEXT,
+            tags TEXT
+        )
+    """)
+    # Add missing columns if needed
+    columns = [row[1] for row in c.execute("PRAGMA table_info(problems)")]
+    if "difficulty" not in columns:
+        c.execute("ALTER TABLE problems ADD COLUMN difficulty TEXT")
+    if "tags" not in columns:
+        c.execute("ALTER TABLE problems ADD COLUMN tags TEXT")
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS solutions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            problem_id INTEGER,
+            language TEXT,
+            FOREIGN KEY(problem_id) REFERENCES problems(id) ON DELETE CASCADE
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS implementations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            solution_id INTEGER,
+            method_name TEXT,
+            explanation TEXT,
+            url TEXT,
+            code TEXT,
+            notes TEXT,
+            FOREIGN KEY(solution_id) REFERENCES solutions(id) ON DELETE CASCADE
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS compression_dicts (
+            dict_id INTEGER PRIMARY KEY,
+            codec TEXT,
+            data BLOB,
+            created_at REAL
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS changelog (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            problem_id INTEGER,
+            op TEXT NOT NULL,
+            changed_at REAL NOT NULL
+        )
+    """)
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_changelog_problem_id ON changelog(problem_id)"
+    )
+    if triggers:
+        create_changelog_triggers(c)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS url_checks (
+            url TEXT PRIMARY KEY,
+            ok INTEGER,
+            status INTEGER,
+            error TEXT,
+            final_url TEXT,
+            elapsed_ms REAL,
+            checked_at REAL
+        )
+    """)
+    c.execute(MAINTENANCE_LOG_SCHEMA)
+    add_code_metric_columns(c)
+    # Child lookups used by problem loading and the bulk export paths
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_solutions_problem_id ON solutions(problem_id)"
+    )
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_implementations_solution_id ON implementations(solution_id)"
+    )
+
+
+def shared_columns(c, table, src="src", dst="main"):
+    """Return the columns of ``table`` present in both schemas, ID excluded."""
+    dst_columns = {row[1] for row in c.execute(f"PRAGMA {dst}.table_info({table})")}
+    return [
+        row[1]
+        for row in c.execute(f"PRAGMA {src}.table_info({table})")
+        if row[1] in dst_columns and row[1] != "id"
+    ]
+
+
+def extract_database(path, keys, progress=None):
+    """Copy problems with their solutions and implementations into a new database.
+
+    ``keys`` are ``(schema, problem_id)`` pairs of the federated databases.
+    Each source is attached in turn and copied with set-based
+    ``INSERT ... SELECT`` statements through temporary ID maps, so rows are
+    renumbered from 1 without passing through Python. Stored values are copied
+    as they are, compressed or not, together with the zstd dictionaries.
+    ``progress(done, total)`` is called after each source. Returns the numbers
+    of problems, solutions and implementations copied.
+    """
+    if os.path.exists(path):
+        raise FileExistsError(f"{path} already exists")
+    by_schema = {}
+    for schema, pid in keys:
+        by_schema.setdefault(schema, []).append(pid)
+    paths = dict(federation_schemas())
+    part_path = path + ".part"
+    if os.path.exists(part_path):
+        os.remove(part_path)
+    conn = sqlite3.connect(part_path)
+    counts = [0, 0, 0]
+    try:
+        c = conn.cursor()
+        # The changelog of the new file starts empty, so triggers come last
+        create_schema(c, triggers=False)
+        c.execute("CREATE TEMP TABLE extract_ids (id INTEGER PRIMARY KEY)")
+        c.execute(
+            "CREATE TEMP TABLE problem_map (old_id INTEGER PRIMARY KEY, new_id INTEGER)"
+        )
+        c.execute(
+            "CREATE TEMP TABLE solution_map (old_id INTEGER PRIMARY KEY, new_id INTEGER)"
+        )
+        conn.commit()
+        for done, (schema, ids) in enumerate(by_schema.items(), 1):
+            uri = f"file:{urllib.parse.quote(os.path.abspath(paths[schema]))}?mode=ro"
+            c.execute("ATTACH DATABASE ? AS src", (uri,))
+            try:
+                with conn:
+                    for table in ("extract_ids", "problem_map", "solution_map"):
+                        c.execute(f"DELETE FROM temp.{table}")
+                    c.executemany(
+                        "INSERT OR IGNORE INTO temp.extract_ids VALUES (?)",
+                        ((pid,) for pid in ids),
+                    )
+                    c.execute(
+                        """
+                        INSERT INTO temp.problem_map
+                        SELECT id, ? + ROW_NUMBER() OVER (ORDER BY id)
+                        FROM src.problems WHERE id IN (SELECT id FROM temp.extract_ids)
+                        """,
+                        (counts[0],),
+                    )
+                    columns = shared_columns(c, "problems")
+                    c.execute(f"""
+                        INSERT INTO main.problems (id, {", ".join(columns)})
+                        SELECT m.new_id, {", ".join(f"p.{col}" for col in columns)}
+                        FROM temp.problem_map m JOIN src.problems p ON p.id = m.old_id
+                        ORDER BY m.new_id
+                    """)
+                    counts[0] += c.rowcount
+                    c.execute(
+                        """
+                        INSERT INTO temp.solution_map
+                        SELECT s.id, ? + ROW_NUMBER() OVER (ORDER BY s.id)
+                        FROM src.solutions s JOIN temp.problem_map m ON m.old_id = s.problem_id
+                        """,
+                        (counts[1],),
+                    )
+                    columns = shared_columns(c, "solutions")
+                    columns.remove("problem_id")
+                    c.execute(f"""
+                        INSERT INTO main.solutions (id, problem_id, {", ".join(columns)})
+                        SELECT sm.new_id, pm.new_id, {", ".join(f"s.{col}" for col in columns)}
+                        FROM temp.solution_map sm
+                        JOIN src.solutions s ON s.id = sm.old_id
+                        JOIN temp.problem_map pm ON pm.old_id = s.problem_id
+                        ORDER BY sm.new_id
+                    """)
+                    counts[1] += c.rowcount
+                    # Implementations are numbered in the order they are inserted
+                    columns = shared_columns(c, "implementations")
+                    columns.remove("solution_id")
+                    c.execute(f"""
+                        INSERT INTO main.implementations (solution_id, {", ".join(columns)})
+                        SELECT sm.new_id, {", ".join(f"i.{col}" for col in columns)}
+                        FROM src.implementations i
+                        JOIN temp.solution_map sm ON sm.old_id = i.solution_id
+                        ORDER BY sm.new_id, i.id
+                    """)
+                    counts[2] += c.rowcount
+                    if c.execute(
+                        "SELECT 1 FROM src.sqlite_master WHERE name='compression_dicts'"
+                    ).fetchone():
+                        c.execute(
+                            "INSERT OR IGNORE INTO main.compression_dicts SELECT * FROM src.compression_dicts"
+                        )
+            finally:
+                c.execute("DETACH DATABASE src")
+            if progress:
+                progress(done, len(by_schema))
+        # New values written to the extract use the codec of the main database
+        src = sqlite3.connect(DB_FILE)
+        settings = [
+            (key, get_setting(src.cursor(), key))
+            for key in ("compression_codec", "compression_dict_id")
+        ]
+        src.close()
+        for key, value in settings:
+            if value is not None:
+                set_setting(c, key, value)
+        create_changelog_triggers(c)
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(part_path, path)
+    return tuple(counts)
+
+
+MERGE_POLICIES = ("last-writer-wins", "keep-both")
+MERGE_TEMP_TABLES = (
+    "merge_dst",
+    "merge_src",
+    "merge_digest",
+    "merge_time",
+    "merge_target",
+    "merge_solution_map",
+)
+
+
+def merge_key(platform, url, title):
+    """Return the natural key matching a problem across databases.
+
+    Problems with a URL match on platform and URL, others on platform and
+    title, compared case-insensitively and ignoring punctuation.
+    """
+    platform = (platform or "").strip().lower()
+    url = (url or "").strip().rstrip("/")
+    if url:
+        return f"u:{platform}|{url}"
+    words = QUICK_OPEN_WORD_RE.findall((title or "").lower())
+    return f"t:{platform}|{' '.join(words)}" if words else None
+
+
+def merge_hash(*values):
+    """Return a digest of stored values that ignores how they are compressed."""
+    text = "\x1f".join(
+        "\x00" if value is None else str(decode_text(value)) for value in values
+    )
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def merge_database(conn, path, policy="last-writer-wins", dry_run=False):
+    """Merge the problems of another dataset database into the main one.
+
+    ``path`` is attached read-only and its problems are matched to ours by
+    ``merge_key``; duplicates of one key pair up in ID order. Unmatched
+    problems are inserted. Matched ones are unchanged when any of our
+    problems with the same key has the same content, which keeps repeated
+    merges idempotent; otherwise they are conflicts: ``last-writer-wins`` keeps the side changed last according to
+    the changelogs (ties keep ours), ``keep-both`` inserts theirs as a new
+    problem. Replaced problems get the other side's solutions and
+    implementations. Everything is done with set-based SQL in one
+    transaction, with IDs remapped through temporary tables; ``dry_run``
+    rolls it back. Returns a summary of counts by action.
+    """
+    if policy not in MERGE_POLICIES:
+        raise ValueError(f"Unknown merge policy '{policy}'")
+    if os.path.abspath(path) == os.path.abspath(DB_FILE):
+        raise ValueError("Cannot merge a database into itself")
+    conn.create_function("merge_key", 3, merge_key, deterministic=True)
+    conn.create_function("merge_hash", -1, merge_hash, deterministic=True)
+    c = conn.cursor()
+    uri = f"file:{urllib.parse.quote(os.path.abspath(path))}?mode=ro"
+    c.execute("ATTACH DATABASE ? AS src", (uri,))
+    try:
+        c.execute("BEGIN" if dry_run else "BEGIN IMMEDIATE")
+        summary = _merge_plan(c, policy)
+        if not dry_run:
+            summary.update(_merge_apply(c))
+        c.execute("ROLLBACK" if dry_run else "COMMIT")
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        for table in MERGE_TEMP_TABLES:
+            c.execute(f"DROP TABLE IF EXISTS temp.{table}")
+        c.execute("DETACH DATABASE src")
+    return summary
+
+
+def _merge_plan(c, policy):
+    """Match and classify the attached problems into ``temp.merge_src``."""
+    for schema, table in (("main", "merge_dst"), ("src", "merge_src")):
+        c.execute(f"""
+            CREATE TEMP TABLE {table} AS
+            SELECT id, key, ROW_NUMBER() OVER (PARTITION BY key ORDER BY id) AS nth
+            FROM (SELECT id, merge_key(platform, url, title) AS key FROM {schema}.problems)
+        """)
+    c.execute("CREATE INDEX temp.merge_dst_key ON merge_dst(key, nth)")
+    c.execute("ALTER TABLE temp.merge_src ADD COLUMN dst_id INTEGER")
+    c.execute("ALTER TABLE temp.merge_src ADD COLUMN action TEXT")
+    c.execute("""
+        UPDATE temp.merge_src SET dst_id = (
+            SELECT d.id FROM temp.merge_dst d
+            WHERE d.key = merge_src.key AND d.nth = merge_src.nth
+        )
+        WHERE key IS NOT NULL
+    """)
+    # One digest per problem over its fields and all of its children, for the
+    # matched source problems and every destination problem sharing their key
+    # (copies made by earlier keep-both merges included)
+    c.execute(
+        "CREATE TEMP TABLE merge_digest (side TEXT, id INTEGER, digest TEXT, PRIMARY KEY (side, id))"
+    )
+    for schema, matched in (
+        ("src", "SELECT id FROM temp.merge_src WHERE dst_id IS NOT NULL"),
+        (
+            "main",
+            """SELECT id FROM temp.merge_dst WHERE key IN (
+                SELECT key FROM temp.merge_src WHERE dst_id IS NOT NULL
+            )""",
+        ),
+    ):
+        c.execute(f"""
+            INSERT INTO temp.merge_digest
+            SELECT '{schema}', p.id, merge_hash(
+                p.platform, p.title, p.problem_description, p.url, p.difficulty,
+                p.tags, COALESCE(ch.hashes, '')
+            )
+            FROM {schema}.problems p
+            LEFT JOIN (
+                SELECT problem_id, group_concat(h, ',') AS hashes FROM (
+                    SELECT s.problem_id, merge_hash(
+                        s.language, i.method_name, i.explanation, i.url, i.code, i.notes
+                    ) AS h
+                    FROM {schema}.solutions s
+                    LEFT JOIN {schema}.implementations i ON i.solution_id = s.id
+                    WHERE s.problem_id IN ({matched})
+                    ORDER BY s.problem_id, h
+                )
+                GROUP BY problem_id
+            ) ch ON ch.problem_id = p.id
+            WHERE p.id IN ({matched})
+        """)
+    # Last change of each matched problem on either side, if still logged
+    c.execute(
+        "CREATE TEMP TABLE merge_time (side TEXT, id INTEGER, changed_at REAL, PRIMARY KEY (side, id))"
+    )
+    for schema, id_column in (("src", "id"), ("main", "dst_id")):
+        if c.execute(
+            f"SELECT 1 FROM {schema}.sqlite_master WHERE name='changelog'"
+        ).fetchone():
+            c.execute(f"""
+                INSERT INTO temp.merge_time
+                SELECT '{schema}', problem_id, MAX(changed_at)
+                FROM {schema}.changelog
+                WHERE problem_id IN (
+                    SELECT {id_column} FROM temp.merge_src WHERE dst_id IS NOT NULL
+                )
+                GROUP BY problem_id
+            """)
+    conflict = (
+        "'copy'"
+        if policy == "keep-both"
+        else """
+            CASE WHEN COALESCE(
+                (SELECT changed_at FROM merge_time WHERE side = 'src' AND id = merge_src.id), 0
+            ) > COALESCE(
+                (SELECT changed_at FROM merge_time WHERE side = 'main' AND id = merge_src.dst_id), 0
+            ) THEN 'update' ELSE 'keep' END
+        """
+    )
+    c.execute(f"""
+        UPDATE temp.merge_src SET action = CASE
+            WHEN dst_id IS NULL THEN 'insert'
+            WHEN EXISTS (
+                SELECT 1 FROM temp.merge_dst d
+                JOIN merge_digest md ON md.side = 'main' AND md.id = d.id
+                WHERE d.key = merge_src.key AND md.digest = (
+                    SELECT digest FROM merge_digest WHERE side = 'src' AND id = merge_src.id
+                )
+            ) THEN 'unchanged'
+            ELSE {conflict}
+        END
+    """)
+    summary = dict.fromkeys(("insert", "update", "copy", "keep", "unchanged"), 0)
+    summary.update(
+        c.execute("SELECT action, COUNT(*) FROM temp.merge_src GROUP BY action")
+    )
+    summary["conflicts"] = summary["update"] + summary["copy"] + summary["keep"]
+    return summary
+
+
+def _merge_apply(c):
+    """Write the planned inserts and updates; return the children copied."""
+    c.execute(
+        "CREATE TEMP TABLE merge_target (src_id INTEGER PRIMARY KEY, target_id INTEGER)"
+    )
+    c.execute("""
+        INSERT INTO temp.merge_target
+        SELECT id, (
+            SELECT MAX(COALESCE((SELECT seq FROM main.sqlite_sequence WHERE name = 'problems'), 0),
+                       COALESCE((SELECT MAX(id) FROM main.problems), 0))
+        ) + ROW_NUMBER() OVER (ORDER BY id)
+        FROM temp.merge_src WHERE action IN ('insert', 'copy')
+    """)
+    c.execute("""
+        INSERT INTO temp.merge_target
+        SELECT id, dst_id FROM temp.merge_src WHERE action = 'update'
+    """)
+    columns = shared_columns(c, "problems")
+    c.execute(f"""
+        INSERT INTO main.problems (id, {", ".join(columns)})
+        SELECT t.target_id, {", ".join(f"p.{col}" for col in columns)}
+        FROM temp.merge_src m
+        JOIN temp.merge_target t ON t.src_id = m.id
+        JOIN src.problems p ON p.id = m.id
+        WHERE m.action IN ('insert', 'copy')
+        ORDER BY t.target_id
+    """)
+    c.execute(f"""
+        UPDATE main.problems SET ({", ".join(columns)}) = (
+            SELECT {", ".join(f"p.{col}" for col in columns)}
+            FROM temp.merge_src m JOIN src.problems p ON p.id = m.id
+            WHERE m.action = 'update' AND m.dst_id = main.problems.id
+        )
+        WHERE id IN (SELECT dst_id FROM temp.merge_src WHERE action = 'update')
+    """)
+    # Replaced problems take the other side's children wholesale
+    updated = "SELECT dst_id FROM temp.merge_src WHERE action = 'update'"
+    c.execute(f"""
+        DELETE FROM main.implementations WHERE solution_id IN (
+            SELECT id FROM main.solutions WHERE problem_id IN ({updated})
+        )
+    """)
+    c.execute(f"DELETE FROM main.solutions WHERE problem_id IN ({updated})")
+    c.execute(
+        "CREATE TEMP TABLE merge_solution_map (old_id INTEGER PRIMARY KEY, new_id INTEGER, problem_id INTEGER)"
+    )
+    c.execute("""
+        INSERT INTO temp.merge_solution_map
+        SELECT s.id, (
+            SELECT MAX(COALESCE((SELECT seq FROM main.sqlite_sequence WHERE name = 'solutions'), 0),
+                       COALESCE((SELECT MAX(id) FROM main.solutions), 0))
+        ) + ROW_NUMBER() OVER (ORDER BY s.id), t.target_id
+        FROM src.solutions s JOIN temp.merge_target t ON t.src_id = s.problem_id
+    """)
+    columns = shared_columns(c, "solutions")
+    columns.remove("problem_id")
+    c.execute(f"""
+        INSERT INTO main.solutions (id, problem_id, {", ".join(columns)})
+        SELECT sm.new_id, sm.problem_id, {", ".join(f"s.{col}" for col in columns)}
+        FROM temp.merge_solution_map sm JOIN src.solutions s ON s.id = sm.old_id
+        ORDER BY sm.new_id
+    """)
+    solutions = c.rowcount
+    columns = shared_columns(c, "implementations")
+    columns.remove("solution_id")
+    c.execute(f"""
+        INSERT INTO main.implementations (solution_id, {", ".join(columns)})
+        SELECT sm.new_id, {", ".join(f"i.{col}" for col in columns)}
+        FROM src.implementations i
+        JOIN temp.merge_solution_map sm ON sm.old_id = i.solution_id
+        ORDER BY sm.new_id, i.id
+    """)
+    implementations = c.rowcount
+    if c.execute(
+        "SELECT 1 FROM src.sqlite_master WHERE name='compression_dicts'"
+    ).fetchone():
+        c.execute(
+            "INSERT OR IGNORE INTO main.compression_dicts SELECT * FROM src.compression_dicts"
+        )
+    return {"solutions": solutions, "implementations": implementations}
+
+
+def format_merge_summary(summary):
+    """Return a short multi-line description of a merge summary."""
+    lines = [
+        f"New problems: {summary['insert']}",
+        f"Unchanged: {summary['unchanged']}",
+        f"Conflicts: {summary['conflicts']} "
+        f"({summary['update']} replaced by theirs, {summary['keep']} kept as ours, "
+        f"{summary['copy']} added as copies)",
+    ]
+    if "solutions" in summary:
+        lines.append(
+            f"Copied {summary['solutions']} solutions and "
+            f"{summary['implementations']} implementations"
+        )
+    return "\n".join(lines)
+
+
+# Online snapshots are copied this many pages at a time so readers and writers
+# can get at the database between steps
+SNAPSHOT_PAGES_PER_STEP = 256
+SNAPSHOT_STEP_SLEEP = 0.005
+SNAPSHOT_DEFAULT_KEEP = 10
+
+
+def snapshot_dir():
+    """Return the directory snapshots of the database are written to."""
+    return os.path.join(os.path.dirname(os.path.abspath(DB_FILE)), "snapshots")
+
+
+def snapshot_database(label="manual", progress=None, pages=SNAPSHOT_PAGES_PER_STEP):
+    """Copy the live database into a new snapshot file with the SQLite backup API.
+
+    The copy is written to a temporary file and renamed once complete, so a
+    snapshot on disk is never partial. ``progress(remaining, total)`` is called
+    after each step. Returns the path of the snapshot.
+    """
+    os.makedirs(snapshot_dir(), exist_ok=True)
+    stem = os.path.splitext(os.path.basename(DB_FILE))[0]
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    path = os.path.join(snapshot_dir(), f"{stem}-{stamp}-{label}.db")
+    part_path = path + ".part"
+    src = sqlite3.connect(DB_FILE)
+    dst = sqlite3.connect(part_path)
+    try:
+        src.backup(
+            dst,
+            pages=pages,
+            progress=(
+                (lambda status, remaining, total: progress(remaining, total))
+                if progress
+                else None
+            ),
+            sleep=SNAPSHOT_STEP_SLEEP,
+        )
+    except Exception:
+        dst.close()
+        os.remove(part_path)
+        raise
+    finally:
+        src.close()
+    dst.close()
+    os.replace(part_path, path)
+    return path
+
+
+def restore_snapshot(path, progress=None, pages=SNAPSHOT_PAGES_PER_STEP, conn=None):
+    """Replace the contents of the live database with a snapshot.
+
+    The snapshot is copied into ``conn``, or a new connection to DB_FILE,
+    which must not be inside a transaction. The in-memory caches and indexes
+    are left alone; the GUI clears them on its own thread afterwards
+    (``MainWindow.database_replaced``). Returns the warning of
+    ``load_compression_settings`` for the restored database, if any.
+    """
+    src = sqlite3.connect(
+        f"file:{urllib.parse.quote(os.path.abspath(path))}?mode=ro", uri=True
+    )
+    dst = conn or sqlite3.connect(DB_FILE)
+    try:
+        src.backup(
+            dst,
+            pages=pages,
+            progress=(
+                (lambda status, remaining, total: progress(remaining, total))
+                if progress
+                else None
+            ),
+            sleep=SNAPSHOT_STEP_SLEEP,
+        )
+        # Snapshots taken by older versions lack the code metric columns and
+        # the maintenance log
+        add_code_metric_columns(dst.cursor())
+        dst.execute(MAINTENANCE_LOG_SCHEMA)
+        dst.commit()
+        return load_compression_settings(dst.cursor())
+    finally:
+        src.close()
+        if dst is not conn:
+            dst.close()
+
+
+def list_snapshots():
+    """Return the snapshot files, newest first."""
+    if not os.path.isdir(snapshot_dir()):
+        return []
+    paths = [
+        os.path.join(snapshot_dir(), name)
+        for name in os.listdir(snapshot_dir())
+        if name.endswith(".db")
+    ]
+    return sorted(paths, key=os.path.getmtime, reverse=True)
+
+
+def rotate_snapshots(keep, label="auto"):
+    """Delete the oldest snapshots with the given label, keeping ``keep`` of them."""
+    labelled = [p for p in list_snapshots() if p.endswith(f"-{label}.db")]
+    for path in labelled[keep:]:
+        os.remove(path)
+
+
+# ANALYZE samples about this many rows per index instead of reading them all
+MAINTENANCE_ANALYSIS_LIMIT = 1000
+# Pages released per incremental_vacuum step, and the free pages worth reclaiming
+MAINTENANCE_VACUUM_PAGES = 256
+MAINTENANCE_VACUUM_MIN_FREE = 1024
+MAINTENANCE_STEP_SLEEP = 0.01
+# On-demand runs rebuild the file with a full VACUUM above this fragmentation
+MAINTENANCE_REBUILD_FRAGMENTATION = 0.3
+MAINTENANCE_LOG_KEEP = 500
+MAINTENANCE_LOG_FIELDS = (
+    "task",
+    "started_at",
+    "duration_ms",
+    "page_count",
+    "free_before",
+    "free_after",
+    "fragmentation",
+    "result",
+)
+MAINTENANCE_LOG_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS maintenance_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        task TEXT NOT NULL,
+        started_at REAL NOT NULL,
+        duration_ms REAL,
+        page_count INTEGER,
+        free_before INTEGER,
+        free_after INTEGER,
+        fragmentation REAL,
+        result TEXT
+    )
+"""
+AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+
+def btree_names(c):
+    """Return the names of all tables and indexes with b-trees of their own."""
+    return [
+        row[0]
+        for row in c.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'index') AND rootpage > 0 ORDER BY name"
+        )
+    ]
+
+
+def btree_fragmentation(c, name):
+    """Return ``(pages, jumps)`` for one b-tree, or None without the dbstat table.
+
+    Pages are visited in key order; a jump is a page that does not directly
+    follow the previous one in the file, so every jump is a seek for a scan.
+    """
+    try:
+        pages = np.fromiter(
+            (
+                row[0]
+                for row in c.execute("SELECT pageno FROM dbstat WHERE name=?", (name,))
+            ),
+            np.int64,
+        )
+    except sqlite3.OperationalError:
+        return None
+    return len(pages), int(np.count_nonzero(np.diff(pages) != 1))
+
+
+def analyze(c, statement):
+    """Run ANALYZE or PRAGMA optimize under the maintenance analysis limit."""
+    c.execute(f"PRAGMA analysis_limit = {MAINTENANCE_ANALYSIS_LIMIT}")
+    c.execute(statement)
+
+
+def maintain_optimize(conn, write, should_stop, full_vacuum):
+    write(lambda c: analyze(c, "PRAGMA optimize"))
+    return "ok", None
+
+
+def maintain_analyze(conn, write, should_stop, full_vacuum):
+    tables = [
+        row[0]
+        for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND rootpage > 0 AND name NOT LIKE 'sqlite_%'"
+        )
+    ]
+    for name in tables:
+        if should_stop():
+            return "interrupted", None
+        write(lambda c: analyze(c, f'ANALYZE "{name}"'))
+        time.sleep(MAINTENANCE_STEP_SLEEP)
+    return f"analyzed {len(tables)} tables", None
+
+
+def switch_to_incremental_vacuum(conn):
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+
+
+def maintain_vacuum(conn, write, should_stop, full_vacuum):
+    mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    if mode == 0:
+        if not full_vacuum:
+            return (
+                "skipped: auto_vacuum is off, run maintenance once to enable it",
+                None,
+            )
+        # Switching an existing database over needs one full VACUUM
+        write(switch_to_incremental_vacuum, solo=True)
+        return "enabled incremental auto_vacuum with a full VACUUM", None
+    if mode == 1:
+        return "skipped: auto_vacuum is full", None
+    last = conn.execute(
+        "SELECT fragmentation FROM maintenance_log WHERE fragmentation IS NOT NULL ORDER BY id DESC LIMIT 1"
+    ).fetchone()
+    if full_vacuum and last and last[0] > MAINTENANCE_REBUILD_FRAGMENTATION:
+        write(lambda db: db.execute("VACUUM"), solo=True)
+        return f"rebuilt the file, {last[0]:.0%} of pages were out of order", None
+    freed = 0
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    while free and not should_stop():
+        # sqlite3 stops a statement without result columns after its first
+        # step, which would release a single page; executescript runs it out,
+        # but commits first, so it runs outside any transaction
+        write(
+            lambda db: db.executescript(
+                f"PRAGMA incremental_vacuum({MAINTENANCE_VACUUM_PAGES})"
+            ),
+            solo=True,
+        )
+        remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        freed += free - remaining
+        free = remaining
+        time.sleep(MAINTENANCE_STEP_SLEEP)
+    return f"released {freed} pages", None
+
+
+def maintain_integrity(conn, write, should_stop, full_vacuum):
+    """Check each table and its indexes, then measure b-tree fragmentation."""
+    errors = []
+    tables = [
+        row[0]
+        for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND rootpage > 0"
+        )
+    ]
+    for name in tables:
+        if should_stop():
+            return "interrupted", None
+        errors += [
+            row[0]
+            for row in conn.execute(f'PRAGMA integrity_check("{name}")')
+            if row[0] != "ok"
+        ]
+        time.sleep(MAINTENANCE_STEP_SLEEP)
+    pages = jumps = 0
+    for name in btree_names(conn):
+        if should_stop():
+            break
+        stats = btree_fragmentation(conn, name)
+        if stats is None:
+            break
+        pages += stats[0]
+        jumps += stats[1]
+    fragmentation = jumps / pages if pages else None
+    if errors:
+        return f"{len(errors)} problems: " + "; ".join(errors[:5]), fragmentation
+    return "ok", fragmentation
+
+
+# Task name -> (seconds between scheduled runs, function)
+MAINTENANCE_TASKS = {
+    "optimize": (3600, maintain_optimize),
+    "analyze": (24 * 3600, maintain_analyze),
+    "vacuum": (3600, maintain_vacuum),
+    "integrity": (7 * 24 * 3600, maintain_integrity),
+}
+
+
+def due_maintenance_tasks(c, now=None):
+    """Return the tasks whose interval has passed since they last ran."""
+    now = now or time.time()
+    last = dict(
+        c.execute("SELECT task, MAX(started_at) FROM maintenance_log GROUP BY task")
+    )
+    due = [
+        task
+        for task, (interval, _) in MAINTENANCE_TASKS.items()
+        if now - last.get(task, 0) >= interval
+    ]
+    if "vacuum" in due:
+        free = c.execute("PRAGMA freelist_count").fetchone()[0]
+        if free < MAINTENANCE_VACUUM_MIN_FREE:
+            due.remove("vacuum")
+    return due
+
+
+def log_maintenance(c, entry):
+    c.execute(
+        f"INSERT INTO maintenance_log ({', '.join(entry)}) VALUES ({', '.join('?' * len(entry))})",
+        list(entry.values()),
+    )
+    c.execute(
+        "DELETE FROM maintenance_log WHERE id <= (SELECT MAX(id) FROM maintenance_log) - ?",
+        (MAINTENANCE_LOG_KEEP,),
+    )
+
+
+def run_maintenance(
+    conn, tasks, progress=None, should_stop=None, full_vacuum=False, write=None
+):
+    """Run maintenance ``tasks`` in order, logging each to ``maintenance_log``.
+
+    ``conn`` is used for reads; every write goes through ``write`` (see
+    ``transaction_writer``, the default). ``full_vacuum`` allows a full
+    VACUUM, which locks the database while it runs: once to switch an
+    existing database to incremental auto_vacuum, and whenever the last
+    integrity check measured heavy fragmentation. Returns the logged rows as
+    dicts.
+    """
+    should_stop = should_stop or (lambda: False)
+    write = write or transaction_writer(conn)
+    c = conn.cursor()
+    results = []
+    for task in tasks:
+        if should_stop():
+            break
+        if progress:
+            progress(task)
+        free_before = c.execute("PRAGMA freelist_count").fetchone()[0]
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            result, fragmentation = MAINTENANCE_TASKS[task][1](
+                conn, write, should_stop, full_vacuum
+            )
+        except sqlite3.Error as e:
+            result, fragmentation = f"failed: {e}", None
+        entry = {
+            "task": task,
+            "started_at": started_at,
+            "duration_ms": (time.perf_counter() - start) * 1000,
+            "page_count": c.execute("PRAGMA page_count").fetchone()[0],
+            "free_before": free_before,
+            "free_after": c.execute("PRAGMA freelist_count").fetchone()[0],
+            "fragmentation": fragmentation,
+            "result": result,
+        }
+        write(lambda c: log_maintenance(c, entry))
+        results.append(entry)
+    return results
+
+
+def format_maintenance_entry(entry):
+    """Return a one-line summary of a maintenance log entry."""
+    line = (
+        f"{entry['task']}: {entry['result']} in {entry['duration_ms']:.0f} ms, "
+        f"{entry['free_before']} -> {entry['free_after']} free pages "
+        f"of {entry['page_count']}"
+    )
+    if entry["fragmentation"] is not None:
+        line += f", {entry['fragmentation']:.1%} fragmented"
+    return line
+
+
+# Link checking: results are reused for LINK_CHECK_TTL seconds
+LINK_CHECK_TTL = 7 * 24 * 3600
+LINK_CHECK_CONCURRENCY = 32
+LINK_CHECK_PER_HOST = 2
+# Minimum delay between two requests to the same host
+LINK_CHECK_HOST_INTERVAL = 0.25
+LINK_CHECK_TIMEOUT = 10.0
+LINK_CHECK_MAX_REDIRECTS = 5
+LINK_CHECK_USER_AGENT = "cp-dataset-gui-linkcheck/1.0"
+
+
+class HttpConnectionPool:
+    """Keep-alive HTTP/1.1 connections reused per (scheme, host, port)."""
+
+    def __init__(self, max_idle_per_host=LINK_CHECK_PER_HOST):
+        self.max_idle_per_host = max_idle_per_host
+        self.idle = {}
+        self.ssl_context = ssl.create_default_context()
+
+    async def acquire(self, scheme, host, port):
+        """Return ``(reader, writer, reused)`` for the given origin."""
+        connections = self.idle.get((scheme, host, port))
+        while connections:
+            reader, writer = connections.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        reader, writer = await asyncio.open_connection(
+            host,
+            port,
+            ssl=self.ssl_context if scheme == "https" else None,
+            server_hostname=host if scheme == "https" else None,
+        )
+        return reader, writer, False
+
+    def release(self, scheme, host, port, reader, writer):
+        connections = self.idle.setdefault((scheme, host, port), [])
+        if len(connections) < self.max_idle_per_host and not writer.is_closing():
+            connections.append((reader, writer))
+        else:
+            writer.close()
+
+    def close(self):
+        for connections in self.idle.values():
+            for _, writer in connections:
+                writer.close()
+        self.idle.clear()
+
+
+class LinkChecker:
+    """Check many URLs concurrently with HEAD requests, falling back to GET.
+
+    Concurrency is limited globally and per host, and requests to one host are
+    spaced by ``host_interval`` seconds. Only the status line and headers are
+    read, so large pages are never downloaded.
+    """
+
+    def __init__(
+        self,
+        concurrency=LINK_CHECK_CONCURRENCY,
+        per_host=LINK_CHECK_PER_HOST,
+        host_interval=LINK_CHECK_HOST_INTERVAL,
+        timeout=LINK_CHECK_TIMEOUT,
+    ):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.host_interval = host_interval
+        self.timeout = timeout
+        self.pool = HttpConnectionPool(per_host)
+        self.host_limits = {}
+        self.host_next_slot = {}
+
+    async def _request(self, method, url):
+        """Send one request and return ``(status, headers)``."""
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError("Unsupported URL")
+        host = parts.hostname
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        # GET responses have bodies we do not read, so those connections are not reused
+        keep_alive = method == "HEAD"
+        request = (
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {parts.netloc.rsplit('@', 1)[-1]}\r\n"
+            f"User-Agent: {LINK_CHECK_USER_AGENT}\r\n"
+            "Accept: */*\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode("latin-1")
+        limit = self.host_limits.setdefault(host, asyncio.Semaphore(self.per_host))
+        async with limit:
+            loop = asyncio.get_running_loop()
+            slot = max(loop.time(), self.host_next_slot.get(host, 0.0))
+            self.host_next_slot[host] = slot + self.host_interval
+            await asyncio.sleep(slot - loop.time())
+            return await asyncio.wait_for(
+                self._exchange(scheme, host, port, request, keep_alive), self.timeout
+            )
+
+    async def _exchange(self, scheme, host, port, request, keep_alive):
+        """Send a request on a pooled connection and read the response head."""
+        for _ in range(2):
+            reader, writer, reused = await self.pool.acquire(scheme, host, port)
+            try:
+                writer.write(request)
+                await writer.drain()
+                status_line = await reader.readline()
+                if not status_line:
+                    writer.close()
+                    if reused:
+                        # The server closed the idle connection; retry on a new one
+                        continue
+                    raise ConnectionError("Connection closed by server")
+                status = int(status_line.split()[1])
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+            except BaseException:
+                writer.close()
+                raise
+            if keep_alive and headers.get("connection", "").lower() != "close":
+                self.pool.release(scheme, host, port, reader, writer)
+            else:
+                writer.close()
+            return status, headers
+        raise ConnectionError("Connection closed by server")
+
+    async def _follow(self, method, url):
+        """Request a URL following redirects; return ``(status, final_url)``."""
+        for _ in range(LINK_CHECK_MAX_REDIRECTS + 1):
+            status, headers = await self._request(method, url)
+            if status in (301, 302, 303, 307, 308) and "location" in headers:
+                url = urllib.parse.urljoin(url, headers["location"])
+                continue
+            return status, url
+        raise ConnectionError("Too many redirects")
+
+    async def check(self, url):
+        """Check a single URL and return a result dict."""
+        start = time.perf_counter()
+        result = {"url": url, "ok": False, "status": None, "error": None}
+        try:
+            status, final_url = await self._follow("HEAD", url)
+            if status >= 400:
+                # Some servers reject HEAD outright; confirm with a GET
+                status, final_url = await self._follow("GET", url)
+            result.update(status=status, final_url=final_url, ok=status < 400)
+        except asyncio.TimeoutError:
+            result["error"] = "Timed out"
+        except Exception as e:
+            result["error"] = str(e) or type(e).__name__
+        result["elapsed_ms"] = 1000 * (time.perf_counter() - start)
+        result["checked_at"] = time.time()
+        return result
+
+    async def check_all(self, urls, on_result=None):
+        """Check every URL concurrently, calling ``on_result`` as each finishes."""
+        gate = asyncio.Semaphore(self.concurrency)
+
+        async def run(url):
+            async with gate:
+                result = await self.check(url)
+            if on_result:
+                on_result(result)
+            return result
+
+        try:
+            return await asyncio.gather(*(run(url) for url in urls))
+        finally:
+            self.pool.close()
+
+
+def urls_to_check(c, ttl=LINK_CHECK_TTL):
+    """Return problem and implementation URLs without a check newer than ``ttl``."""
+    return [
+        row[0]
+        for row in c.execute(
+            """
+            SELECT url FROM (
+                SELECT url FROM problems UNION SELECT url FROM implementations
+            )
+            WHERE (url LIKE 'http://%' OR url LIKE 'https://%')
+              AND url NOT IN (SELECT url FROM url_checks WHERE checked_at > ?)
+            """,
+            (time.time() - ttl,),
+        )
+    ]
+
+
+def save_link_results(c, results):
+    c.executemany(
+        "INSERT OR REPLACE INTO url_checks (url, ok, status, error, final_url, elapsed_ms, checked_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                r["url"],
+                int(r["ok"]),
+                r["status"],
+                r["error"],
+                r.get("final_url"),
+                r["elapsed_ms"],
+                r["checked_at"],
+            )
+            for r in results
+        ],
+    )
+
+
+# Similarity search over implementation code: token n-grams are hashed into a
+# fixed feature space and weighted by TF-IDF
+SIMILARITY_NGRAM = 3
+SIMILARITY_FEATURE_BITS = 22
+SIMILARITY_BATCH = 2000
+SIMILARITY_TOP_K = 20
+# Queries use at most this many of their rarest n-grams, skipping any n-gram
+# found in more than SIMILARITY_MAX_DF of the indexed implementations
+SIMILARITY_QUERY_TERMS = 64
+SIMILARITY_MAX_DF = 0.05
+CODE_TOKEN_RE = re.compile(r"[A-Za-z_]\w*|\d+|[^\w\s]")
+
+
+def code_features(code, mask=(1 << SIMILARITY_FEATURE_BITS) - 1, n=SIMILARITY_NGRAM):
+    """Return the distinct hashed token n-grams of ``code`` and their counts.
+
+    Tokens are hashed with the built-in ``hash``, so features are only
+    comparable within one process.
+    """
+    tokens = CODE_TOKEN_RE.findall(code or "")
+    if not tokens:
+        return np.empty(0, np.int32), np.empty(0, np.uint16)
+    hashes = np.fromiter(map(hash, tokens), np.int64, len(tokens))
+    n = min(n, len(hashes))
+    m = len(hashes) - n + 1
+    grams = hashes[:m].copy()
+    for i in range(1, n):
+        # Integer overflow wraps around, which is fine for hashing
+        grams = grams * 1000003 ^ hashes[i : i + m]
+    features, counts = np.unique(grams & mask, return_counts=True)
+    return features.astype(np.int32), np.minimum(counts, 65535).astype(np.uint16)
+
+
+def _tf_weights(counts):
+    return 1.0 + np.log(counts.astype(np.float32))
+
+
+def _grow(arr, size):
+    """Return ``arr`` with room for ``size`` entries, doubling its capacity."""
+    if size <= len(arr):
+        return arr
+    grown = np.zeros(max(size, 2 * len(arr)), arr.dtype)
+    grown[: len(arr)] = arr
+    return grown
+
+
+class SimilaritySegment:
+    """Postings for a contiguous range of documents, sorted by feature."""
+
+    __slots__ = ("start", "stop", "features", "offsets", "docs", "counts")
+
+    def __init__(self, start, stop, docs, feats, counts):
+        order = np.argsort(feats, kind="stable")
+        feats = feats[order]
+        self.start = start
+        self.stop = stop
+        self.docs = docs[order]
+        self.counts = counts[order]
+        self.features, first = np.unique(feats, return_index=True)
+        self.offsets = np.append(first, len(feats)).astype(np.int64)
+
+    def postings(self):
+        """Return the segment's ``(docs, features, counts)`` as flat arrays."""
+        feats = np.repeat(self.features, np.diff(self.offsets))
+        return self.docs, feats, self.counts
+
+    def nbytes(self):
+        return (
+            self.docs.nbytes
+            + self.counts.nbytes
+            + self.features.nbytes
+            + self.offsets.nbytes
+        )
+
+
+class SimilarityIndex:
+    """In-memory TF-IDF index over implementation code.
+
+    Documents are added in batches, each becoming an immutable segment with a
+    feature-sorted inverted index; adjacent segments of similar size are
+    merged so a query only visits a logarithmic number of segments. Removed
+    implementations are tombstoned and dropped when their segment is merged.
+    """
+
+    def __init__(self, feature_bits=SIMILARITY_FEATURE_BITS):
+        self.lock = threading.RLock()
+        self.mask = (1 << feature_bits) - 1
+        self.generation = 0
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.segments = []
+            # Allocated with the first documents, so an empty index stays small
+            self.df = None
+            self.n_docs = 0
+            self.impl_ids = np.zeros(1024, np.int64)
+            self.alive = np.zeros(1024, np.bool_)
+            self.doc_of = {}
+            self.synced_seq = None
+
+    def __len__(self):
+        return len(self.doc_of)
+
+    def _idf(self, feats):
+        return np.log((1.0 + len(self.doc_of)) / (1.0 + self.df[feats])) + 1.0
+
+    def remove(self, impl_ids):
+        """Tombstone the documents of the given implementations."""
+        with self.lock:
+            for impl_id in impl_ids:
+                doc = self.doc_of.pop(impl_id, None)
+                if doc is not None:
+                    self.alive[doc] = False
+
+    def add(self, items, generation=None):
+        """Index ``(impl_id, features, counts)`` items as one new segment.
+
+        Returns False without indexing when the index was cleared since
+        ``generation`` was read.
+        """
+        with self.lock:
+            if generation is not None and generation != self.generation:
+                return False
+            self.remove([item[0] for item in items])
+            start = self.n_docs
+            stop = start + len(items)
+            lengths = [len(item[1]) for item in items]
+            docs = np.repeat(np.arange(start, stop, dtype=np.int32), lengths)
+            feats = np.concatenate([item[1] for item in items] + [[]]).astype(np.int32)
+            counts = np.concatenate([item[2] for item in items] + [[]]).astype(
+                np.uint16
+            )
+            unique, df = np.unique(feats, return_counts=True)
+            if self.df is None:
+                self.df = np.zeros(self.mask + 1, np.int32)
+            self.df[unique] += df.astype(np.int32)
+            self.impl_ids = _grow(self.impl_ids, stop)
+            self.alive = _grow(self.alive, stop)
+            for doc, (impl_id, _, _) in enumerate(items, start):
+                self.impl_ids[doc] = impl_id
+                self.alive[doc] = True
+                self.doc_of[impl_id] = doc
+            self.n_docs = stop
+            self.segments.append(SimilaritySegment(start, stop, docs, feats, counts))
+        self.merge_segments()
+        return True
+
+    def merge_segments(self):
+        """Merge the newest segments while the older one is at most twice as large.
+
+        The merged segment is built without holding the lock, so queries keep
+        running on the old segments until it is swapped in.
+        """
+        while True:
+            with self.lock:
+                if len(self.segments) < 2:
+                    return
+                older, newer = self.segments[-2:]
+                if older.stop - older.start > 2 * (newer.stop - newer.start):
+                    return
+                generation = self.generation
+                alive = self.alive[older.start : newer.stop].copy()
+            docs, feats, counts = (
+                np.concatenate(parts)
+                for parts in zip(older.postings(), newer.postings())
+            )
+            live = alive[docs - older.start]
+            merged = SimilaritySegment(
+                older.start, newer.stop, docs[live], feats[live], counts[live]
+            )
+            with self.lock:
+                if generation != self.generation or self.segments[-2:] != [
+                    older,
+                    newer,
+                ]:
+                    return
+                # Document frequencies only drop once tombstoned postings are gone
+                dead, dead_df = np.unique(feats[~live], return_counts=True)
+                self.df[dead] -= dead_df.astype(np.int32)
+                self.segments[-2:] = [merged]
+
+    def query(self, code, k=SIMILARITY_TOP_K, exclude=None):
+        """Return up to ``k`` ``(impl_id, similarity)`` pairs most similar to ``code``.
+
+        The similarity is the cosine over the query n-grams that were used
+        (see ``SIMILARITY_QUERY_TERMS``), so identical code scores 1.0.
+        """
+        feats, counts = code_features(code, self.mask)
+        with self.lock:
+            if not len(feats) or not self.doc_of:
+                return []
+            weights = _tf_weights(counts) * self._idf(feats)
+            order = np.argsort(-weights, kind="stable")
+            common = self.df[feats[order]] > SIMILARITY_MAX_DF * len(self.doc_of)
+            if np.count_nonzero(~common) >= 8:
+                order = order[~common]
+            order = order[:SIMILARITY_QUERY_TERMS]
+            feats, weights = feats[order], weights[order]
+            query_norm = float(np.sqrt(np.sum(weights**2)))
+            idf = self._idf(feats)
+            doc_parts, dot_parts, square_parts = [], [], []
+            for seg in self.segments:
+                if not len(seg.features):
+                    continue
+                pos = np.minimum(
+                    np.searchsorted(seg.features, feats), len(seg.features) - 1
+                )
+                hit = seg.features[pos] == feats
+                for p, w, term_idf in zip(pos[hit], weights[hit], idf[hit]):
+                    lo, hi = seg.offsets[p], seg.offsets[p + 1]
+                    doc_weights = _tf_weights(seg.counts[lo:hi]) * term_idf
+                    doc_parts.append(seg.docs[lo:hi])
+                    dot_parts.append(doc_weights * w)
+                    square_parts.append(doc_weights**2)
+            if not doc_parts:
+                return []
+            docs = np.concatenate(doc_parts)
+            scores = np.bincount(
+                docs, weights=np.concatenate(dot_parts), minlength=self.n_docs
+            )
+            # Document norms over the same n-grams as the query
+            doc_norms = np.sqrt(
+                np.bincount(
+                    docs, weights=np.concatenate(square_parts), minlength=self.n_docs
+                )
+            )
+            candidates = np.flatnonzero(scores)
+            candidates = candidates[self.alive[candidates]]
+            if exclude in self.doc_of:
+                candidates = candidates[candidates != self.doc_of[exclude]]
+            # Clamp rounding error
+            similarity = np.minimum(
+                scores[candidates] / (doc_norms[candidates] * query_norm + 1e-12),
+                1.0,
+            )
+            if len(candidates) > k:
+                top = np.argpartition(-similarity, k)[:k]
+                candidates, similarity = candidates[top], similarity[top]
+            order = np.argsort(-similarity, kind="stable")
+            return [
+                (int(self.impl_ids[doc]), float(sim))
+                for doc, sim in zip(candidates[order], similarity[order])
+            ]
+
+    def stats(self):
+        with self.lock:
+            return {
+                "documents": len(self.doc_of),
+                "tombstones": self.n_docs - len(self.doc_of),
+                "segments": len(self.segments),
+                "bytes": sum(seg.nbytes() for seg in self.segments)
+                + (self.df.nbytes if self.df is not None else 0)
+                + self.impl_ids.nbytes
+                + self.alive.nbytes,
+            }
+
+
+similarity_index = SimilarityIndex()
+
+
+def update_similarity_index(
+    conn, index=None, batch_size=SIMILARITY_BATCH, progress=None, should_stop=None
+):
+    """Bring ``index`` up to date with the implementations in the main database.
+
+    The first call indexes every implementation; later calls only re-index
+    implementations with changelog entries since the previous call.
+    """
+    index = similarity_index if index is None else index
+    c = conn.cursor()
+    max_seq, min_seq = c.execute(
+        "SELECT COALESCE(MAX(seq), 0), COALESCE(MIN(seq), 0) FROM changelog"
+    ).fetchone()
+    if index.synced_seq is not None and (
+        max_seq < index.synced_seq or min_seq > index.synced_seq + 1
+    ):
+        # The database was replaced or changelog entries were pruned; start over
+        index.clear()
+    generation = index.generation
+    if index.synced_seq == max_seq:
+        return 0
+
+    def index_rows(rows):
+        items = [
+            (impl_id, *code_features(decode_text(code), index.mask))
+            for impl_id, code in rows
+        ]
+        if not index.add(items, generation):
+            raise InterruptedError("Similarity index was cleared")
+
+    done = 0
+    if index.synced_seq is None:
+        total = c.execute("SELECT COUNT(*) FROM implementations").fetchone()[0]
+        last_id = 0
+        while True:
+            if should_stop and should_stop():
+                # Leave synced_seq unset so the next update starts over
+                return done
+            rows = c.execute(
+                "SELECT id, code FROM implementations WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            index_rows(rows)
+            last_id = rows[-1][0]
+            done += len(rows)
+            if progress:
+                progress(done, total)
+    else:
+        changed = [
+            row[0]
+            for row in c.execute(
+                "SELECT DISTINCT row_id FROM changelog WHERE table_name = 'implementations' AND seq > ? AND seq <= ?",
+                (index.synced_seq, max_seq),
+            )
+        ]
+        index.remove(changed)
+        for start in range(0, len(changed), 900):
+            chunk = changed[start : start + 900]
+            rows = c.execute(
+                f"SELECT id, code FROM implementations WHERE id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            if rows:
+                index_rows(rows)
+            done += len(rows)
+    with index.lock:
+        if index.generation == generation:
+            index.synced_seq = max_seq
+    return done
+
+
+# Quick open: trigram index over problem titles and platforms
+QUICK_OPEN_RESULTS = 20
+QUICK_OPEN_CANDIDATES = 200
+# Share of the query's trigrams a title needs to be a candidate
+QUICK_OPEN_MIN_OVERLAP = 0.5
+# Changed titles are scanned directly until this many pile up, then re-indexed
+QUICK_OPEN_PENDING_MAX = 1000
+QUICK_OPEN_WORD_RE = re.compile(r"\w+")
+
+
+def quick_open_text(title, platform):
+    """Return the normalised text indexed for a problem."""
+    words = QUICK_OPEN_WORD_RE.findall(f"{title or ''} {platform or ''}".lower())
+    return " " + " ".join(words) + " "
+
+
+def trigram_codes(text):
+    """Return the distinct trigrams of ``text`` packed into int64 codes."""
+    chars = np.frombuffer(text.encode("utf-32-le"), np.uint32).astype(np.int64)
+    if len(chars) < 3:
+        return np.empty(0, np.int64)
+    return np.unique((chars[:-2] << 42) | (chars[1:-1] << 21) | chars[2:])
+
+
+class QuickOpenIndex:
+    """In-memory fuzzy index over the titles and platforms of all problems.
+
+    Every title is split into character trigrams; a sorted CSR layout maps
+    each trigram to the titles containing it, so a query only touches the
+    postings of its own trigrams and scores them with one ``bincount``.
+    Titles changed since the last rebuild are kept in a short pending list
+    that is scanned directly, and removed titles are tombstoned.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.keys = []  # (schema, problem ID) per document
+            self.texts = []
+            self.titles = []
+            self.platforms = []
+            self.doc_of = {}
+            self.alive = np.zeros(0, bool)
+            self.codes = np.empty(0, np.int64)
+            self.offsets = np.zeros(1, np.int64)
+            self.docs = np.empty(0, np.int32)
+            self.indexed = 0  # Documents below this are in the CSR arrays
+            self.pending = {}  # Newer documents -> their trigram codes
+            self.synced_seq = None
+            self.generation = getattr(self, "generation", 0) + 1
+
+    def add(self, rows, rebuild=False):
+        """Add or replace ``(schema, problem_id, title, platform)`` rows."""
+        with self.lock:
+            self.remove((schema, pid) for schema, pid, *_ in rows)
+            start = len(self.keys)
+            for schema, pid, title, platform in rows:
+                self.doc_of[(schema, pid)] = len(self.keys)
+                self.keys.append((schema, pid))
+                self.titles.append(title or "")
+                self.platforms.append(platform or "")
+                self.texts.append(quick_open_text(title, platform))
+            self.alive = np.concatenate([self.alive, np.ones(len(rows), bool)])
+            if rebuild or len(self.pending) + len(rows) > QUICK_OPEN_PENDING_MAX:
+                self.rebuild()
+                return
+            for doc in range(start, len(self.keys)):
+                self.pending[doc] = trigram_codes(self.texts[doc])
+
+    def remove(self, keys):
+        with self.lock:
+            for key in keys:
+                doc = self.doc_of.pop(key, None)
+                if doc is not None:
+                    self.alive[doc] = False
+                    self.pending.pop(doc, None)
+
+    def rebuild(self):
+        """Re-index every live document into the CSR arrays, dropping tombstones."""
+        with self.lock:
+            live = [doc for doc in range(len(self.keys)) if self.alive[doc]]
+            self.keys = [self.keys[d] for d in live]
+            self.titles = [self.titles[d] for d in live]
+            self.platforms = [self.platforms[d] for d in live]
+            self.texts = [self.texts[d] for d in live]
+            self.doc_of = {key: doc for doc, key in enumerate(self.keys)}
+            self.alive = np.ones(len(live), bool)
+            # Documents are joined with NUL separators and trigrams spanning a
+            # separator are dropped, so all codes come from one vector pass
+            joined = "\0".join(self.texts)
+            chars = np.frombuffer(joined.encode("utf-32-le"), np.uint32).astype(
+                np.int64
+            )
+            lengths = np.fromiter(map(len, self.texts), np.int64, len(self.texts))
+            doc_ids = np.repeat(np.arange(len(live), dtype=np.int32), lengths + 1)[
+                : len(chars)
+            ]
+            if len(chars) >= 3:
+                codes = (chars[:-2] << 42) | (chars[1:-1] << 21) | chars[2:]
+                valid = (chars[:-2] != 0) & (chars[1:-1] != 0) & (chars[2:] != 0)
+                codes, docs = codes[valid], doc_ids[:-2][valid]
+            else:
+                codes, docs = np.empty(0, np.int64), np.empty(0, np.int32)
+            order = np.lexsort((docs, codes))
+            codes, docs = codes[order], docs[order]
+            # Count each trigram once per document
+            keep = np.ones(len(codes), bool)
+            keep[1:] = (codes[1:] != codes[:-1]) | (docs[1:] != docs[:-1])
+            codes, docs = codes[keep], docs[keep]
+            self.codes, starts = np.unique(codes, return_index=True)
+            self.offsets = np.append(starts, len(codes)).astype(np.int64)
+            self.docs = docs
+            self.indexed = len(live)
+            self.pending = {}
+
+    def query(self, text, k=QUICK_OPEN_RESULTS):
+        """Return up to ``k`` ``(schema, problem_id, title, platform)`` best matches."""
+        words = QUICK_OPEN_WORD_RE.findall(text.lower())
+        if not words:
+            return []
+        needle = " ".join(words)
+        # No trailing space: the last word is usually still being typed
+        codes = trigram_codes(" " + needle)
+        with self.lock:
+            if not len(codes):
+                # A single character: take titles with a word starting with it,
+                # i.e. the postings of every trigram beginning " <char>"
+                low = (ord(" ") << 42) | (ord(needle) << 21)
+                lo, hi = np.searchsorted(self.codes, [low, low + (1 << 21)])
+                hits = np.unique(
+                    np.concatenate(
+                        [
+                            self.docs[start : start + QUICK_OPEN_CANDIDATES]
+                            for start in self.offsets[lo:hi]
+                        ]
+                        + [np.fromiter(self.pending, np.int32, len(self.pending))]
+                    )
+                )
+                hits = [
+                    doc
+                    for doc in hits[self.alive[hits]]
+                    if f" {needle}" in self.texts[doc]
+                ][:QUICK_OPEN_CANDIDATES]
+                counts = np.ones(len(hits))
+            else:
+                pos = np.minimum(
+                    np.searchsorted(self.codes, codes), max(len(self.codes) - 1, 0)
+                )
+                found = pos[self.codes[pos] == codes] if len(self.codes) else pos[:0]
+                parts = [
+                    self.docs[self.offsets[p] : self.offsets[p + 1]] for p in found
+                ]
+                scores = np.bincount(
+                    np.concatenate(parts) if parts else np.empty(0, np.int32),
+                    minlength=len(self.keys),
+                ).astype(np.float64)
+                if self.pending:
+                    pending_codes = np.concatenate(list(self.pending.values()))
+                    pending_docs = np.repeat(
+                        np.fromiter(self.pending, np.int64, len(self.pending)),
+                        [len(v) for v in self.pending.values()],
+                    )
+                    scores += np.bincount(
+                        pending_docs[np.isin(pending_codes, codes)],
+                        minlength=len(self.keys),
+                    )
+                scores[~self.alive] = 0
+                needed = max(1.0, np.ceil(len(codes) * QUICK_OPEN_MIN_OVERLAP))
+                hits = np.flatnonzero(scores >= needed)
+                if len(hits) > QUICK_OPEN_CANDIDATES:
+                    top = np.argpartition(-scores[hits], QUICK_OPEN_CANDIDATES)
+                    hits = hits[top[:QUICK_OPEN_CANDIDATES]]
+                counts = scores[hits] / len(codes)
+            ranked = []
+            for doc, overlap in zip(hits, counts):
+                doc_text = self.texts[doc]
+                score = overlap
+                if f" {needle}" in doc_text:
+                    score += 1.0  # Whole query at a word start
+                elif needle in doc_text:
+                    score += 0.5
+                # Prefer shorter titles among equally good matches
+                ranked.append((-score, len(doc_text), int(doc)))
+            ranked.sort()
+            return [
+                (*self.keys[doc], self.titles[doc], self.platforms[doc])
+                for _, _, doc in ranked[:k]
+            ]
+
+    def __len__(self):
+        return len(self.doc_of)
+
+
+quick_open_index = QuickOpenIndex()
+
+
+def update_quick_open_index(conn, index=None):
+    """Bring ``index`` up to date with the problems of every federated database.
+
+    The first call loads all titles; later calls only apply problems with
+    changelog entries since the previous call. Attached databases are
+    read-only, so only the main database can change.
+    """
+    index = quick_open_index if index is None else index
+    c = conn.cursor()
+    max_seq, min_seq = c.execute(
+        "SELECT COALESCE(MAX(seq), 0), COALESCE(MIN(seq), 0) FROM main.changelog"
+    ).fetchone()
+    with index.lock:
+        synced_seq, generation = index.synced_seq, index.generation
+    if synced_seq is not None and (max_seq < synced_seq or min_seq > synced_seq + 1):
+        # The database was replaced or changelog entries were pruned
+        index.clear()
+        synced_seq, generation = None, index.generation
+    if synced_seq == max_seq:
+        return 0
+    if synced_seq is None:
+        rows = [
+            (schema, pid, title, platform)
+            for schema, _ in federation_schemas()
+            for pid, title, platform in c.execute(
+                f"SELECT id, title, platform FROM {schema}.problems"
+            )
+        ]
+    else:
+        ids = [
+            row[0]
+            for row in c.execute(
+                "SELECT DISTINCT row_id FROM main.changelog WHERE table_name = 'problems' AND seq > ? AND seq <= ?",
+                (synced_seq, max_seq),
+            )
+        ]
+        rows = []
+        for start in range(0, len(ids), 900):
+            chunk = ids[start : start + 900]
+            rows += [
+                ("main", *row)
+                for row in c.execute(
+                    f"SELECT id, title, platform FROM main.problems WHERE id IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+            ]
+    with index.lock:
+        if index.generation != generation:
+            return 0
+        if synced_seq is None:
+            index.add(rows, rebuild=True)
+        else:
+            index.remove(("main", pid) for pid in ids)
+            index.add(rows)
+        index.synced_seq = max_seq
+    return len(rows)
+
+
+def check_db_integrity(db_file=None):
+    """Check if the database has the required tables and columns."""
+    try:
+        conn = sqlite3.connect(db_file or DB_FILE)
+        c = conn.cursor()
+        # Check for required tables and columns
+        c.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='problems'"
+        )
+        if not c.fetchone():
+            raise Exception("Missing 'problems' table")
+        c.execute("PRAGMA table_info(problems)")
+        problem_cols = [row[1] for row in c.fetchall()]
+        for col in [
+            "platform",
+            "title",
+            "problem_description",
+            "url",
+            "difficulty",
+            "tags",
+        ]:
+            if col not in problem_cols:
+                raise Exception(f"Missing column '{col}' in 'problems'")
+        c.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='solutions'"
+        )
+        if not c.fetchone():
+            raise Exception("Missing 'solutions' table")
+        c.execute("PRAGMA table_info(solutions)")
+        solution_cols = [row[1] for row in c.fetchall()]
+        for col in ["problem_id", "language"]:
+            if col not in solution_cols:
+                raise Exception(f"Missing column '{col}' in 'solutions'")
+        c.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='implementations'"
+        )
+        if not c.fetchone():
+            raise Exception("Missing 'implementations' table")
+        c.execute("PRAGMA table_info(implementations)")
+        impl_cols = [row[1] for row in c.fetchall()]
+        for col in [
+            "solution_id",
+            "method_name",
+            "explanation",
+            "url",
+            "code",
+            "notes",
+        ]:
+            if col not in impl_cols:
+                raise Exception(f"Missing column '{col}' in 'implementations'")
+        conn.close()
+        return True, None
+    except Exception as e:
+        return False, str(e)
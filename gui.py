@@ -0,0 +1,3035 @@
+"""The PyQt6 user interface, started by ``main.py`` when run without arguments."""
+
+import os
+import sqlite3
+import json
+import csv
+import time
+import asyncio
+import shutil
+import queue
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qtagg import FigureCanvas
+from matplotlib.patches import Rectangle
+from PyQt6.QtWidgets import (
+    QApplication,
+    QCheckBox,
+    QComboBox,
+    QDialog,
+    QDialogButtonBox,
+    QFileDialog,
+    QFormLayout,
+    QGridLayout,
+    QGroupBox,
+    QHBoxLayout,
+    QHeaderView,
+    QInputDialog,
+    QLabel,
+    QLineEdit,
+    QListView,
+    QListWidget,
+    QListWidgetItem,
+    QMainWindow,
+    QMessageBox,
+    QProgressBar,
+    QPushButton,
+    QScrollArea,
+    QSpinBox,
+    QTabWidget,
+    QTableWidget,
+    QTableWidgetItem,
+    QTextEdit,
+    QToolTip,
+    QVBoxLayout,
+    QWidget,
+)
+from PyQt6.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QThread,
+    QTimer,
+    Qt,
+    pyqtSignal,
+)
+from PyQt6.QtGui import QActionGroup, QCursor, QIcon, QKeySequence
+
+from core import (
+    SHARD_FETCH_BATCH,
+    STORAGE_BACKENDS,
+    SqliteBackend,
+    open_backend,
+    ATTACHED_DATABASES,
+    CODE_METRIC_COLUMNS,
+    CSV_COLUMNS,
+    DB_FILE,
+    JsonlLineIndex,
+    LINK_CHECK_TTL,
+    LinkChecker,
+    MAINTENANCE_TASKS,
+    MAX_ATTACHED_DATABASES,
+    MERGE_POLICIES,
+    SNAPSHOT_DEFAULT_KEEP,
+    backfill_code_metrics,
+    changed_problem_ids,
+    chart_filter_condition,
+    check_db_integrity,
+    code_metric_schemas,
+    connect_federated,
+    decode_text,
+    diagnostics_report,
+    due_maintenance_tasks,
+    export_delta,
+    export_shards,
+    extract_database,
+    federated_counts,
+    federation_schemas,
+    format_merge_summary,
+    format_record_ranges,
+    format_size,
+    get_setting,
+    implementation_cache,
+    import_csv_file,
+    import_jsonl_file,
+    import_jsonl_ranges,
+    init_db,
+    insert_problem_tree,
+    list_snapshots,
+    load_implementation,
+    merge_database,
+    merge_ranges,
+    parse_record_ranges,
+    parse_split_ratios,
+    problem_cache,
+    quick_open_index,
+    restore_snapshot,
+    rotate_snapshots,
+    run_maintenance,
+    sample_jsonl,
+    save_link_results,
+    set_setting,
+    similarity_index,
+    snapshot_database,
+    snapshot_dir,
+    text_length,
+    update_problem_tree,
+    update_quick_open_index,
+    update_similarity_index,
+    urls_to_check,
+)
+from report import (
+    CHARTS,
+    CODE_METRIC_CHARTS,
+    CROSSTAB_TOP_K,
+    CROSSTAB_VIEWS,
+    ColumnarDataset,
+    PLACEHOLDER_LABELS,
+    crosstab,
+    draw_heatmap,
+)
+
+# Path to the logo icon
+LOGO_ICON_PATH = "assets/images/logo.ico"
+STARTUP_PROBE_ENV = "CP_DATASET_GUI_STARTUP_PROBE"
+
+
+# Visualization Dialog
+class BarChartInteraction:
+    """Hover tooltips and click selection for a bar chart on a Qt canvas.
+
+    Bars sit at x = 0, 1, 2, ... so the bar under the cursor is found with
+    arithmetic instead of hit-testing every bar, and tooltips are prepared
+    up front. The selection outline is an animated artist blitted onto a
+    cached background, so neither hovering nor clicking redraws the figure.
+    """
+
+    def __init__(self, canvas, counts, on_select=None):
+        self.canvas = canvas
+        self.ax = canvas.figure.axes[0]
+        self.labels = list(counts)
+        self.counts = np.array(list(counts.values()), np.float64)
+        total = self.counts.sum() or 1
+        self.tooltips = [
+            f"{label}: {count} ({count / total:.1%})" for label, count in counts.items()
+        ]
+        bars = self.ax.containers[0].patches if self.ax.containers else []
+        self.bar_width = bars[0].get_width() if bars else 0.8
+        self.on_select = on_select
+        self.hovered = None
+        self.selected = None
+        self.background = None
+        self.highlight = Rectangle(
+            (0, 0),
+            self.bar_width,
+            0,
+            fill=False,
+            edgecolor="red",
+            linewidth=2,
+            animated=True,
+            visible=False,
+        )
+        self.ax.add_patch(self.highlight)
+        canvas.mpl_connect("draw_event", self.on_draw)
+        canvas.mpl_connect("motion_notify_event", self.on_move)
+        canvas.mpl_connect("button_press_event", self.on_click)
+
+    def bar_at(self, event):
+        """Return the index of the bar under a mouse event, or None."""
+        if event.inaxes is not self.ax or event.xdata is None:
+            return None
+        i = int(round(event.xdata))
+        if (
+            0 <= i < len(self.counts)
+            and abs(event.xdata - i) <= self.bar_width / 2
+            and 0 <= event.ydata <= self.counts[i]
+        ):
+            return i
+        return None
+
+    def on_draw(self, event):
+        # A full redraw skips animated artists; keep it as the blit background
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        if self.selected is not None:
+            self.ax.draw_artist(self.highlight)
+
+    def on_move(self, event):
+        i = self.bar_at(event)
+        if i == self.hovered:
+            return
+        self.hovered = i
+        if i is None:
+            QToolTip.hideText()
+        else:
+            QToolTip.showText(QCursor.pos(), self.tooltips[i], self.canvas)
+
+    def on_click(self, event):
+        if event.inaxes is not self.ax:
+            return
+        i = self.bar_at(event)
+        # Clicking the selected bar or the background clears the selection
+        self.selected = None if i == self.selected else i
+        if self.selected is not None:
+            self.highlight.set_bounds(
+                self.selected - self.bar_width / 2,
+                0,
+                self.bar_width,
+                self.counts[self.selected],
+            )
+        self.highlight.set_visible(self.selected is not None)
+        if self.background is not None:
+            self.canvas.restore_region(self.background)
+            if self.selected is not None:
+                self.ax.draw_artist(self.highlight)
+            self.canvas.blit(self.ax.bbox)
+        if self.on_select:
+            self.on_select(
+                None if self.selected is None else self.labels[self.selected]
+            )
+
+
+class VisualizationDialog(QDialog):
+    """Dialog for displaying visualizations and data relations of the CP dataset."""
+
+    def __init__(self, parent=None, on_filter=None, backend="sqlite"):
+        super().__init__(parent)
+        # Called with (field, value) when a bar is selected, or None when cleared
+        self.on_filter = on_filter
+        # Storage backend the charts read through; open while the dialog is
+        self.backend_name = backend
+        self.backend = None
+        self.finished.connect(self.close_backend)
+        self.setWindowIcon(QIcon(LOGO_ICON_PATH))
+        self.setWindowTitle("Visualizations & Data Relations")
+        self.resize(1200, 800)
+        layout = QVBoxLayout()
+        tabs = QTabWidget()
+        # Data for visualizations
+        self.problem_data = self.fetch_data()
+        # Tab 1: Data Relationship Graph
+        tabs.addTab(self.create_graph_tab(), "Data Relations Graph")
+        # Tab 2: Problem Count by Difficulty
+        tabs.addTab(self.create_difficulty_chart(), "Problems by Difficulty")
+        # Tab 3: Tag Frequency
+        tabs.addTab(self.create_tag_chart(), "Tag Frequency")
+        # Tab 4: Language Usage
+        tabs.addTab(self.create_language_chart(), "Language Usage")
+        # Tab 5: Cross-tab heatmaps
+        tabs.addTab(self.create_crosstab_tab(), "Cross-tab Analytics")
+        # Tab 6: Code metric distributions
+        tabs.addTab(self.create_code_metrics_tab(), "Code Metrics")
+        layout.addWidget(tabs)
+        self.setLayout(layout)
+
+    def fetch_data(self):
+        """Fetch all problems and their solutions/implementations from the database."""
+        try:
+            self.backend = open_backend(self.backend_name)
+            return ColumnarDataset.load(self.backend)
+        except Exception as e:
+            show_error(self, f"Error fetching data: {e}")
+            return ColumnarDataset.empty()
+
+    def close_backend(self):
+        if self.backend:
+            self.backend.close()
+            self.backend = None
+
+    def chart_canvas(self, name, filter_field=None):
+        """Draw a registered chart from the dialog's dataset on a Qt canvas.
+
+        With ``filter_field`` the chart's bars can be clicked to filter the
+        main table by that field.
+        """
+        _, data, draw = CHARTS[name]
+        chart_input = data(self.problem_data)
+        fig = Figure()
+        draw(fig, chart_input)
+        canvas = FigureCanvas(fig)
+        if filter_field and not chart_input.keys() <= PLACEHOLDER_LABELS:
+            # Matplotlib only keeps weak references to the event handlers
+            canvas.interaction = BarChartInteraction(
+                canvas,
+                chart_input,
+                lambda value: self.select_bar(filter_field, value),
+            )
+        return canvas
+
+    def chart_tab(self, name, filter_field=None):
+        tab = QWidget()
+        vbox = QVBoxLayout()
+        vbox.addWidget(self.chart_canvas(name, filter_field))
+        if filter_field:
+            vbox.addWidget(
+                QLabel("Click a bar to show its problems in the main table.")
+            )
+        tab.setLayout(vbox)
+        return tab
+
+    def select_bar(self, field, value):
+        if self.on_filter:
+            self.on_filter(None if value is None else (field, value))
+
+    def create_graph_tab(self):
+        # Node/edge diagram of problems, languages and implementations
+        scroll = QScrollArea()
+        scroll.setWidget(self.chart_canvas("relations"))
+        scroll.setWidgetResizable(True)
+        tab = QWidget()
+        vbox = QVBoxLayout()
+        vbox.addWidget(scroll)
+        tab.setLayout(vbox)
+        return tab
+
+    def create_difficulty_chart(self):
+        return self.chart_tab("difficulty", "difficulty")
+
+    def create_tag_chart(self):
+        return self.chart_tab("tags", "tag")
+
+    def create_language_chart(self):
+        return self.chart_tab("languages", "language")
+
+    def create_code_metrics_tab(self):
+        # Histograms of the precomputed metric columns, one per grid cell
+        tab = QWidget()
+        grid = QGridLayout()
+        for k, column in enumerate(CODE_METRIC_CHARTS):
+            name = f"metric-{column.removeprefix('code_')}"
+            grid.addWidget(self.chart_canvas(name, column), k // 2, k % 2)
+        vbox = QVBoxLayout()
+        vbox.addLayout(grid)
+        vbox.addWidget(
+            QLabel(
+                "Click a bar to show problems with an implementation in that range. "
+                "Implementations added before metrics existed are counted once "
+                "their metrics have been computed in the background."
+            )
+        )
+        tab.setLayout(vbox)
+        return tab
+
+    def create_crosstab_tab(self):
+        # Heatmaps of grouped counts; the grouped rows are fetched once per view
+        self.crosstab_counts = {}
+        self.crosstab_view = QComboBox()
+        self.crosstab_view.addItems(list(CROSSTAB_VIEWS))
+        self.crosstab_top_k = QSpinBox()
+        self.crosstab_top_k.setRange(2, 200)
+        self.crosstab_top_k.setValue(CROSSTAB_TOP_K)
+        self.crosstab_status = QLabel()
+        self.crosstab_figure = Figure()
+        self.crosstab_canvas = FigureCanvas(self.crosstab_figure)
+        self.crosstab_view.currentTextChanged.connect(self.update_crosstab)
+        self.crosstab_top_k.valueChanged.connect(self.update_crosstab)
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("View:"))
+        controls.addWidget(self.crosstab_view)
+        controls.addWidget(QLabel("Top K:"))
+        controls.addWidget(self.crosstab_top_k)
+        controls.addStretch()
+        controls.addWidget(self.crosstab_status)
+        tab = QWidget()
+        vbox = QVBoxLayout()
+        vbox.addLayout(controls)
+        vbox.addWidget(self.crosstab_canvas)
+        tab.setLayout(vbox)
+        self.update_crosstab()
+        return tab
+
+    def update_crosstab(self):
+        view = self.crosstab_view.currentText()
+        top_k = self.crosstab_top_k.value()
+        start = time.perf_counter()
+        try:
+            if view not in self.crosstab_counts:
+                self.crosstab_counts[view] = federated_counts(
+                    CROSSTAB_VIEWS[view][0], backend=self.backend
+                )
+            rows, cols, matrix = crosstab(view, self.crosstab_counts[view], top_k)
+        except Exception as e:
+            show_error(self, f"Error computing {view}: {e}")
+            return
+        draw_heatmap(self.crosstab_figure, view, rows, cols, matrix)
+        self.crosstab_canvas.draw_idle()
+        self.crosstab_status.setText(
+            f"Computed in {1000 * (time.perf_counter() - start):.0f} ms"
+        )
+
+
+def show_alert(parent, text, title="Alert"):
+    """Show a warning alert message box."""
+    try:
+        QMessageBox.warning(parent, title, text)
+    except Exception as e:
+        print(f"Failed to show alert: {e}")
+
+
+def show_error(parent, text, title="Error"):
+    """Show an error message box."""
+    try:
+        QMessageBox.critical(parent, title, text)
+    except Exception as e:
+        print(f"Failed to show error: {e}")
+
+
+JSONL_PREVIEW_CHARS = 300
+
+
+class JsonlIndexWorker(QThread):
+    """Background thread that maps a JSONL file and builds its line index."""
+
+    progress = pyqtSignal(int, int)
+    finished_ok = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent, path):
+        super().__init__(parent)
+        self.path = path
+
+    def run(self):
+        try:
+            # Qt progress bars hold ints, so report megabytes
+            index = JsonlLineIndex.open(
+                self.path,
+                lambda done, total: self.progress.emit(done >> 20, total >> 20),
+            )
+            self.finished_ok.emit(index)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class JsonlLinesModel(QAbstractListModel):
+    """List model over a JsonlLineIndex that only decodes the rows Qt asks for."""
+
+    def __init__(self, lines):
+        super().__init__()
+        self.lines = lines
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.lines)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        text = self.lines.line(index.row(), JSONL_PREVIEW_CHARS)
+        return f"{index.row() + 1}: {text}"
+
+
+class JsonlPreviewDialog(QDialog):
+    """Preview a JSONL file record by record and choose which records to import."""
+
+    def __init__(self, parent, path):
+        super().__init__(parent)
+        self.setWindowIcon(QIcon(LOGO_ICON_PATH))
+        self.setWindowTitle(f"Preview {os.path.basename(path)}")
+        self.resize(1100, 750)
+        self.path = path
+        self.index = None
+        self.status_label = QLabel("Indexing lines...")
+        self.progress_bar = QProgressBar()
+        self.line_view = QListView()
+        self.line_view.setUniformItemSizes(True)
+        self.line_view.setSelectionMode(QListView.SelectionMode.ExtendedSelection)
+        self.record_view = QTextEdit()
+        self.record_view.setReadOnly(True)
+        self.goto_spin = QSpinBox()
+        self.goto_spin.setPrefix("Record ")
+        self.goto_spin.setEnabled(False)
+        self.goto_spin.editingFinished.connect(self.go_to_record)
+        self.stats_view = QTextEdit()
+        self.stats_view.setReadOnly(True)
+        self.sample_btn = QPushButton("Sample Records")
+        self.sample_btn.clicked.connect(self.show_sample)
+        self.add_selection_btn = QPushButton("Add Selection to Ranges")
+        self.add_selection_btn.clicked.connect(self.add_selection)
+        self.ranges_edit = QLineEdit("all")
+        self.ranges_edit.setToolTip(
+            "Record numbers to import, e.g. 1-1000, 2500, 4000- (or 'all')"
+        )
+        nav = QHBoxLayout()
+        nav.addWidget(self.goto_spin)
+        nav.addWidget(self.sample_btn)
+        nav.addWidget(self.add_selection_btn)
+        nav.addStretch()
+        nav.addWidget(self.status_label)
+        details = QTabWidget()
+        details.addTab(self.record_view, "Record")
+        details.addTab(self.stats_view, "Sample Schema && Stats")
+        ranges = QFormLayout()
+        ranges.addRow("Import records:", self.ranges_edit)
+        self.buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        self.buttons.button(QDialogButtonBox.StandardButton.Ok).setText("Import")
+        self.buttons.accepted.connect(self.accept_ranges)
+        self.buttons.rejected.connect(self.reject)
+        for widget in (self.sample_btn, self.add_selection_btn, self.buttons):
+            widget.setEnabled(False)
+        layout = QVBoxLayout()
+        layout.addLayout(nav)
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.line_view, 2)
+        layout.addWidget(details, 1)
+        layout.addLayout(ranges)
+        layout.addWidget(self.buttons)
+        self.setLayout(layout)
+        self.ranges = None
+        self.worker = JsonlIndexWorker(self, path)
+        self.worker.progress.connect(self.update_progress)
+        self.worker.finished_ok.connect(self.index_ready)
+        self.worker.failed.connect(self.index_failed)
+        self.worker.start()
+
+    def update_progress(self, done, total):
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(done)
+
+    def index_ready(self, index):
+        self.index = index
+        self.progress_bar.hide()
+        self.status_label.setText(f"{len(index)} lines, {index.size / 1e6:.1f} MB")
+        self.line_view.setModel(JsonlLinesModel(index))
+        self.line_view.selectionModel().currentChanged.connect(self.show_record)
+        self.goto_spin.setRange(1, max(len(index), 1))
+        self.goto_spin.setEnabled(bool(len(index)))
+        for widget in (self.sample_btn, self.add_selection_btn, self.buttons):
+            widget.setEnabled(True)
+
+    def index_failed(self, message):
+        show_error(self, f"Could not read {self.path}:\n{message}")
+        self.reject()
+
+    def go_to_record(self):
+        if not self.index or not len(self.index):
+            return
+        row = self.line_view.model().index(self.goto_spin.value() - 1)
+        self.line_view.setCurrentIndex(row)
+        self.line_view.scrollTo(row, QListView.ScrollHint.PositionAtTop)
+
+    def show_record(self, current, previous=None):
+        if not current.isValid():
+            return
+        try:
+            obj = self.index.record(current.row())
+            text = "(blank line)" if obj is None else json.dumps(obj, indent=2)
+        except ValueError as e:
+            text = f"Invalid JSON: {e}\n\n{self.index.line(current.row())}"
+        self.record_view.setPlainText(text)
+
+    def show_sample(self):
+        stats = sample_jsonl(self.index)
+        lines = [
+            f"{stats['lines']} lines, {stats['bytes'] / 1e6:.1f} MB. "
+            f"Sampled {stats['sampled']} records "
+            f"({stats['blank']} blank, {len(stats['errors'])} invalid).",
+        ]
+        if stats["sampled"]:
+            lines.append(
+                f"Per record: {stats['solutions'] / stats['sampled']:.2f} solutions, "
+                f"{stats['implementations'] / stats['sampled']:.2f} implementations"
+            )
+        lines.append("\nFields:")
+        for key, types in sorted(
+            stats["fields"].items(), key=lambda x: -sum(x[1].values())
+        ):
+            seen = sum(types.values())
+            type_names = ", ".join(f"{t} ({n})" for t, n in types.items())
+            lines.append(
+                f"  {key}: {seen / max(stats['sampled'], 1):.0%} - {type_names}"
+            )
+        for title, counts in (
+            ("Platforms", stats["platforms"]),
+            ("Languages", stats["languages"]),
+        ):
+            lines.append(f"\n{title}:")
+            lines += [f"  {name}: {count}" for name, count in list(counts.items())[:15]]
+        if stats["errors"]:
+            lines.append("\nInvalid records:")
+            lines += [f"  {line}: {error}" for line, error in stats["errors"][:20]]
+        self.stats_view.setPlainText("\n".join(lines))
+
+    def add_selection(self):
+        rows = sorted(
+            i.row() for i in self.line_view.selectionModel().selectedIndexes()
+        )
+        if not rows:
+            show_alert(self, "Select records in the list first.")
+            return
+        selected = []
+        for row in rows:
+            if selected and row == selected[-1][1]:
+                selected[-1] = (selected[-1][0], row + 1)
+            else:
+                selected.append((row, row + 1))
+        current = self.ranges_edit.text().strip().lower()
+        existing = (
+            []
+            if current in ("", "all")
+            else parse_record_ranges(current, len(self.index))
+        )
+        self.ranges_edit.setText(
+            format_record_ranges(merge_ranges(existing + selected))
+        )
+
+    def accept_ranges(self):
+        try:
+            self.ranges = parse_record_ranges(self.ranges_edit.text(), len(self.index))
+        except ValueError as e:
+            show_error(self, str(e))
+            return
+        if not self.ranges:
+            show_alert(self, "No records selected for import.")
+            return
+        self.accept()
+
+    def done(self, result):
+        if self.worker.isRunning():
+            self.worker.wait()
+        super().done(result)
+
+
+class ShardExportWorker(QThread):
+    """Background thread that drives a sharded export so the UI stays responsive."""
+
+    progress = pyqtSignal(int, int)
+    finished_ok = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent, out_dir, num_shards, mode, ratios):
+        super().__init__(parent)
+        self.out_dir = out_dir
+        self.num_shards = num_shards
+        self.mode = mode
+        self.ratios = ratios
+
+    def run(self):
+        try:
+            summary = export_shards(
+                self.out_dir,
+                self.num_shards,
+                self.mode,
+                self.ratios,
+                progress=self.progress.emit,
+            )
+            self.finished_ok.emit(summary)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class DeltaExportWorker(QThread):
+    """Background thread that writes a delta export so the UI stays responsive."""
+
+    finished_ok = pyqtSignal(int, int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent, writer, file_path):
+        super().__init__(parent)
+        # The watermark is advanced through the GUI's DatabaseWriter
+        self.writer = writer
+        self.file_path = file_path
+
+    def run(self):
+        try:
+            conn = sqlite3.connect(DB_FILE)
+            try:
+                upserts, deletes, _ = export_delta(
+                    conn, self.file_path, write=self.writer.call
+                )
+            finally:
+                conn.close()
+            self.finished_ok.emit(upserts, deletes)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class ExtractWorker(QThread):
+    """Background thread copying problems into a new database file."""
+
+    progress = pyqtSignal(int, int)
+    finished_ok = pyqtSignal(tuple)
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent, path, keys):
+        super().__init__(parent)
+        self.path = path
+        self.keys = keys
+
+    def run(self):
+        try:
+            counts = extract_database(self.path, self.keys, progress=self.progress.emit)
+            self.finished_ok.emit(counts)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class MergePlanWorker(QThread):
+    """Background thread computing a dry-run merge summary."""
+
+    finished_ok = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent, path, policy):
+        super().__init__(parent)
+        self.path = path
+        self.policy = policy
+
+    def run(self):
+        try:
+            conn = sqlite3.connect(DB_FILE, timeout=30)
+            try:
+                summary = merge_database(conn, self.path, self.policy, dry_run=True)
+            finally:
+                conn.close()
+            self.finished_ok.emit(summary)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class SnapshotWorker(QThread):
+    """Background thread that takes or restores a snapshot without blocking the UI."""
+
+    progress = pyqtSignal(int, int)
+    finished_ok = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+    def __init__(
+        self, parent=None, restore_path=None, label="manual", keep=None, writer=None
+    ):
+        super().__init__(parent)
+        self.restore_path = restore_path
+        self.label = label
+        self.keep = keep
+        # A restore runs as a solo operation on the GUI's DatabaseWriter
+        self.writer = writer
+        self.warning = None
+
+    def run(self):
+        try:
+            if self.restore_path:
+                self.warning = self.writer.call(
+                    lambda conn: restore_snapshot(
+                        self.restore_path, progress=self.progress.emit, conn=conn
+                    ),
+                    solo=True,
+                )
+                self.finished_ok.emit(self.restore_path)
+                return
+            path = snapshot_database(self.label, progress=self.progress.emit)
+            if self.keep:
+                rotate_snapshots(self.keep, self.label)
+            self.finished_ok.emit(path)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class SnapshotDialog(QDialog):
+    """Dialog for taking, scheduling and restoring database snapshots."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowIcon(QIcon(LOGO_ICON_PATH))
+        self.setWindowTitle("Database Snapshots")
+        self.resize(600, 400)
+        self.worker = None
+        self.snapshot_list = QListWidget()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setValue(0)
+        self.interval_spin = QSpinBox()
+        self.interval_spin.setRange(0, 24 * 60)
+        self.interval_spin.setSuffix(" min")
+        self.interval_spin.setSpecialValueText("Off")
+        self.keep_spin = QSpinBox()
+        self.keep_spin.setRange(1, 1000)
+        interval, keep = parent.snapshot_schedule() if parent else (0, 10)
+        self.interval_spin.setValue(interval)
+        self.keep_spin.setValue(keep)
+        take_btn = QPushButton("Take Snapshot")
+        take_btn.clicked.connect(self.take_snapshot)
+        restore_btn = QPushButton("Restore Selected")
+        restore_btn.clicked.connect(self.restore_selected)
+        delete_btn = QPushButton("Delete Selected")
+        delete_btn.clicked.connect(self.delete_selected)
+        btn_layout = QHBoxLayout()
+        btn_layout.addWidget(take_btn)
+        btn_layout.addWidget(restore_btn)
+        btn_layout.addWidget(delete_btn)
+        schedule_group = QGroupBox("Scheduled Snapshots")
+        schedule_layout = QFormLayout()
+        schedule_layout.addRow("Every:", self.interval_spin)
+        schedule_layout.addRow("Keep last:", self.keep_spin)
+        schedule_group.setLayout(schedule_layout)
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel(f"Snapshots in {snapshot_dir()}:"))
+        layout.addWidget(self.snapshot_list)
+        layout.addLayout(btn_layout)
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(schedule_group)
+        self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        self.buttons.rejected.connect(self.reject)
+        layout.addWidget(self.buttons)
+        self.setLayout(layout)
+        self.refresh_list()
+
+    def refresh_list(self):
+        self.snapshot_list.clear()
+        for path in list_snapshots():
+            size = os.path.getsize(path) / (1024 * 1024)
+            item = QListWidgetItem(f"{os.path.basename(path)}  ({size:.1f} MB)")
+            item.setData(Qt.ItemDataRole.UserRole, path)
+            self.snapshot_list.addItem(item)
+
+    def start_worker(self, worker):
+        if self.worker and self.worker.isRunning():
+            show_alert(self, "A snapshot operation is already running.")
+            return
+        self.worker = worker
+        worker.progress.connect(self.update_progress)
+        worker.finished_ok.connect(self.worker_finished)
+        worker.failed.connect(lambda msg: show_error(self, f"Snapshot failed:\n{msg}"))
+        worker.start()
+
+    def update_progress(self, remaining, total):
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(total - remaining)
+
+    def worker_finished(self, path):
+        self.refresh_list()
+        if self.worker.restore_path and self.parent():
+            self.parent().database_replaced()
+            if self.worker.warning:
+                self.parent().statusBar().showMessage(self.worker.warning, 10000)
+            QMessageBox.information(self, "Restore", f"Restored {path}.")
+
+    def take_snapshot(self):
+        self.start_worker(SnapshotWorker(self))
+
+    def restore_selected(self):
+        item = self.snapshot_list.currentItem()
+        if not item:
+            show_alert(self, "Please select a snapshot to restore.")
+            return
+        ret = QMessageBox.question(
+            self,
+            "Restore?",
+            "Replace the current database with the selected snapshot?",
+        )
+        if ret != QMessageBox.StandardButton.Yes:
+            return
+        path = item.data(Qt.ItemDataRole.UserRole)
+        self.start_worker(
+            SnapshotWorker(self, restore_path=path, writer=self.parent().writer)
+        )
+
+    def delete_selected(self):
+        item = self.snapshot_list.currentItem()
+        if not item:
+            show_alert(self, "Please select a snapshot to delete.")
+            return
+        path = item.data(Qt.ItemDataRole.UserRole)
+        ret = QMessageBox.question(
+            self,
+            "Delete?",
+            f"Are you sure you want to delete the snapshot {os.path.basename(path)}?",
+        )
+        if ret != QMessageBox.StandardButton.Yes:
+            return
+        try:
+            os.remove(path)
+        except OSError as e:
+            show_error(self, f"Failed to delete snapshot:\n{e}")
+        self.refresh_list()
+
+    def get_schedule(self):
+        """Return the snapshot interval in minutes and the number of snapshots to keep."""
+        return self.interval_spin.value(), self.keep_spin.value()
+
+
+# Background maintenance: each task runs once its interval has passed while the
+# GUI is idle, or on demand. Every step is a short statement of its own so
+# queued writes can get at the database in between.
+MAINTENANCE_CHECK_MS = 60000
+MAINTENANCE_IDLE_SECONDS = 120
+
+
+class MaintenanceWorker(QThread):
+    """Background thread running database maintenance tasks."""
+
+    progress = pyqtSignal(str)
+    finished_ok = pyqtSignal(list)
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent, writer, tasks=None, full_vacuum=False):
+        super().__init__(parent)
+        # Every step writes through the GUI's DatabaseWriter
+        self.writer = writer
+        self.tasks = tasks or list(MAINTENANCE_TASKS)
+        self.full_vacuum = full_vacuum
+
+    def run(self):
+        try:
+            conn = sqlite3.connect(DB_FILE, timeout=30)
+            try:
+                results = run_maintenance(
+                    conn,
+                    self.tasks,
+                    progress=self.progress.emit,
+                    should_stop=self.isInterruptionRequested,
+                    full_vacuum=self.full_vacuum,
+                    write=self.writer.call,
+                )
+            finally:
+                conn.close()
+            self.finished_ok.emit(results)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+# Write-behind queue: operations queued together are committed together
+WRITE_GROUP_MAX = 64
+# SQLITE_BUSY handling: short lock wait per attempt, then exponential backoff
+WRITE_BUSY_TIMEOUT = 0.25
+WRITE_BUSY_RETRIES = 8
+WRITE_BUSY_BACKOFF = 0.05
+
+
+def is_busy_error(e):
+    """Return True for SQLITE_BUSY / SQLITE_LOCKED errors worth retrying."""
+    code = getattr(e, "sqlite_errorcode", None)
+    if code is not None:
+        # Extended result codes keep the primary code in the low byte
+        return code & 0xFF in (5, 6)
+    return "locked" in str(e) or "busy" in str(e)
+
+
+class DatabaseWriter(QThread):
+    """Thread that performs every GUI write to the main database.
+
+    ``submit(fn)`` queues ``fn(cursor)``. Operations already waiting in the
+    queue are run in one transaction and committed together, each inside a
+    savepoint so a failing operation is rolled back on its own. When the
+    database is locked by another connection the whole group is rolled back
+    and retried with exponential backoff. Operations submitted with
+    ``solo=True`` get ``fn(connection)`` outside any group and manage their
+    own transactions. Worker threads use ``call`` to wait for their writes.
+    """
+
+    completed = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.queue = queue.Queue()
+        self.next_id = 0
+        self.lock = threading.Lock()
+        self.stopped = False
+        # Futures of the operations queued by ``call``, by operation ID
+        self.futures = {}
+
+    def submit(self, fn, solo=False):
+        """Queue a write operation and return its ID."""
+        return self.enqueue(fn, solo)
+
+    def call(self, fn, solo=False):
+        """Run a write operation from a worker thread and return its result.
+
+        Blocks until the operation is committed and raises its exception if it
+        failed; no signal is emitted for it. A ``write`` for the long-running
+        jobs in core (see ``transaction_writer``). Never call it from the GUI
+        thread.
+        """
+        future = Future()
+        self.enqueue(fn, solo, future)
+        return future.result()
+
+    def enqueue(self, fn, solo, future=None):
+        with self.lock:
+            if self.stopped:
+                raise RuntimeError("The database writer has stopped.")
+            self.next_id += 1
+            op_id = self.next_id
+            if future:
+                self.futures[op_id] = future
+            self.queue.put((op_id, fn, solo))
+        return op_id
+
+    def stop(self):
+        """Finish the queued operations and end the thread."""
+        with self.lock:
+            self.stopped = True
+            self.queue.put(None)
+        self.wait()
+
+    def report(self, op_id, result=None, error=None):
+        with self.lock:
+            future = self.futures.pop(op_id, None)
+        if future and error is not None:
+            future.set_exception(error)
+        elif future:
+            future.set_result(result)
+        elif error is not None:
+            self.failed.emit(op_id, str(error))
+        else:
+            self.completed.emit(op_id, result)
+
+    def run(self):
+        conn = sqlite3.connect(DB_FILE, timeout=WRITE_BUSY_TIMEOUT)
+        try:
+            stopping = False
+            while not stopping:
+                item = self.queue.get()
+                group = []
+                # Gather everything already waiting into as few commits as possible
+                while item:
+                    op_id, fn, solo = item
+                    if solo:
+                        self.flush(conn, group)
+                        group = []
+                        self.with_retries(
+                            conn, [op_id], lambda: self.run_solo(conn, op_id, fn)
+                        )
+                    else:
+                        group.append(item)
+                        if len(group) == WRITE_GROUP_MAX:
+                            self.flush(conn, group)
+                            group = []
+                    item = self.next_item()
+                stopping = item is None
+                self.flush(conn, group)
+        finally:
+            conn.close()
+
+    def next_item(self):
+        """Return the next queued item without waiting, or False if there is none."""
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            return False
+
+    def flush(self, conn, group):
+        if group:
+            self.with_retries(
+                conn,
+                [op_id for op_id, _, _ in group],
+                lambda: self.run_group(conn, group),
+            )
+
+    def with_retries(self, conn, op_ids, attempt):
+        """Run ``attempt`` until the database is not busy; report failure otherwise."""
+        for retry in range(WRITE_BUSY_RETRIES + 1):
+            try:
+                attempt()
+                return
+            except sqlite3.OperationalError as e:
+                if conn.in_transaction:
+                    conn.rollback()
+                if retry == WRITE_BUSY_RETRIES:
+                    for op_id in op_ids:
+                        self.report(op_id, error=e)
+                    return
+                time.sleep(WRITE_BUSY_BACKOFF * 2**retry)
+
+    def run_solo(self, conn, op_id, fn):
+        try:
+            result = fn(conn)
+        except sqlite3.OperationalError as e:
+            if is_busy_error(e):
+                raise
+            # A transaction left open would make the next group's BEGIN fail
+            if conn.in_transaction:
+                conn.rollback()
+            self.report(op_id, error=e)
+        except Exception as e:
+            if conn.in_transaction:
+                conn.rollback()
+            self.report(op_id, error=e)
+        else:
+            self.report(op_id, result)
+
+    def run_group(self, conn, group):
+        results = []
+        c = conn.cursor()
+        try:
+            # Take the write lock up front so a busy database fails before any work
+            c.execute("BEGIN IMMEDIATE")
+            for op_id, fn, _ in group:
+                c.execute("SAVEPOINT write_op")
+                try:
+                    results.append((op_id, True, fn(c)))
+                except Exception as e:
+                    if isinstance(e, sqlite3.OperationalError) and is_busy_error(e):
+                        raise
+                    c.execute("ROLLBACK TO write_op")
+                    results.append((op_id, False, e))
+                c.execute("RELEASE write_op")
+            conn.commit()
+        except sqlite3.OperationalError as e:
+            if is_busy_error(e):
+                raise
+            if conn.in_transaction:
+                conn.rollback()
+            results = [(op_id, False, e) for op_id, _, _ in group]
+        for op_id, ok, result in results:
+            if ok:
+                self.report(op_id, result)
+            else:
+                self.report(op_id, error=result)
+
+
+class LinkCheckWorker(QThread):
+    """Background thread running the asyncio link checker and storing its results."""
+
+    progress = pyqtSignal(int, int)
+    finished_ok = pyqtSignal(int, int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent, writer, recheck_all=False):
+        super().__init__(parent)
+        # Results are saved through the GUI's DatabaseWriter
+        self.writer = writer
+        self.recheck_all = recheck_all
+
+    def run(self):
+        try:
+            conn = sqlite3.connect(DB_FILE)
+            try:
+                urls = urls_to_check(
+                    conn.cursor(), ttl=0 if self.recheck_all else LINK_CHECK_TTL
+                )
+            finally:
+                conn.close()
+            pending = []
+            counts = {"done": 0, "broken": 0}
+
+            def save(results):
+                self.writer.call(lambda c: save_link_results(c, results))
+
+            def on_result(result):
+                pending.append(result)
+                counts["done"] += 1
+                counts["broken"] += not result["ok"]
+                if len(pending) >= 100:
+                    save(pending[:])
+                    pending.clear()
+                self.progress.emit(counts["done"], len(urls))
+
+            asyncio.run(LinkChecker().check_all(urls, on_result))
+            if pending:
+                save(pending)
+            self.finished_ok.emit(counts["done"], counts["broken"])
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+SIMILARITY_REFRESH_MS = 30000
+
+
+class SimilarityIndexWorker(QThread):
+    """Background thread keeping the similarity index up to date."""
+
+    progress = pyqtSignal(int, int)
+    finished_ok = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+    def run(self):
+        try:
+            conn = sqlite3.connect(DB_FILE)
+            try:
+                indexed = update_similarity_index(
+                    conn,
+                    progress=self.progress.emit,
+                    should_stop=self.isInterruptionRequested,
+                )
+            finally:
+                conn.close()
+            self.finished_ok.emit(indexed)
+        except InterruptedError:
+            pass
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class QuickOpenIndexWorker(QThread):
+    """Background thread keeping the quick-open index up to date."""
+
+    finished_ok = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+    def run(self):
+        try:
+            conn = connect_federated()
+            try:
+                updated = update_quick_open_index(conn)
+            finally:
+                conn.close()
+            self.finished_ok.emit(updated)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class CodeMetricsWorker(QThread):
+    """Background thread backfilling the code metric columns."""
+
+    progress = pyqtSignal(int, int)
+    finished_ok = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent, writer):
+        super().__init__(parent)
+        # Finished batches are written through the GUI's DatabaseWriter
+        self.writer = writer
+
+    def run(self):
+        try:
+            conn = sqlite3.connect(DB_FILE, timeout=30)
+            try:
+                done = backfill_code_metrics(
+                    conn,
+                    progress=self.progress.emit,
+                    should_stop=self.isInterruptionRequested,
+                    write=self.writer.call,
+                )
+            finally:
+                conn.close()
+            self.finished_ok.emit(done)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class QuickOpenDialog(QDialog):
+    """Type-ahead palette jumping to a problem by its title or platform."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowIcon(QIcon(LOGO_ICON_PATH))
+        self.setWindowTitle("Quick Open")
+        self.resize(600, 400)
+        self.selected = None
+        self.results = []
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText("Type part of a title or platform...")
+        self.query_edit.textChanged.connect(self.search)
+        self.query_edit.returnPressed.connect(self.accept_current)
+        self.query_edit.installEventFilter(self)
+        self.result_list = QListWidget()
+        self.result_list.itemActivated.connect(self.accept_current)
+        self.status_label = QLabel()
+        layout = QVBoxLayout()
+        layout.addWidget(self.query_edit)
+        layout.addWidget(self.result_list)
+        layout.addWidget(self.status_label)
+        self.setLayout(layout)
+        self.search("")
+
+    def eventFilter(self, obj, event):
+        # Up/Down move through the results while typing
+        if obj is self.query_edit and event.type() == event.Type.KeyPress:
+            step = {Qt.Key.Key_Up: -1, Qt.Key.Key_Down: 1}.get(event.key())
+            if step and self.result_list.count():
+                row = self.result_list.currentRow() + step
+                self.result_list.setCurrentRow(
+                    max(0, min(row, self.result_list.count() - 1))
+                )
+                return True
+        return super().eventFilter(obj, event)
+
+    def search(self, text):
+        start = time.perf_counter()
+        self.results = quick_open_index.query(text)
+        elapsed = time.perf_counter() - start
+        self.result_list.clear()
+        for schema, _, title, platform in self.results:
+            label = f"{title}  —  {platform}" if platform else title
+            if schema != "main":
+                label += f"  [{schema}]"
+            self.result_list.addItem(label)
+        if self.results:
+            self.result_list.setCurrentRow(0)
+        note = f"{len(quick_open_index)} problems indexed"
+        if quick_open_index.synced_seq is None:
+            note += " (the index is still being built)"
+        if text.strip():
+            note = f"{len(self.results)} matches in {elapsed * 1000:.1f} ms, " + note
+        self.status_label.setText(note)
+
+    def accept_current(self, *_):
+        row = self.result_list.currentRow()
+        if 0 <= row < len(self.results):
+            self.selected = self.results[row][:2]
+            self.accept()
+
+
+class SimilarImplementationsDialog(QDialog):
+    """Dialog listing implementations similar to a given one."""
+
+    def __init__(self, parent, results):
+        super().__init__(parent)
+        self.setWindowIcon(QIcon(LOGO_ICON_PATH))
+        self.setWindowTitle("Similar Implementations")
+        self.resize(800, 600)
+        ids = [impl_id for impl_id, _ in results]
+        conn = sqlite3.connect(DB_FILE)
+        rows = {
+            row[0]: row[1:]
+            for row in conn.execute(
+                f"""
+                SELECT i.id, p.platform, p.title, s.language, i.method_name, i.code
+                FROM implementations i
+                JOIN solutions s ON s.id = i.solution_id
+                JOIN problems p ON p.id = s.problem_id
+                WHERE i.id IN ({", ".join("?" * len(ids))})
+                """,
+                ids,
+            )
+        }
+        conn.close()
+        self.results = [
+            (score, *rows[impl_id]) for impl_id, score in results if impl_id in rows
+        ]
+        self.table = QTableWidget(len(self.results), 5)
+        self.table.setHorizontalHeaderLabels(
+            ["Similarity", "Platform", "Problem", "Language", "Method"]
+        )
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        for i, (score, *fields) in enumerate(self.results):
+            self.table.setItem(i, 0, QTableWidgetItem(f"{score:.1%}"))
+            for j, value in enumerate(fields[:4], 1):
+                self.table.setItem(i, j, QTableWidgetItem(str(value or "")))
+        self.table.horizontalHeader().setSectionResizeMode(
+            2, QHeaderView.ResizeMode.Stretch
+        )
+        self.code_view = QTextEdit()
+        self.code_view.setReadOnly(True)
+        self.table.currentCellChanged.connect(self.show_code)
+        stats = similarity_index.stats()
+        note = f"Searched {stats['documents']} indexed implementations"
+        if similarity_index.synced_seq is None:
+            note += " (the index is still being built)"
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(self.reject)
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel(note))
+        layout.addWidget(self.table)
+        layout.addWidget(self.code_view)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+        if self.results:
+            self.table.selectRow(0)
+
+    def show_code(self, row, *_):
+        if 0 <= row < len(self.results):
+            self.code_view.setPlainText(decode_text(self.results[row][5]) or "")
+
+
+class ImplementationDialog(QDialog):
+    """Dialog for adding or editing an implementation for a solution."""
+
+    def __init__(self, parent=None, data=None):
+        super().__init__(parent)
+        self.setWindowIcon(QIcon(LOGO_ICON_PATH))
+        self.setWindowTitle("Add/Edit Implementation")
+        self.method_name_edit = QLineEdit()
+        self.explanation_edit = QTextEdit()
+        self.url_edit = QLineEdit()
+        self.code_edit = QTextEdit()
+        self.notes_edit = QTextEdit()
+        if data:
+            self.method_name_edit.setText(data.get("method_name", ""))
+            self.explanation_edit.setPlainText(data.get("Explanation", ""))
+            self.url_edit.setText(data.get("url", ""))
+            self.code_edit.setPlainText(data.get("code", ""))
+            self.notes_edit.setPlainText(data.get("notes", ""))
+        layout = QFormLayout()
+        layout.addRow("Method Name:", self.method_name_edit)
+        layout.addRow("Explanation:", self.explanation_edit)
+        layout.addRow("URL:", self.url_edit)
+        layout.addRow("Code:", self.code_edit)
+        layout.addRow("Notes:", self.notes_edit)
+        self.buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        self.buttons.accepted.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+        layout.addWidget(self.buttons)
+        self.setLayout(layout)
+
+    def get_data(self):
+        """Return the data entered in the dialog as a dictionary."""
+        return {
+            "method_name": self.method_name_edit.text(),
+            "Explanation": self.explanation_edit.toPlainText(),
+            "url": self.url_edit.text(),
+            "code": self.code_edit.toPlainText(),
+            "notes": self.notes_edit.toPlainText(),
+        }
+
+
+class SolutionDialog(QDialog):
+    """Dialog for adding or editing a solution (language) for a problem."""
+
+    def __init__(self, parent=None, data=None):
+        super().__init__(parent)
+        self.setWindowIcon(QIcon(LOGO_ICON_PATH))
+        self.setWindowTitle("Add/Edit Language")
+        self.language_edit = QLineEdit()
+        self.impl_list = QListWidget()
+        self.implementations = []
+        if data:
+            self.language_edit.setText(data.get("language", ""))
+            for impl in data.get("implementations", []):
+                item = QListWidgetItem(impl.get("method_name", ""))
+                item.setData(Qt.ItemDataRole.UserRole, impl)
+                if impl.get("lazy"):
+                    item.setToolTip(f"Size: {format_size(impl.get('size', 0))}")
+                self.impl_list.addItem(item)
+                self.implementations.append(impl)
+        add_btn = QPushButton("Add Implementation")
+        add_btn.clicked.connect(self.add_impl)
+        edit_btn = QPushButton("Edit Implementation")
+        edit_btn.clicked.connect(self.edit_impl)
+        del_btn = QPushButton("Delete Implementation")
+        del_btn.clicked.connect(self.delete_impl)
+        similar_btn = QPushButton("Find Similar")
+        similar_btn.clicked.connect(self.find_similar)
+        btn_layout = QHBoxLayout()
+        btn_layout.addWidget(add_btn)
+        btn_layout.addWidget(edit_btn)
+        btn_layout.addWidget(del_btn)
+        btn_layout.addWidget(similar_btn)
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("Language:"))
+        layout.addWidget(self.language_edit)
+        layout.addWidget(QLabel("Implementations:"))
+        layout.addWidget(self.impl_list)
+        layout.addLayout(btn_layout)
+        self.buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        self.buttons.accepted.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+        layout.addWidget(self.buttons)
+        self.setLayout(layout)
+
+    def add_impl(self):
+        dlg = ImplementationDialog(self)
+        if dlg.exec():
+            data = dlg.get_data()
+            if not data["method_name"].strip():
+                show_alert(self, "Method Name cannot be empty.")
+                return
+            item = QListWidgetItem(data["method_name"])
+            item.setData(Qt.ItemDataRole.UserRole, data)
+            self.impl_list.addItem(item)
+            self.implementations.append(data)
+
+    def edit_impl(self):
+        row = self.impl_list.currentRow()
+        if row == -1:
+            show_alert(self, "Please select a method to edit.")
+            return
+        impl = self.impl_list.currentItem().data(Qt.ItemDataRole.UserRole)
+        if impl.get("lazy"):
+            # Only metadata was loaded with the problem; fetch the heavy text now
+            try:
+                impl = load_implementation(impl)
+            except Exception as e:
+                show_error(self, f"Error loading implementation: {e}")
+                return
+            self.impl_list.currentItem().setData(Qt.ItemDataRole.UserRole, impl)
+            self.impl_list.currentItem().setToolTip("")
+            self.implementations[row] = impl
+        dlg = ImplementationDialog(self, impl)
+        if dlg.exec():
+            data = dlg.get_data()
+            if not data["method_name"].strip():
+                show_alert(self, "Method Name cannot be empty.")
+                return
+            self.impl_list.currentItem().setText(data["method_name"])
+            self.impl_list.currentItem().setData(Qt.ItemDataRole.UserRole, data)
+            self.implementations[row] = data
+
+    def delete_impl(self):
+        row = self.impl_list.currentRow()
+        if row == -1:
+            show_alert(self, "Please select a method to delete.")
+            return
+        self.impl_list.takeItem(row)
+        del self.implementations[row]
+
+    def find_similar(self):
+        """Show indexed implementations similar to the selected one."""
+        row = self.impl_list.currentRow()
+        if row == -1:
+            show_alert(self, "Please select a method to compare.")
+            return
+        impl = self.impl_list.currentItem().data(Qt.ItemDataRole.UserRole)
+        if impl.get("lazy"):
+            try:
+                impl = load_implementation(impl)
+            except Exception as e:
+                show_error(self, f"Error loading implementation: {e}")
+                return
+            self.impl_list.currentItem().setData(Qt.ItemDataRole.UserRole, impl)
+            self.impl_list.currentItem().setToolTip("")
+            self.implementations[row] = impl
+        if not impl.get("code", "").strip():
+            show_alert(self, "The selected method has no code to compare.")
+            return
+        results = similarity_index.query(impl["code"], exclude=impl.get("id"))
+        if not results:
+            show_alert(self, "No similar implementations found.")
+            return
+        SimilarImplementationsDialog(self, results).exec()
+
+    def get_data(self):
+        """Return the data entered in the dialog as a dictionary."""
+        return {
+            "language": self.language_edit.text(),
+            "implementations": [
+                self.impl_list.item(i).data(Qt.ItemDataRole.UserRole)
+                for i in range(self.impl_list.count())
+            ],
+        }
+
+
+class ProblemDialog(QDialog):
+    """Dialog for adding or editing a problem and its solutions."""
+
+    def __init__(self, parent=None, data=None):
+        super().__init__(parent)
+        self.setWindowIcon(QIcon(LOGO_ICON_PATH))
+        self.setWindowTitle("Add/Edit Problem")
+        self.platform_edit = QLineEdit()
+        self.title_edit = QLineEdit()
+        self.problem_description_edit = QTextEdit()
+        self.url_edit = QLineEdit()
+        self.difficulty_combo = QComboBox()
+        self.difficulty_combo.addItems(["", "Easy", "Medium", "Hard"])
+        self.tags_edit = QLineEdit()
+        self.sol_list = QListWidget()
+        self.solutions = []
+        if data:
+            self.platform_edit.setText(data.get("platform", ""))
+            self.title_edit.setText(data.get("title", ""))
+            self.problem_description_edit.setPlainText(
+                data.get("problem_description", "")
+            )
+            self.url_edit.setText(data.get("url", ""))
+            self.difficulty_combo.setCurrentText(data.get("difficulty", ""))
+            self.tags_edit.setText(
+                ", ".join(data.get("tags", []))
+                if isinstance(data.get("tags"), list)
+                else data.get("tags", "")
+            )
+            for sol in data.get("solutions", []):
+                item = QListWidgetItem(sol.get("language", ""))
+                item.setData(Qt.ItemDataRole.UserRole, sol)
+                self.sol_list.addItem(item)
+                self.solutions.append(sol)
+        add_btn = QPushButton("Add Language")
+        add_btn.clicked.connect(self.add_solution)
+        edit_btn = QPushButton("Edit Language")
+        edit_btn.clicked.connect(self.edit_solution)
+        del_btn = QPushButton("Delete Language")
+        del_btn.clicked.connect(self.delete_solution)
+        btn_layout = QHBoxLayout()
+        btn_layout.addWidget(add_btn)
+        btn_layout.addWidget(edit_btn)
+        btn_layout.addWidget(del_btn)
+        layout = QVBoxLayout()
+        info_group = QGroupBox("Problem Info")
+        info_layout = QFormLayout()
+        info_layout.addRow("Platform:", self.platform_edit)
+        info_layout.addRow("Title:", self.title_edit)
+        info_layout.addRow("Problem Description:", self.problem_description_edit)
+        info_layout.addRow("URL:", self.url_edit)
+        info_layout.addRow("Difficulty:", self.difficulty_combo)
+        info_layout.addRow("Tags (comma separated):", self.tags_edit)
+        info_group.setLayout(info_layout)
+        layout.addWidget(info_group)
+        layout.addWidget(QLabel("Languages:"))
+        layout.addWidget(self.sol_list)
+        layout.addLayout(btn_layout)
+        self.buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        self.buttons.accepted.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+        layout.addWidget(self.buttons)
+        self.setLayout(layout)
+
+    def add_solution(self):
+        dlg = SolutionDialog(self)
+        if dlg.exec():
+            data = dlg.get_data()
+            if not data["language"].strip():
+                show_alert(self, "Language cannot be empty.")
+                return
+            item = QListWidgetItem(data["language"])
+            item.setData(Qt.ItemDataRole.UserRole, data)
+            self.sol_list.addItem(item)
+            self.solutions.append(data)
+
+    def edit_solution(self):
+        row = self.sol_list.currentRow()
+        if row == -1:
+            show_alert(self, "Please select a language to edit.")
+            return
+        sol = self.sol_list.currentItem().data(Qt.ItemDataRole.UserRole)
+        dlg = SolutionDialog(self, sol)
+        if dlg.exec():
+            data = dlg.get_data()
+            if not data["language"].strip():
+                show_alert(self, "Language cannot be empty.")
+                return
+            self.sol_list.currentItem().setText(data["language"])
+            self.sol_list.currentItem().setData(Qt.ItemDataRole.UserRole, data)
+            self.solutions[row] = data
+
+    def delete_solution(self):
+        row = self.sol_list.currentRow()
+        if row == -1:
+            show_alert(self, "Please select a language to delete.")
+            return
+        self.sol_list.takeItem(row)
+        del self.solutions[row]
+
+    def get_data(self):
+        """Return the data entered in the dialog as a dictionary."""
+        tags_str = self.tags_edit.text().strip()
+        tags = [t.strip() for t in tags_str.split(",")] if tags_str else []
+        return {
+            "platform": self.platform_edit.text(),
+            "title": self.title_edit.text(),
+            "problem_description": self.problem_description_edit.toPlainText(),
+            "url": self.url_edit.text(),
+            "difficulty": self.difficulty_combo.currentText(),
+            "tags": tags,
+            "solutions": [
+                self.sol_list.item(i).data(Qt.ItemDataRole.UserRole)
+                for i in range(self.sol_list.count())
+            ],
+        }
+
+
+# Interval for checking whether another process changed the database
+LIVE_REFRESH_MS = 1000
+# Above this many changed problems, reloading the whole table is cheaper
+LIVE_REFRESH_MAX_ROWS = 1000
+
+
+class MainWindow(QMainWindow):
+    """Main application window for the CP Dataset GUI."""
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowIcon(QIcon(LOGO_ICON_PATH))
+        self.setWindowTitle("CP Dataset GUI")
+        self.table = QTableWidget()
+        self.table.setColumnCount(9)
+        self.table.setHorizontalHeaderLabels(
+            [
+                "",
+                "Platform",
+                "Title",
+                "Problem Description",
+                "URL",
+                "Difficulty",
+                "Tags",
+                "ID",
+                "Source",
+            ]
+        )
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QTableWidget.SelectionMode.ExtendedSelection)
+        self.table.cellDoubleClicked.connect(self.edit_problem)
+        self.table.cellClicked.connect(self.handle_url_click)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search title, platform or tags...")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self.refresh_table)
+        self.search_edit.textChanged.connect(self.search_timer.start)
+        # (field, value) picked by clicking a bar in the visualization dialog
+        self.chart_filter = None
+        self.chart_filter_label = QLabel()
+        self.clear_chart_filter_btn = QPushButton("Clear Chart Filter")
+        self.clear_chart_filter_btn.clicked.connect(lambda: self.set_chart_filter(None))
+        self.chart_filter_label.hide()
+        self.clear_chart_filter_btn.hide()
+        self.visualization_dialog = None
+        self.refresh_table()
+        self.resize_table_headers()
+
+        add_btn = QPushButton("Add Problem")
+        add_btn.clicked.connect(self.add_problem)
+        edit_btn = QPushButton("Edit Selected Problem")
+        edit_btn.clicked.connect(self.edit_selected_problem)
+        del_btn = QPushButton("Delete Selected Problem")
+        del_btn.clicked.connect(self.delete_selected_problem)
+        export_jsonl_btn = QPushButton("Export JSONL")
+        export_jsonl_btn.clicked.connect(self.export_jsonl)
+        export_csv_btn = QPushButton("Export CSV")
+        export_csv_btn.clicked.connect(self.export_csv)
+        import_btn = QPushButton("Import JSONL (add)")
+        import_btn.clicked.connect(self.import_jsonl)
+        import_csv_btn = QPushButton("Import CSV (add)")
+        import_csv_btn.clicked.connect(self.import_csv)
+        visualize_btn = QPushButton("Visualization")
+        visualize_btn.clicked.connect(self.open_visualization)
+        database_menu = self.menuBar().addMenu("Database")
+        database_menu.addAction("Snapshots...", self.open_snapshots)
+        database_menu.addAction("Export Shards...", self.export_shards)
+        database_menu.addAction("Extract to New Database...", self.extract_to_database)
+        database_menu.addAction("Merge Database...", self.merge_other_database)
+        database_menu.addAction("Export Changes Since Last Delta...", self.export_delta)
+        database_menu.addAction("Diagnostics...", self.show_diagnostics)
+        database_menu.addAction("Run Maintenance Now", self.run_maintenance_now)
+        database_menu.addSeparator()
+        database_menu.addAction(
+            "Attach Databases (read-only)...", self.attach_databases
+        )
+        database_menu.addAction("Detach All Databases", self.detach_databases)
+        database_menu.addSeparator()
+        backend_menu = database_menu.addMenu("Storage Backend")
+        backend_group = QActionGroup(self)
+        current = self.storage_backend_name()
+        for name in STORAGE_BACKENDS:
+            action = backend_menu.addAction(name)
+            action.setCheckable(True)
+            action.setChecked(name == current)
+            action.triggered.connect(
+                lambda _, name=name: self.set_storage_backend(name)
+            )
+            backend_group.addAction(action)
+        tools_menu = self.menuBar().addMenu("Tools")
+        quick_open_action = tools_menu.addAction("Quick Open...", self.quick_open)
+        quick_open_action.setShortcut(QKeySequence("Ctrl+P"))
+        tools_menu.addSeparator()
+        tools_menu.addAction("Check Links", self.check_links)
+        tools_menu.addAction(
+            "Recheck All Links", lambda: self.check_links(recheck_all=True)
+        )
+        hbox = QHBoxLayout()
+        hbox.addWidget(add_btn)
+        hbox.addWidget(edit_btn)
+        hbox.addWidget(del_btn)
+        hbox.addWidget(export_jsonl_btn)
+        hbox.addWidget(export_csv_btn)
+        hbox.addWidget(import_btn)
+        hbox.addWidget(import_csv_btn)
+        hbox.addWidget(visualize_btn)
+        vbox = QVBoxLayout()
+        vbox.addLayout(hbox)
+        search_box = QHBoxLayout()
+        search_box.addWidget(self.search_edit)
+        search_box.addWidget(self.chart_filter_label)
+        search_box.addWidget(self.clear_chart_filter_btn)
+        vbox.addLayout(search_box)
+        vbox.addWidget(self.table)
+        container = QWidget()
+        container.setLayout(vbox)
+        self.setCentralWidget(container)
+
+        # Start counting changelog entries from here for cache invalidation
+        conn = connect_federated()
+        problem_cache.sync(conn)
+        conn.close()
+
+        self.snapshot_worker = None
+        self.delta_worker = None
+        self.snapshot_timer = QTimer(self)
+        self.snapshot_timer.timeout.connect(self.take_scheduled_snapshot)
+        self.apply_snapshot_schedule()
+
+        self.pending_writes = {}
+        self.writer = DatabaseWriter(self)
+        self.writer.completed.connect(self.write_completed)
+        self.writer.failed.connect(self.write_failed)
+        self.writer.start()
+        # Refresh once after a burst of completed writes
+        self.write_refresh_timer = QTimer(self)
+        self.write_refresh_timer.setSingleShot(True)
+        self.write_refresh_timer.setInterval(0)
+        self.write_refresh_timer.timeout.connect(self.after_writes)
+
+        self.similarity_worker = None
+        self.similarity_timer = QTimer(self)
+        self.similarity_timer.timeout.connect(self.update_similarity_index)
+        self.similarity_timer.start(SIMILARITY_REFRESH_MS)
+        self.update_similarity_index()
+        self.quick_open_worker = None
+        self.update_quick_open_index()
+        self.start_live_refresh()
+
+        self.metrics_worker = CodeMetricsWorker(self, self.writer)
+        self.metrics_worker.progress.connect(
+            lambda done, total: self.statusBar().showMessage(
+                f"Computing code metrics: {done}/{total}", 2000
+            )
+        )
+        self.metrics_worker.finished_ok.connect(self.code_metrics_backfilled)
+        self.metrics_worker.failed.connect(
+            lambda msg: self.statusBar().showMessage(
+                f"Computing code metrics failed: {msg}", 10000
+            )
+        )
+        self.metrics_worker.start()
+
+        self.maintenance_worker = None
+        self.last_write_at = time.monotonic()
+        self.maintenance_timer = QTimer(self)
+        self.maintenance_timer.timeout.connect(self.run_scheduled_maintenance)
+        self.maintenance_timer.start(MAINTENANCE_CHECK_MS)
+
+    def update_similarity_index(self):
+        """Index new and changed implementations in the background."""
+        if self.similarity_worker and self.similarity_worker.isRunning():
+            return
+        self.similarity_worker = SimilarityIndexWorker(self)
+        self.similarity_worker.failed.connect(
+            lambda msg: self.statusBar().showMessage(
+                f"Updating the similarity index failed: {msg}", 10000
+            )
+        )
+        self.similarity_worker.start()
+
+    def update_quick_open_index(self):
+        """Load new and changed problem titles into the quick-open index."""
+        if self.quick_open_worker and self.quick_open_worker.isRunning():
+            # Pick up whatever changed meanwhile once this run is done
+            self.quick_open_stale = True
+            return
+        self.quick_open_stale = False
+        self.quick_open_worker = QuickOpenIndexWorker(self)
+        self.quick_open_worker.finished.connect(
+            lambda: self.quick_open_stale and self.update_quick_open_index()
+        )
+        self.quick_open_worker.failed.connect(
+            lambda msg: self.statusBar().showMessage(
+                f"Updating the quick-open index failed: {msg}", 10000
+            )
+        )
+        self.quick_open_worker.start()
+
+    def quick_open(self):
+        """Jump to a problem by typing part of its title or platform."""
+        dlg = QuickOpenDialog(self)
+        if not dlg.exec() or not dlg.selected:
+            return
+        schema, problem_id = dlg.selected
+        row = self.row_index.get((schema, problem_id))
+        if row is not None:
+            self.table.selectRow(row)
+            self.table.scrollToItem(self.table.item(row, 7))
+        if schema != "main":
+            show_alert(self, "Problems from attached databases are read-only.")
+            return
+        self.edit_problem_id(problem_id)
+
+    def run_scheduled_maintenance(self):
+        """Run due maintenance tasks once nothing has been written for a while."""
+        if self.maintenance_worker and self.maintenance_worker.isRunning():
+            return
+        if (
+            self.pending_writes
+            or time.monotonic() - self.last_write_at < MAINTENANCE_IDLE_SECONDS
+        ):
+            return
+        try:
+            conn = sqlite3.connect(DB_FILE)
+            tasks = due_maintenance_tasks(conn.cursor())
+            conn.close()
+        except sqlite3.Error as e:
+            self.statusBar().showMessage(f"Maintenance check failed: {e}", 10000)
+            return
+        if tasks:
+            self.start_maintenance(tasks)
+
+    def run_maintenance_now(self):
+        """Run every maintenance task in the background."""
+        if self.maintenance_worker and self.maintenance_worker.isRunning():
+            show_alert(self, "Maintenance is already running.")
+            return
+        self.start_maintenance(list(MAINTENANCE_TASKS), full_vacuum=True)
+
+    def start_maintenance(self, tasks, full_vacuum=False):
+        self.maintenance_worker = MaintenanceWorker(
+            self, self.writer, tasks, full_vacuum
+        )
+        self.maintenance_worker.progress.connect(
+            lambda task: self.statusBar().showMessage(f"Maintenance: {task}...")
+        )
+        self.maintenance_worker.finished_ok.connect(self.maintenance_finished)
+        self.maintenance_worker.failed.connect(
+            lambda msg: self.statusBar().showMessage(
+                f"Maintenance failed: {msg}", 10000
+            )
+        )
+        self.maintenance_worker.start()
+
+    def maintenance_finished(self, results):
+        self.statusBar().showMessage(
+            "Maintenance: " + ", ".join(e["task"] + " " + e["result"] for e in results),
+            10000,
+        )
+        for entry in results:
+            if entry["task"] == "integrity" and entry["result"] not in (
+                "ok",
+                "interrupted",
+            ):
+                show_alert(
+                    self, f"The database integrity check found {entry['result']}"
+                )
+
+    def code_metrics_backfilled(self, done):
+        if done:
+            self.statusBar().showMessage(
+                f"Computed code metrics for {done} implementations", 5000
+            )
+
+    def submit_write(self, fn, on_done=None, error_prefix="Write failed", solo=False):
+        """Queue ``fn`` on the database writer thread.
+
+        ``on_done(result)`` runs on the GUI thread once the write is committed;
+        failures are reported with ``error_prefix``.
+        """
+        op_id = self.writer.submit(fn, solo)
+        self.last_write_at = time.monotonic()
+        if self.maintenance_worker and self.maintenance_worker.isRunning():
+            # Maintenance steps back off as soon as the user writes something
+            self.maintenance_worker.requestInterruption()
+        self.pending_writes[op_id] = (on_done, error_prefix)
+        self.statusBar().showMessage("Saving...")
+
+    def write_completed(self, op_id, result):
+        on_done, _ = self.pending_writes.pop(op_id)
+        self.write_refresh_timer.start()
+        if on_done:
+            on_done(result)
+
+    def write_failed(self, op_id, message):
+        _, error_prefix = self.pending_writes.pop(op_id)
+        self.write_refresh_timer.start()
+        show_error(self, f"{error_prefix}:\n{message}")
+
+    def after_writes(self):
+        conn = sqlite3.connect(DB_FILE)
+        problem_cache.sync(conn)
+        conn.close()
+        implementation_cache.clear()
+        self.refresh_table()
+        self.update_quick_open_index()
+        if not self.pending_writes:
+            self.statusBar().clearMessage()
+
+    def closeEvent(self, event):
+        self.live_timer.stop()
+        self.live_conn.close()
+        self.quick_open_stale = False
+        # Workers first: they may be waiting on the writer
+        for worker in (
+            self.similarity_worker,
+            self.metrics_worker,
+            self.quick_open_worker,
+            self.maintenance_worker,
+        ):
+            if worker and worker.isRunning():
+                worker.requestInterruption()
+                worker.wait()
+        # Queued writes are finished before the window closes
+        self.writer.stop()
+        super().closeEvent(event)
+
+    def snapshot_schedule(self):
+        """Return the configured snapshot interval in minutes and the number to keep."""
+        conn = sqlite3.connect(DB_FILE)
+        c = conn.cursor()
+        interval = int(get_setting(c, "snapshot_interval_minutes", 0))
+        keep = int(get_setting(c, "snapshot_keep", SNAPSHOT_DEFAULT_KEEP))
+        conn.close()
+        return interval, keep
+
+    def apply_snapshot_schedule(self):
+        """(Re)start the snapshot timer from the stored schedule."""
+        interval, _ = self.snapshot_schedule()
+        self.snapshot_timer.stop()
+        if interval > 0:
+            self.snapshot_timer.start(interval * 60 * 1000)
+
+    def take_scheduled_snapshot(self):
+        """Take a rotating snapshot in the background unless one is still running."""
+        if self.snapshot_worker and self.snapshot_worker.isRunning():
+            return
+        _, keep = self.snapshot_schedule()
+        self.snapshot_worker = SnapshotWorker(self, label="auto", keep=keep)
+        self.snapshot_worker.failed.connect(
+            lambda msg: self.statusBar().showMessage(
+                f"Scheduled snapshot failed: {msg}", 10000
+            )
+        )
+        self.snapshot_worker.start()
+
+    def storage_backend_name(self):
+        """Return the storage backend that exports and charts read through."""
+        conn = sqlite3.connect(DB_FILE)
+        name = get_setting(conn.cursor(), "storage_backend", "sqlite")
+        conn.close()
+        return name if name in STORAGE_BACKENDS else "sqlite"
+
+    def set_storage_backend(self, name):
+        self.submit_write(
+            lambda c: set_setting(c, "storage_backend", name),
+            error_prefix="Error saving the storage backend",
+        )
+
+    def open_snapshots(self):
+        """Open the snapshot dialog and store any schedule changes."""
+        dlg = SnapshotDialog(self)
+        dlg.exec()
+        interval, keep = dlg.get_schedule()
+
+        def save(c):
+            set_setting(c, "snapshot_interval_minutes", interval)
+            set_setting(c, "snapshot_keep", keep)
+
+        self.submit_write(
+            save,
+            lambda _: self.apply_snapshot_schedule(),
+            "Error saving snapshot schedule",
+        )
+
+    def database_replaced(self):
+        """Drop everything loaded from the database after a snapshot was restored."""
+        implementation_cache.clear()
+        problem_cache.clear()
+        similarity_index.clear()
+        quick_open_index.clear()
+        self.refresh_table()
+        self.update_similarity_index()
+        self.update_quick_open_index()
+
+    def attach_databases(self):
+        """Attach other dataset files for a combined, read-only view."""
+        paths, _ = QFileDialog.getOpenFileNames(
+            self, "Attach Databases", filter="SQLite Databases (*.db);;All Files (*)"
+        )
+        if not paths:
+            return
+        for path in paths:
+            if os.path.abspath(path) == os.path.abspath(DB_FILE) or path in (
+                ATTACHED_DATABASES
+            ):
+                continue
+            if len(ATTACHED_DATABASES) >= MAX_ATTACHED_DATABASES:
+                show_alert(
+                    self, f"At most {MAX_ATTACHED_DATABASES} databases can be attached."
+                )
+                break
+            ok, err = check_db_integrity(path)
+            if not ok:
+                show_alert(self, f"Cannot attach {path}:\n{err}")
+                continue
+            ATTACHED_DATABASES.append(path)
+        self.save_attached_databases()
+        # Schema names of attached databases may now refer to other files
+        problem_cache.clear()
+        quick_open_index.clear()
+        self.refresh_table()
+        self.update_quick_open_index()
+
+    def detach_databases(self):
+        """Go back to showing only the main database."""
+        ATTACHED_DATABASES.clear()
+        self.save_attached_databases()
+        problem_cache.clear()
+        quick_open_index.clear()
+        self.refresh_table()
+        self.update_quick_open_index()
+
+    def save_attached_databases(self):
+        """Remember the attached databases for the next start."""
+        value = json.dumps(ATTACHED_DATABASES)
+        self.submit_write(
+            lambda c: set_setting(c, "attached_databases", value),
+            error_prefix="Error saving attached databases",
+        )
+
+    def check_links(self, recheck_all=False):
+        """Check problem and implementation URLs in the background."""
+        if getattr(self, "link_worker", None) and self.link_worker.isRunning():
+            show_alert(self, "A link check is already running.")
+            return
+        self.link_worker = LinkCheckWorker(self, self.writer, recheck_all)
+        self.link_worker.progress.connect(
+            lambda done, total: self.statusBar().showMessage(
+                f"Checked {done}/{total} links..."
+            )
+        )
+        self.link_worker.finished_ok.connect(self.link_check_finished)
+        self.link_worker.failed.connect(
+            lambda msg: show_error(self, f"Link check failed:\n{msg}")
+        )
+        self.link_worker.start()
+
+    def link_check_finished(self, checked, broken):
+        self.statusBar().showMessage(
+            f"Checked {checked} links, {broken} broken.", 10000
+        )
+        self.refresh_table()
+
+    def show_diagnostics(self):
+        """Show database and cache statistics."""
+        try:
+            report = diagnostics_report()
+        except Exception as e:
+            show_error(self, f"Error collecting diagnostics: {e}")
+            return
+        dlg = QDialog(self)
+        dlg.setWindowIcon(QIcon(LOGO_ICON_PATH))
+        dlg.setWindowTitle("Diagnostics")
+        dlg.resize(600, 400)
+        text = QTextEdit()
+        text.setReadOnly(True)
+        text.setPlainText(report)
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(dlg.reject)
+        layout = QVBoxLayout()
+        layout.addWidget(text)
+        layout.addWidget(buttons)
+        dlg.setLayout(layout)
+        dlg.exec()
+
+    def open_visualization(self):
+        """Open the visualization dialog next to the main window."""
+        # Modeless, so clicking chart bars filters the table while both are visible
+        if self.visualization_dialog:
+            self.visualization_dialog.close()
+        self.visualization_dialog = VisualizationDialog(
+            self, on_filter=self.set_chart_filter, backend=self.storage_backend_name()
+        )
+        self.visualization_dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.visualization_dialog.destroyed.connect(
+            lambda: setattr(self, "visualization_dialog", None)
+        )
+        self.visualization_dialog.show()
+
+    def set_chart_filter(self, chart_filter):
+        """Filter the table by a ``(field, value)`` chart selection, or clear it."""
+        self.chart_filter = chart_filter
+        if chart_filter:
+            field, value = chart_filter
+            self.chart_filter_label.setText(f"Chart filter: {field} = {value}")
+        self.chart_filter_label.setVisible(bool(chart_filter))
+        self.clear_chart_filter_btn.setVisible(bool(chart_filter))
+        self.refresh_table()
+
+    def resize_table_headers(self):
+        """Resize the table headers for better display."""
+        header = self.table.horizontalHeader()
+        for col in range(1, self.table.columnCount()):
+            header.setSectionResizeMode(col, QHeaderView.ResizeMode.Stretch)
+        self.table.setColumnWidth(0, 40)
+
+    def problem_filter(self):
+        """Return the SQL condition and parameters for the search text and chart filter.
+
+        The condition may contain ``{schema}`` for the database being queried.
+        """
+        conditions, params = [], []
+        text = self.search_edit.text().strip()
+        if text:
+            conditions.append("(title LIKE ? OR platform LIKE ? OR tags LIKE ?)")
+            params += [f"%{text}%"] * 3
+        if self.chart_filter:
+            condition, values = chart_filter_condition(*self.chart_filter)
+            conditions.append(condition)
+            params += values
+        if not conditions:
+            return "", []
+        return "WHERE " + " AND ".join(conditions), params
+
+    def problem_rows_query(self, schemas, ids=None):
+        """Return the table's SQL and parameters for ``schemas``, optionally limited to ``ids``."""
+        # The search condition is pushed down into each database's part of the query
+        where, params = self.problem_filter()
+        if self.chart_filter and self.chart_filter[0] in CODE_METRIC_COLUMNS:
+            # Attached databases from older versions have no metric columns
+            with_metrics = {schema for schema, _ in code_metric_schemas()}
+            schemas = [entry for entry in schemas if entry[0] in with_metrics]
+        if ids is not None:
+            where += (
+                f"{' AND' if where else 'WHERE'} p.id IN ({', '.join('?' * len(ids))})"
+            )
+            params = params + list(ids)
+        sql = " UNION ALL ".join(
+            f"SELECT p.id, p.platform, p.title, p.problem_description, p.url, p.difficulty, p.tags, '{schema}', uc.ok, uc.status, uc.error, uc.checked_at FROM {schema}.problems p LEFT JOIN main.url_checks uc ON uc.url = p.url {where.format(schema=schema)}"
+            for schema, _ in schemas
+        )
+        return sql, params * len(schemas)
+
+    def fill_table_row(self, i, row, sources):
+        """Show a row of ``problem_rows_query`` results in table row ``i``."""
+        if not self.table.cellWidget(i, 0):
+            self.table.setCellWidget(i, 0, QCheckBox())
+        for j in range(1, 7):
+            if j == 4:  # URL
+                url_item = QTableWidgetItem(str(row[j]))
+                ok, status, error, checked_at = row[8:12]
+                if checked_at is not None and not ok:
+                    url_item.setForeground(Qt.GlobalColor.red)
+                    url_item.setToolTip(
+                        f"Broken link ({error or f'HTTP {status}'}), checked "
+                        f"{datetime.fromtimestamp(checked_at):%Y-%m-%d %H:%M}"
+                    )
+                else:
+                    url_item.setForeground(Qt.GlobalColor.blue)
+                    url_item.setToolTip("Click to open in browser")
+                self.table.setItem(i, j, url_item)
+            elif j == 3:  # Problem description, possibly compressed
+                self.table.setItem(i, j, QTableWidgetItem(str(decode_text(row[j]))))
+            else:
+                self.table.setItem(i, j, QTableWidgetItem(str(row[j])))
+        id_item = QTableWidgetItem(str(row[0]))
+        id_item.setData(Qt.ItemDataRole.UserRole, row[7])
+        self.table.setItem(i, 7, id_item)
+        self.table.setItem(i, 8, QTableWidgetItem(sources[row[7]]))
+
+    def refresh_table(self):
+        """Refresh the table with the latest data from the database."""
+        conn = connect_federated()
+        c = conn.cursor()
+        schemas = federation_schemas()
+        c.execute(*self.problem_rows_query(schemas))
+        sources = {schema: os.path.basename(path) for schema, path in schemas}
+        try:
+            rows = c.fetchall()
+            # Everything up to here is shown, so live refresh starts after it
+            self.live_seq = c.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM main.changelog"
+            ).fetchone()[0]
+            self.table.setRowCount(0)
+            self.table.setRowCount(len(rows))
+            for i, row in enumerate(rows):
+                self.fill_table_row(i, row, sources)
+            self.row_index = {(row[7], row[0]): i for i, row in enumerate(rows)}
+            conn.close()
+            self.table.setColumnHidden(8, len(schemas) == 1)
+            self.resize_table_headers()
+        except Exception as e:
+            show_error(self, f"Error refreshing table: {e}")
+
+    def start_live_refresh(self):
+        """Poll for commits made by other processes and apply them to the table."""
+        # data_version only changes when another connection commits
+        self.live_conn = sqlite3.connect(DB_FILE)
+        self.live_data_version = self.live_conn.execute(
+            "PRAGMA data_version"
+        ).fetchone()[0]
+        self.live_timer = QTimer(self)
+        self.live_timer.timeout.connect(self.poll_external_changes)
+        self.live_timer.start(LIVE_REFRESH_MS)
+
+    def poll_external_changes(self):
+        try:
+            c = self.live_conn.cursor()
+            version = c.execute("PRAGMA data_version").fetchone()[0]
+            if version == self.live_data_version:
+                return
+            self.live_data_version = version
+            # Not every rewrite goes through the changelog, so loaded bodies
+            # are dropped on any commit by another process
+            implementation_cache.clear()
+            max_seq = c.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM changelog"
+            ).fetchone()[0]
+            if max_seq == self.live_seq:
+                # Our own write, already shown by refresh_table
+                return
+            problem_cache.sync(self.live_conn)
+            self.update_similarity_index()
+            self.update_quick_open_index()
+            if max_seq < self.live_seq:
+                # The database was replaced
+                self.refresh_table()
+                return
+            ids = changed_problem_ids(c, self.live_seq, max_seq)
+            self.live_seq = max_seq
+            if len(ids) > LIVE_REFRESH_MAX_ROWS:
+                self.refresh_table()
+            elif ids:
+                self.apply_problem_changes(ids)
+            self.statusBar().showMessage(
+                f"{len(ids)} problems changed by another process", 5000
+            )
+        except sqlite3.Error as e:
+            self.statusBar().showMessage(f"Live refresh failed: {e}", 5000)
+
+    def apply_problem_changes(self, ids):
+        """Update, add or remove the table rows of the given main-database problems."""
+        schemas = federation_schemas()[:1]
+        sources = {schema: os.path.basename(path) for schema, path in schemas}
+        rows = {}
+        for start in range(0, len(ids), 900):
+            for row in self.live_conn.execute(
+                *self.problem_rows_query(schemas, ids[start : start + 900])
+            ):
+                rows[row[0]] = row
+        removed = []
+        for pid in ids:
+            i = self.row_index.get(("main", pid))
+            if pid not in rows:
+                # Deleted, or no longer matching the search
+                if i is not None:
+                    removed.append(i)
+                continue
+            if i is None:
+                i = self.table.rowCount()
+                self.table.insertRow(i)
+                self.row_index[("main", pid)] = i
+            self.fill_table_row(i, rows[pid], sources)
+        for i in sorted(removed, reverse=True):
+            self.table.removeRow(i)
+        if removed:
+            self.row_index = {
+                (self.get_problem_source(i), self.get_problem_id(i)): i
+                for i in range(self.table.rowCount())
+            }
+
+    def get_selected_rows(self):
+        """Return a list of selected row indices."""
+        selected = []
+        for row in range(self.table.rowCount()):
+            cb = self.table.cellWidget(row, 0)
+            if cb and cb.isChecked():
+                selected.append(row)
+        return selected
+
+    def get_problem_id(self, row):
+        """Return the problem ID for a given row index."""
+        item = self.table.item(row, 7)
+        if item:
+            return int(item.text())
+        return None
+
+    def get_problem_source(self, row):
+        """Return the schema ('main' or an attached database) a row comes from."""
+        item = self.table.item(row, 7)
+        if item:
+            return item.data(Qt.ItemDataRole.UserRole) or "main"
+        return "main"
+
+    def get_problem_keys(self, rows):
+        """Return ``(schema, problem_id)`` for the given row indices."""
+        return [
+            (self.get_problem_source(row), self.get_problem_id(row)) for row in rows
+        ]
+
+    def get_problem_full(self, problem_id, lazy=False, schema="main"):
+        """Return the full problem data for a given problem ID.
+
+        With ``lazy=True`` implementations only carry their ID, method name, URL
+        and size; the code, explanation and notes are fetched on demand with
+        ``load_implementation``. ``schema`` selects an attached database.
+        Assembled trees are kept in ``problem_cache``.
+        """
+        key = (schema, problem_id, lazy)
+        tree = problem_cache.get(key)
+        if tree is None:
+            tree = self.load_problem_full(problem_id, lazy, schema)
+            if tree is not None:
+                problem_cache.put(key, tree)
+        return tree
+
+    def load_problem_full(self, problem_id, lazy=False, schema="main"):
+        """Assemble the problem tree for ``get_problem_full`` from the database."""
+        conn = connect_federated() if schema != "main" else sqlite3.connect(DB_FILE)
+        conn.create_function("text_length", 1, text_length, deterministic=True)
+        c = conn.cursor()
+        c.execute(
+            f"SELECT platform, title, problem_description, url, difficulty, tags FROM {schema}.problems WHERE id=?",
+            (problem_id,),
+        )
+        try:
+            result = c.fetchone()
+            if not result:
+                conn.close()
+                return None
+            platform, title, problem_description, url, difficulty, tags = result
+            c.execute(
+                f"SELECT id, language FROM {schema}.solutions WHERE problem_id=?",
+                (problem_id,),
+            )
+            solutions = []
+            # Compressed BLOBs are decoded to count characters, not stored bytes
+            size = " + ".join(
+                f"CASE WHEN typeof({col}) = 'blob' THEN text_length({col}) "
+                f"ELSE COALESCE(LENGTH({col}), 0) END"
+                for col in ("code", "explanation", "notes")
+            )
+            for sol_id, language in c.fetchall():
+                if lazy:
+                    c.execute(
+                        f"SELECT id, method_name, url, {size} FROM {schema}.implementations WHERE solution_id=?",
+                        (sol_id,),
+                    )
+                    impls = [
+                        {
+                            "id": impl_id,
+                            "method_name": m,
+                            "url": u,
+                            "size": size,
+                            "lazy": True,
+                        }
+                        for impl_id, m, u, size in c.fetchall()
+                    ]
+                    solutions.append({"language": language, "implementations": impls})
+                    continue
+                c.execute(
+                    f"SELECT method_name, explanation, url, code, notes FROM {schema}.implementations WHERE solution_id=?",
+                    (sol_id,),
+                )
+                impls = [
+                    {
+                        "method_name": m,
+                        "Explanation": decode_text(exp),
+                        "url": u,
+                        "code": decode_text(code),
+                        "notes": decode_text(notes),
+                    }
+                    for m, exp, u, code, notes in c.fetchall()
+                ]
+                solutions.append({"language": language, "implementations": impls})
+            conn.close()
+            tags_list = [t.strip() for t in tags.split(",")] if tags else []
+            return {
+                "platform": platform,
+                "title": title,
+                "problem_description": decode_text(problem_description),
+                "url": url,
+                "difficulty": difficulty,
+                "tags": tags_list,
+                "solutions": solutions,
+            }
+        except Exception as e:
+            show_error(self, f"Error fetching problem data: {e}")
+            return None
+
+    def get_all_problem_keys(self):
+        """Return ``(schema, problem_id)`` for every problem in every database."""
+        conn = connect_federated()
+        keys = []
+        for schema, _ in federation_schemas():
+            keys.extend(
+                (schema, row[0])
+                for row in conn.execute(f"SELECT id FROM {schema}.problems")
+            )
+        conn.close()
+        return keys
+
+    def add_problem(self):
+        """Add a new problem to the database."""
+        try:
+            dlg = ProblemDialog(self)
+            if dlg.exec():
+                data = dlg.get_data()
+                if not data["title"].strip():
+                    show_alert(self, "Title cannot be empty.")
+                    return
+                self.submit_write(
+                    lambda c: insert_problem_tree(c, data),
+                    lambda _: QMessageBox.information(
+                        self, "Success", "Problem added successfully."
+                    ),
+                    "Error adding problem",
+                )
+        except Exception as e:
+            show_error(self, f"Error adding problem: {e}")
+
+    def edit_problem(self, row, column=None):
+        """Edit the selected problem in the database."""
+        try:
+            checked_rows = self.get_selected_rows()
+            if len(checked_rows) > 1:
+                show_alert(self, "Please select only one row to edit.")
+                return
+            if not checked_rows and (self.table.rowCount() == 0):
+                show_alert(self, "No problems available to edit.")
+                return
+            if not checked_rows:
+                checked_rows = [row]
+            if self.get_problem_source(checked_rows[0]) != "main":
+                show_alert(self, "Problems from attached databases are read-only.")
+                return
+            problem_id = self.get_problem_id(checked_rows[0])
+            if problem_id is None:
+                show_alert(self, "No problem found for editing.")
+                return
+            self.edit_problem_id(problem_id)
+        except Exception as e:
+            show_error(self, f"Error editing problem: {e}")
+
+    def edit_problem_id(self, problem_id):
+        """Open the edit dialog for a problem of the main database."""
+        try:
+            conn = sqlite3.connect(DB_FILE)
+            problem_cache.sync(conn)
+            conn.close()
+            row_data = self.get_problem_full(problem_id, lazy=True)
+            if not row_data:
+                show_alert(self, "No data found for editing.")
+                return
+            dlg = ProblemDialog(self, row_data)
+            if dlg.exec():
+                data = dlg.get_data()
+                if not data["title"].strip():
+                    show_alert(self, "Title cannot be empty.")
+                    return
+                self.submit_write(
+                    lambda c: update_problem_tree(c, problem_id, data),
+                    lambda _: QMessageBox.information(
+                        self, "Success", "Problem updated successfully."
+                    ),
+                    "Error editing problem",
+                )
+        except Exception as e:
+            show_error(self, f"Error editing problem: {e}")
+
+    def edit_selected_problem(self):
+        """Edit the currently selected problem."""
+        checked_rows = self.get_selected_rows()
+        if not checked_rows and self.table.rowCount() == 0:
+            show_alert(self, "No problems available to edit.")
+            return
+        if not checked_rows:
+            show_alert(self, "Please select a problem to edit.")
+            return
+        if len(checked_rows) != 1:
+            show_alert(self, "You can only edit one problem at a time.")
+            return
+        self.edit_problem(checked_rows[0])
+
+    def delete_selected_problem(self):
+        """Delete the selected problems from the database."""
+        checked_rows = self.get_selected_rows()
+        if not checked_rows:
+            show_alert(self, "Please select problem(s) to delete.")
+            return
+        if any(self.get_problem_source(row) != "main" for row in checked_rows):
+            show_alert(self, "Problems from attached databases are read-only.")
+            return
+        ret = QMessageBox.question(
+            self,
+            "Delete?",
+            f"Are you sure you want to delete {len(checked_rows)} problem(s)?",
+        )
+        if ret != QMessageBox.StandardButton.Yes:
+            return
+        problem_ids = [
+            problem_id
+            for problem_id in map(
+                self.get_problem_id, sorted(checked_rows, reverse=True)
+            )
+            if problem_id is not None
+        ]
+
+        def delete(c):
+            # Foreign keys are off, so remove the children explicitly
+            for problem_id in problem_ids:
+                c.execute(
+                    "DELETE FROM implementations WHERE solution_id IN "
+                    "(SELECT id FROM solutions WHERE problem_id=?)",
+                    (problem_id,),
+                )
+                c.execute("DELETE FROM solutions WHERE problem_id=?", (problem_id,))
+                c.execute("DELETE FROM problems WHERE id=?", (problem_id,))
+
+        self.submit_write(
+            delete,
+            lambda _: QMessageBox.information(
+                self, "Success", "Problem(s) deleted successfully."
+            ),
+            "Delete failed",
+        )
+
+    def export_jsonl(self):
+        """Export the dataset to a JSONL file."""
+        if self.table.rowCount() == 0:
+            show_alert(self, "No data to export.")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Export JSONL", filter="JSONL Files (*.jsonl);;All Files (*)"
+        )
+        if not file_path:
+            show_alert(self, "No file selected for export.")
+            return
+        checked_rows = self.get_selected_rows()
+        if checked_rows:
+            keys = self.get_problem_keys(checked_rows)
+        else:
+            keys = self.get_all_problem_keys()
+        if not keys:
+            show_alert(self, "No data to export.")
+            return
+        try:
+            if checked_rows or ATTACHED_DATABASES:
+                with open(file_path, "w", encoding="utf-8") as f:
+                    for obj in self.iter_export_problems(keys):
+                        f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+            else:
+                # The whole main database: one scan through the backend
+                backend = open_backend(self.storage_backend_name())
+                try:
+                    backend.export_jsonl(file_path)
+                finally:
+                    backend.close()
+            QMessageBox.information(self, "Export", "Exported to JSONL.")
+        except Exception as e:
+            show_error(self, f"Export failed:\n{e}")
+
+    def iter_export_problems(self, keys):
+        """Yield the problem trees of ``(schema, problem_id)`` keys for an export.
+
+        The main database is read through the storage backend, attached
+        databases through read-only SqliteBackends.
+        """
+        paths = dict(federation_schemas())
+        by_schema = {}
+        for schema, pid in keys:
+            by_schema.setdefault(schema, []).append(pid)
+        for schema, ids in by_schema.items():
+            if schema == "main":
+                backend = open_backend(self.storage_backend_name())
+            else:
+                backend = SqliteBackend(paths[schema], read_only=True)
+            try:
+                for start in range(0, len(ids), SHARD_FETCH_BATCH):
+                    yield from backend.fetch_problems(
+                        ids[start : start + SHARD_FETCH_BATCH]
+                    )
+            finally:
+                backend.close()
+
+    def export_csv(self):
+        """Export the dataset to a CSV file."""
+        if self.table.rowCount() == 0:
+            show_alert(self, "No data to export.")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Export CSV", filter="CSV Files (*.csv);;All Files (*)"
+        )
+        if not file_path:
+            show_alert(self, "No file selected for export.")
+            return
+        checked_rows = self.get_selected_rows()
+        if checked_rows:
+            keys = self.get_problem_keys(checked_rows)
+        else:
+            keys = self.get_all_problem_keys()
+        if not keys:
+            show_alert(self, "No data to export.")
+            return
+        try:
+            with open(file_path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                # Header: include all top-level attributes and one row per implementation:
+                writer.writerow(CSV_COLUMNS)
+                for obj in self.iter_export_problems(keys):
+                    tags_field = ", ".join(obj.get("tags", []))
+                    for sol in obj.get("solutions", []):
+                        lang = sol.get("language", "")
+                        for impl in sol.get("implementations", []):
+                            writer.writerow(
+                                [
+                                    obj.get("platform", ""),
+                                    obj.get("title", ""),
+                                    obj.get("problem_description", ""),
+                                    obj.get("url", ""),
+                                    obj.get("difficulty", ""),
+                                    tags_field,
+                                    lang,
+                                    impl.get("method_name", ""),
+                                    impl.get("Explanation", ""),
+                                    impl.get("url", ""),
+                                    impl.get("code", ""),
+                                    impl.get("notes", ""),
+                                ]
+                            )
+            QMessageBox.information(self, "Export", "Exported to CSV.")
+        except Exception as e:
+            show_error(self, f"Export failed:\n{e}")
+
+    def export_shards(self):
+        """Export the dataset as parallel-written shards with train/validation/test splits."""
+        out_dir = QFileDialog.getExistingDirectory(self, "Export Shards To")
+        if not out_dir:
+            show_alert(self, "No folder selected for export.")
+            return
+        num_shards, ok = QInputDialog.getInt(
+            self, "Export Shards", "Number of shards:", os.cpu_count() or 4, 1, 4096
+        )
+        if not ok:
+            return
+        ratios_text, ok = QInputDialog.getText(
+            self, "Export Shards", "Train/validation/test ratios:", text="80/10/10"
+        )
+        if not ok:
+            return
+        try:
+            ratios = parse_split_ratios(ratios_text)
+        except ValueError as e:
+            show_alert(self, str(e))
+            return
+        self.shard_worker = ShardExportWorker(self, out_dir, num_shards, "hash", ratios)
+        self.shard_worker.progress.connect(
+            lambda done, total: self.statusBar().showMessage(
+                f"Exported {done}/{total} shards..."
+            )
+        )
+        self.shard_worker.finished_ok.connect(
+            lambda summary: QMessageBox.information(
+                self,
+                "Export",
+                "Exported shards:\n"
+                + "\n".join(
+                    f"{split}: {t['problems']} problems"
+                    for split, t in summary["totals"].items()
+                ),
+            )
+        )
+        self.shard_worker.failed.connect(
+            lambda msg: show_error(self, f"Export failed:\n{msg}")
+        )
+        self.shard_worker.start()
+
+    def extract_to_database(self):
+        """Copy the checked problems, or all shown ones, into a new database file."""
+        checked_rows = self.get_selected_rows()
+        rows = checked_rows or range(self.table.rowCount())
+        keys = self.get_problem_keys(rows)
+        if not keys:
+            show_alert(self, "No problems to extract.")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Extract to New Database", filter="SQLite Databases (*.db)"
+        )
+        if not file_path:
+            return
+        if os.path.abspath(file_path) in (
+            os.path.abspath(path) for _, path in federation_schemas()
+        ):
+            show_alert(self, "Choose a file that is not already open.")
+            return
+        if os.path.exists(file_path):
+            # The save dialog already asked before overwriting
+            os.remove(file_path)
+        self.extract_worker = ExtractWorker(self, file_path, keys)
+        self.statusBar().showMessage(f"Extracting {len(keys)} problems...")
+        self.extract_worker.finished_ok.connect(
+            lambda counts: QMessageBox.information(
+                self,
+                "Extract",
+                f"Copied {counts[0]} problems, {counts[1]} solutions and "
+                f"{counts[2]} implementations to {file_path}.",
+            )
+        )
+        self.extract_worker.finished_ok.connect(
+            lambda _: self.statusBar().clearMessage()
+        )
+        self.extract_worker.failed.connect(
+            lambda msg: show_error(self, f"Extract failed:\n{msg}")
+        )
+        self.extract_worker.start()
+
+    def merge_other_database(self):
+        """Merge another dataset file into this one after showing a dry run."""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Merge Database", filter="SQLite Databases (*.db);;All Files (*)"
+        )
+        if not path:
+            return
+        ok, err = check_db_integrity(path)
+        if not ok:
+            show_alert(self, f"Cannot merge {path}:\n{err}")
+            return
+        policy, ok = QInputDialog.getItem(
+            self,
+            "Merge Database",
+            "When a problem differs on both sides:",
+            MERGE_POLICIES,
+            0,
+            False,
+        )
+        if not ok:
+            return
+        self.merge_worker = MergePlanWorker(self, path, policy)
+        self.statusBar().showMessage("Comparing databases...")
+        self.merge_worker.finished_ok.connect(
+            lambda summary: self.confirm_merge(path, policy, summary)
+        )
+        self.merge_worker.failed.connect(
+            lambda msg: show_error(self, f"Merge failed:\n{msg}")
+        )
+        self.merge_worker.start()
+
+    def confirm_merge(self, path, policy, summary):
+        self.statusBar().clearMessage()
+        if not (summary["insert"] or summary["update"] or summary["copy"]):
+            QMessageBox.information(
+                self, "Merge", "Nothing to merge.\n\n" + format_merge_summary(summary)
+            )
+            return
+        ret = QMessageBox.question(
+            self,
+            "Merge?",
+            f"Merging {os.path.basename(path)} will make these changes:\n\n"
+            f"{format_merge_summary(summary)}\n\nApply them?",
+        )
+        if ret != QMessageBox.StandardButton.Yes:
+            return
+        # merge_database runs its own transaction with the other file attached
+        self.submit_write(
+            lambda conn: merge_database(conn, path, policy),
+            lambda result: QMessageBox.information(
+                self, "Merge", format_merge_summary(result)
+            ),
+            "Merge failed",
+            solo=True,
+        )
+
+    def export_delta(self):
+        """Export only the problems changed or deleted since the last delta export."""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Delta JSONL", filter="JSONL Files (*.jsonl);;All Files (*)"
+        )
+        if not file_path:
+            show_alert(self, "No file selected for export.")
+            return
+        if self.delta_worker and self.delta_worker.isRunning():
+            show_alert(self, "A delta export is already running.")
+            return
+        self.delta_worker = DeltaExportWorker(self, self.writer, file_path)
+        self.delta_worker.finished_ok.connect(
+            lambda upserts, deletes: QMessageBox.information(
+                self,
+                "Export",
+                f"Exported {upserts} changed and {deletes} deleted problem(s).",
+            )
+        )
+        self.delta_worker.failed.connect(
+            lambda msg: show_error(self, f"Export failed:\n{msg}")
+        )
+        self.delta_worker.start()
+
+    def import_jsonl(self):
+        """Import problems from a JSONL file into the database."""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Import JSONL",
+            filter="JSONL Files (*.jsonl *.jsonl.gz *.jsonl.zst *.zip);;All Files (*)",
+        )
+        if not file_path:
+            show_alert(self, "No file selected for import.")
+            return
+        if not file_path.lower().endswith(".jsonl"):
+            # Compressed files and archives cannot be memory-mapped; stream them
+            self.submit_write(
+                lambda c: import_jsonl_file(c, file_path),
+                lambda count: QMessageBox.information(
+                    self, "Import", f"Import successful. {count} problems imported."
+                ),
+                "Import failed",
+            )
+            return
+        dialog = JsonlPreviewDialog(self, file_path)
+        accepted = dialog.exec() == QDialog.DialogCode.Accepted
+        index, ranges = dialog.index, dialog.ranges
+        dialog.deleteLater()
+        if not accepted:
+            if index:
+                index.close()
+            return
+
+        def imported(count):
+            index.close()
+            QMessageBox.information(
+                self, "Import", f"Import successful. {count} problems imported."
+            )
+
+        # The selection is imported in one write, so a bad line imports nothing
+        self.submit_write(
+            lambda c: import_jsonl_ranges(c, index, ranges),
+            imported,
+            "Import failed",
+        )
+
+    def import_csv(self):
+        """Import problems from a CSV file in the format written by export_csv."""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Import CSV", filter="CSV Files (*.csv);;All Files (*)"
+        )
+        if not file_path:
+            show_alert(self, "No file selected for import.")
+            return
+        # import_csv_file manages its own transaction (rolled back and redone
+        # through an external sort if the rows turn out ungrouped), so it runs
+        # outside a group and holds the write lock for the whole file
+        self.submit_write(
+            lambda conn: import_csv_file(conn, file_path),
+            lambda count: QMessageBox.information(
+                self, "Import", f"Import successful. {count} problems imported."
+            ),
+            "Import failed",
+            solo=True,
+        )
+
+    def handle_url_click(self, row, column):
+        """Handle clicks on the URL column to open the link in a browser."""
+        if column == 4:  # URL column
+            url = self.table.item(row, 4).text()
+            if url and (url.startswith("http://") or url.startswith("https://")):
+                import webbrowser
+
+                webbrowser.open(url)
+
+
+def prompt_db_reset(parent, error_msg):
+    """Prompt the user to reset the database if corruption or schema change is detected."""
+    msg = (
+        f"Warning: The dataset appears to be corrupted or its structure has changed.\n\n"
+        f"Error: {error_msg}\n\n"
+        "To get started, we need to delete the current database and create a new one.\n"
+        f"A snapshot of the current file will be saved to {snapshot_dir()} first.\n\n"
+        "Do you want to delete and reinitialize the database now?"
+    )
+    reply = QMessageBox.warning(
+        parent,
+        "Database Corrupted or Changed!",
+        msg,
+        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+    )
+    if reply != QMessageBox.StandardButton.Yes:
+        return False
+    if not os.path.exists(DB_FILE):
+        return True
+    try:
+        snapshot_database(label="pre-reset")
+    except Exception:
+        # The backup API refuses files that are not valid databases; keep the raw bytes
+        try:
+            os.makedirs(snapshot_dir(), exist_ok=True)
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            stem = os.path.splitext(os.path.basename(DB_FILE))[0]
+            shutil.copy2(
+                DB_FILE, os.path.join(snapshot_dir(), f"{stem}-{stamp}-pre-reset.db")
+            )
+        except Exception as e:
+            show_error(
+                parent, f"Could not snapshot the database, nothing was deleted:\n{e}"
+            )
+            return False
+    return True
+
+
+def init_database():
+    """Run init_db, reporting a failure in a message box instead of raising it."""
+    try:
+        return init_db()
+    except Exception as e:
+        show_error(None, f"Database initialization failed: {e}")
+
+
+def run_gui(argv):
+    """Start the Qt application and return its exit code."""
+    app = QApplication(argv)
+    app.setWindowIcon(QIcon(LOGO_ICON_PATH))
+    probe = os.environ.get(STARTUP_PROBE_ENV)
+    if probe and not os.path.exists(DB_FILE):
+        # Startup probes run in an empty directory; start from a fresh schema
+        init_database()
+    warning = None
+    ok, err = check_db_integrity()
+    if not ok:
+        # Show warning and ask user if they want to reset
+        proceed = prompt_db_reset(None, err)
+        if proceed:
+            try:
+                if os.path.exists(DB_FILE):
+                    os.remove(DB_FILE)
+            except Exception as e:
+                QMessageBox.critical(None, "Error", f"Failed to delete database: {e}")
+                return 1
+            warning = init_database()
+            QMessageBox.information(
+                None, "Database Reset", "Database has been reset and reinitialized."
+            )
+        else:
+            return 0
+    else:
+        warning = init_database()
+    conn = sqlite3.connect(DB_FILE)
+    for path in json.loads(get_setting(conn.cursor(), "attached_databases", "[]")):
+        if os.path.exists(path) and check_db_integrity(path)[0]:
+            ATTACHED_DATABASES.append(path)
+    conn.close()
+    win = MainWindow()
+    win.resize(1500, 900)
+    win.show()
+    if warning:
+        win.statusBar().showMessage(warning, 10000)
+    if probe:
+        # Used by build.py to time launches: once the loop runs, record that
+        # the window was shown and quit
+        def finish_probe():
+            with open(probe, "w", encoding="utf-8") as f:
+                f.write("shown\n")
+            win.close()
+
+        QTimer.singleShot(0, finish_probe)
+    return app.exec()
@@ -0,0 +1,770 @@
+"""Chart data, chart drawing and the static HTML report.
+
+Charts are drawn on plain matplotlib figures so ``main.py report`` and its worker
+processes never import Qt; gui.py puts the same figures on a Qt canvas.
+"""
+
+import os
+import re
+import json
+import hashlib
+import html
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from core import (
+    SqliteBackend,
+    code_metric_schemas,
+    estimate_size,
+    federated_counts,
+    federation_schemas,
+    open_backend,
+)
+
+# Cross-tab views: grouped query and how its keys are turned into a matrix
+CROSSTAB_VIEWS = {
+    "Tag Co-occurrence": (
+        "SELECT tags, COUNT(*) FROM {schema}.problems GROUP BY tags",
+        "cooccurrence",
+    ),
+    "Platform × Difficulty": (
+        "SELECT platform, difficulty, COUNT(*) FROM {schema}.problems GROUP BY platform, difficulty",
+        "pivot",
+    ),
+    "Platform × Language": (
+        "SELECT p.platform, s.language, COUNT(*) FROM {schema}.solutions s JOIN {schema}.problems p ON p.id = s.problem_id GROUP BY p.platform, s.language",
+        "pivot",
+    ),
+    "Language × Tag": (
+        "SELECT s.language, p.tags, COUNT(*) FROM {schema}.solutions s JOIN {schema}.problems p ON p.id = s.problem_id GROUP BY s.language, p.tags",
+        "tag_pivot",
+    ),
+}
+CROSSTAB_TOP_K = 20
+# Heatmap cells are labelled with their counts up to this many cells
+HEATMAP_ANNOTATE_CELLS = 400
+
+
+def split_tags(tags):
+    """Return the distinct non-empty tags of a comma separated tag string."""
+    return list(dict.fromkeys(t.strip() for t in (tags or "").split(",") if t.strip()))
+
+
+def top_k_indices(totals, k):
+    """Return the indices of the ``k`` largest totals, largest first."""
+    k = min(k, len(totals))
+    if k <= 0:
+        return np.empty(0, np.int64)
+    top = np.argpartition(-totals, k - 1)[:k]
+    return top[np.argsort(-totals[top], kind="stable")]
+
+
+def tag_cooccurrence(tag_counts, top_k=CROSSTAB_TOP_K):
+    """Return ``(tags, matrix)`` counting the problems tagged with both tags.
+
+    ``tag_counts`` maps tag strings to problem counts. They form a sparse
+    incidence matrix of tag strings by tags, weighted by count, whose Gram
+    matrix restricted to the ``top_k`` most frequent tags is the result.
+    """
+    vocab = {}
+    rows, cols, weights = [], [], []
+    for row, (tags, count) in enumerate(tag_counts.items()):
+        weights.append(count)
+        for tag in split_tags(tags):
+            rows.append(row)
+            cols.append(vocab.setdefault(tag, len(vocab)))
+    rows = np.array(rows, np.int64)
+    cols = np.array(cols, np.int64)
+    weights = np.array(weights, np.int64)
+    # Column sums of the weighted incidence matrix are the tag frequencies
+    frequency = np.bincount(cols, weights=weights[rows], minlength=len(vocab))
+    top = top_k_indices(frequency, top_k)
+    position = np.full(len(vocab), -1)
+    position[top] = np.arange(len(top))
+    keep = position[cols] >= 0
+    kept_rows, row_pos = np.unique(rows[keep], return_inverse=True)
+    incidence = np.zeros((len(kept_rows), len(top)), np.int64)
+    incidence[row_pos, position[cols[keep]]] = 1
+    matrix = (incidence * weights[kept_rows, None]).T @ incidence
+    names = list(vocab)
+    return [names[i] for i in top], matrix
+
+
+def pivot_counts(counts, top_k=CROSSTAB_TOP_K, split_columns=False):
+    """Return ``(row_labels, column_labels, matrix)`` for two-key grouped counts.
+
+    With ``split_columns`` the column key is a tag string counted once per tag.
+    Rows and columns are pruned to the ``top_k`` largest totals.
+    """
+    row_ids, col_ids = {}, {}
+    rows, cols, values = [], [], []
+    for (row, col), count in counts.items():
+        row_id = row_ids.setdefault(row or "Unknown", len(row_ids))
+        for label in split_tags(col) if split_columns else [col or "Unknown"]:
+            rows.append(row_id)
+            cols.append(col_ids.setdefault(label, len(col_ids)))
+            values.append(count)
+    rows = np.array(rows, np.int64)
+    cols = np.array(cols, np.int64)
+    values = np.array(values, np.float64)
+    top_rows = top_k_indices(np.bincount(rows, values, len(row_ids)), top_k)
+    top_cols = top_k_indices(np.bincount(cols, values, len(col_ids)), top_k)
+    row_pos = np.full(len(row_ids), -1)
+    row_pos[top_rows] = np.arange(len(top_rows))
+    col_pos = np.full(len(col_ids), -1)
+    col_pos[top_cols] = np.arange(len(top_cols))
+    keep = (row_pos[rows] >= 0) & (col_pos[cols] >= 0)
+    cells = row_pos[rows[keep]] * len(top_cols) + col_pos[cols[keep]]
+    matrix = np.bincount(
+        cells, values[keep], minlength=len(top_rows) * len(top_cols)
+    ).astype(np.int64)
+    row_names, col_names = list(row_ids), list(col_ids)
+    return (
+        [row_names[i] for i in top_rows],
+        [col_names[i] for i in top_cols],
+        matrix.reshape(len(top_rows), len(top_cols)),
+    )
+
+
+def crosstab(view, counts, top_k=CROSSTAB_TOP_K):
+    """Return ``(row_labels, column_labels, matrix)`` for grouped ``counts`` of a view."""
+    kind = CROSSTAB_VIEWS[view][1]
+    if kind == "cooccurrence":
+        tags, matrix = tag_cooccurrence(counts, top_k)
+        return tags, tags, matrix
+    return pivot_counts(counts, top_k, split_columns=kind == "tag_pivot")
+
+
+def draw_heatmap(fig, title, row_labels, col_labels, matrix):
+    """Draw ``matrix`` as a labelled heatmap on ``fig``."""
+    fig.clear()
+    ax = fig.add_subplot()
+    if not matrix.size:
+        ax.axis("off")
+        ax.text(0.5, 0.5, "No data", ha="center", va="center")
+        return ax
+    image = ax.imshow(matrix, cmap="viridis", aspect="auto")
+    fig.colorbar(image, ax=ax)
+    ax.set_xticks(range(len(col_labels)), col_labels, rotation=45, ha="right")
+    ax.set_yticks(range(len(row_labels)), row_labels)
+    ax.set_title(title)
+    if matrix.size <= HEATMAP_ANNOTATE_CELLS:
+        threshold = matrix.max() / 2
+        for (i, j), value in np.ndenumerate(matrix):
+            ax.text(
+                j,
+                i,
+                str(value),
+                ha="center",
+                va="center",
+                fontsize=7,
+                color="black" if value > threshold else "white",
+            )
+    fig.tight_layout()
+    return ax
+
+
+class CategoricalColumn:
+    """Dictionary-encoded column: integer codes into a list of distinct labels."""
+
+    __slots__ = ("codes", "labels")
+
+    def __init__(self, values, dtype=np.int32):
+        self.labels = list(dict.fromkeys(values))
+        index = {v: i for i, v in enumerate(self.labels)}
+        self.codes = np.fromiter(map(index.__getitem__, values), dtype, len(values))
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        return self.labels[self.codes[i]]
+
+    def take(self, order):
+        """Reorder the rows in place."""
+        self.codes = self.codes[order]
+
+    def counts(self):
+        """Return ``{label: row count}``."""
+        totals = np.bincount(self.codes, minlength=len(self.labels))
+        return dict(zip(self.labels, totals.tolist()))
+
+    def nbytes(self):
+        return self.codes.nbytes + estimate_size(self.labels)
+
+
+class TextColumn:
+    """Strings stored in one UTF-8 buffer with an offset array."""
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self, values):
+        encoded = [(v or "").encode() for v in values]
+        self.data = b"".join(encoded)
+        self.offsets = np.zeros(len(encoded) + 1, np.int64)
+        np.cumsum([len(v) for v in encoded], out=self.offsets[1:])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.data[self.offsets[i] : self.offsets[i + 1]].decode()
+
+    def take(self, order):
+        """Reorder the rows in place."""
+        values = [self[i] for i in order]
+        self.__init__(values)
+
+    def nbytes(self):
+        return len(self.data) + self.offsets.nbytes
+
+
+class ProblemRecord:
+    __slots__ = ("id", "source", "platform", "title", "difficulty", "tags", "solutions")
+
+
+class SolutionRecord:
+    __slots__ = ("id", "language", "implementations")
+
+
+class ColumnarDataset:
+    """Problems, solutions and implementation names held column by column.
+
+    Categorical columns are dictionary-encoded NumPy arrays, titles share one
+    UTF-8 buffer and the problem -> solution -> implementation links are offset
+    arrays: the children of row ``i`` are rows ``offsets[i]:offsets[i + 1]``
+    of the child table. Records are only materialised while iterating.
+    ``backend`` is the storage backend the dataset was loaded from; charts run
+    their aggregate queries on it.
+    """
+
+    def __init__(self, problems, solutions, implementations, backend=None):
+        self.backend = backend
+        ids, sources, platforms, titles, difficulties, tags = problems
+        self.problem_ids = np.array(ids, np.int64)
+        self.source = CategoricalColumn(sources, np.int8)
+        self.platform = CategoricalColumn(platforms)
+        self.title = TextColumn(titles)
+        self.difficulty = CategoricalColumn(difficulties)
+        # Split each distinct tag string once, then gather the tags of every problem
+        tag_strings = CategoricalColumn(tags)
+        split = [split_tags(t) for t in tag_strings.labels]
+        self.tags = CategoricalColumn([tag for row in split for tag in row])
+        string_offsets = self._offsets([len(row) for row in split])
+        lengths = np.diff(string_offsets)[tag_strings.codes]
+        self.tag_offsets = self._offsets(lengths)
+        gather = np.repeat(
+            string_offsets[tag_strings.codes] - self.tag_offsets[:-1], lengths
+        ) + np.arange(self.tag_offsets[-1])
+        self.tags.codes = self.tags.codes[gather]
+        # Child rows arrive in ID order; sort them by parent to get offsets
+        sol_parent, sol_ids, languages = solutions
+        order = np.argsort(np.array(sol_parent, np.int64), kind="stable")
+        self.solution_ids = np.array(sol_ids, np.int64)[order]
+        self.language = CategoricalColumn(languages)
+        self.language.take(order)
+        self.solution_offsets = self._offsets(
+            np.bincount(np.array(sol_parent, np.int64), minlength=len(ids))
+        )
+        impl_parent, method_names = implementations
+        # Implementations point at solutions by their pre-sort position
+        position = np.empty(len(order), np.int64)
+        position[order] = np.arange(len(order))
+        impl_parent = position[np.array(impl_parent, np.int64)]
+        order = np.argsort(impl_parent, kind="stable")
+        self.method_name = CategoricalColumn(method_names)
+        self.method_name.take(order)
+        self.implementation_offsets = self._offsets(
+            np.bincount(impl_parent, minlength=len(sol_ids))
+        )
+
+    @staticmethod
+    def _offsets(lengths):
+        offsets = np.zeros(len(lengths) + 1, np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return offsets
+
+    @classmethod
+    def load(cls, backend):
+        """Load every database in the federation with three column scans each.
+
+        The main database is read through the storage ``backend``, attached
+        databases through read-only SqliteBackends.
+        """
+        problems = ([], [], [], [], [], [])
+        solutions = ([], [], [])
+        implementations = ([], [])
+        for schema, path in federation_schemas():
+            source = backend
+            if schema != "main":
+                source = SqliteBackend(path, read_only=True)
+            try:
+                rows = list(
+                    source.scan_columns(
+                        "problems", ("id", "platform", "title", "difficulty", "tags")
+                    )
+                )
+                base = len(problems[0])
+                problem_index = {row[0]: base + i for i, row in enumerate(rows)}
+                ids, sources, platforms, titles, difficulties, tags = problems
+                for column, values in zip(
+                    (ids, platforms, titles, difficulties, tags), zip(*rows)
+                ):
+                    column.extend(values)
+                sources.extend([schema] * len(rows))
+                base = len(solutions[0])
+                rows = [
+                    (problem_index[pid], sid, language)
+                    for sid, pid, language in source.scan_columns(
+                        "solutions", ("id", "problem_id", "language")
+                    )
+                    if pid in problem_index
+                ]
+                solution_index = {row[1]: base + i for i, row in enumerate(rows)}
+                for column, values in zip(solutions, zip(*rows)):
+                    column.extend(values)
+                rows = [
+                    (solution_index[sid], method_name)
+                    for sid, method_name in source.scan_columns(
+                        "implementations", ("solution_id", "method_name")
+                    )
+                    if sid in solution_index
+                ]
+                for column, values in zip(implementations, zip(*rows)):
+                    column.extend(values)
+            finally:
+                if source is not backend:
+                    source.close()
+        return cls(problems, solutions, implementations, backend)
+
+    @classmethod
+    def empty(cls):
+        return cls(([], [], [], [], [], []), ([], [], []), ([], []))
+
+    def __len__(self):
+        return len(self.problem_ids)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.record(i)
+
+    def record(self, i):
+        """Return problem ``i`` with its solutions as slotted records."""
+        prob = ProblemRecord()
+        prob.id = int(self.problem_ids[i])
+        prob.source = self.source[i]
+        prob.platform = self.platform[i]
+        prob.title = self.title[i]
+        prob.difficulty = self.difficulty[i]
+        prob.tags = [
+            self.tags[t] for t in range(self.tag_offsets[i], self.tag_offsets[i + 1])
+        ]
+        prob.solutions = []
+        for j in range(self.solution_offsets[i], self.solution_offsets[i + 1]):
+            sol = SolutionRecord()
+            sol.id = int(self.solution_ids[j])
+            sol.language = self.language[j]
+            sol.implementations = [
+                self.method_name[k]
+                for k in range(
+                    self.implementation_offsets[j], self.implementation_offsets[j + 1]
+                )
+            ]
+            prob.solutions.append(sol)
+        return prob
+
+    def tag_counts(self):
+        return self.tags.counts()
+
+    def to_dicts(self):
+        """Return the dataset as nested dicts, the layout used before this class."""
+        return [
+            {
+                "id": prob.id,
+                "source": prob.source,
+                "platform": prob.platform,
+                "title": prob.title,
+                "difficulty": prob.difficulty,
+                "tags": ", ".join(prob.tags),
+                "solutions": [
+                    {
+                        "id": sol.id,
+                        "language": sol.language,
+                        "implementations": sol.implementations,
+                    }
+                    for sol in prob.solutions
+                ],
+            }
+            for prob in self
+        ]
+
+    def nbytes(self):
+        """Return the approximate memory held by the dataset."""
+        arrays = (
+            self.problem_ids,
+            self.tag_offsets,
+            self.solution_ids,
+            self.solution_offsets,
+            self.implementation_offsets,
+        )
+        columns = (
+            self.source,
+            self.platform,
+            self.title,
+            self.difficulty,
+            self.tags,
+            self.language,
+            self.method_name,
+        )
+        return sum(a.nbytes for a in arrays) + sum(col.nbytes() for col in columns)
+
+
+# Charts shared by VisualizationDialog and the headless report. Each entry is
+# (title, data, draw): ``data(dataset)`` turns a ColumnarDataset into plain
+# JSON-serialisable chart input and ``draw(fig, input)`` draws it on a Figure.
+CHARTS = {}
+# Labels of the single bar a chart shows when it has no data; never clickable
+PLACEHOLDER_LABELS = frozenset({"No Tags", "No Language", "No Data"})
+
+
+def register_chart(name, title, data):
+    """Register the decorated ``draw(fig, input)`` function as a chart."""
+
+    def decorator(draw):
+        CHARTS[name] = (title, data, draw)
+        return draw
+
+    return decorator
+
+
+def relations_data(dataset):
+    return [
+        [prob.title, [[sol.language, sol.implementations] for sol in prob.solutions]]
+        for prob in dataset
+    ]
+
+
+@register_chart("relations", "Data Relations Graph", relations_data)
+def draw_relations_graph(fig, problems):
+    # Draw a node/edge diagram using matplotlib (no networkx)
+    fig.set_size_inches(10, 7)
+    ax = fig.add_subplot()
+    ax.axis("off")
+    # Problems as root nodes
+    for i, (title, solutions) in enumerate(problems):
+        px = 0
+        py = -i * 3
+        ax.text(
+            px,
+            py,
+            f"Problem: {title}",
+            bbox=dict(facecolor="lightblue", alpha=0.7),
+            ha="center",
+        )
+        # Draw solutions
+        for j, (language, implementations) in enumerate(solutions):
+            sx = px + 4
+            sy = py - j * 1.5
+            ax.text(
+                sx,
+                sy,
+                f"Lang: {language}",
+                bbox=dict(facecolor="lightgreen", alpha=0.7),
+                ha="center",
+            )
+            # Edge: problem -> solution
+            ax.plot([px, sx], [py, sy], "k-", lw=1)
+            # Draw implementations
+            for k, impl in enumerate(implementations):
+                ix = sx + 4
+                iy = sy - k * 1.0
+                ax.text(
+                    ix,
+                    iy,
+                    f"Impl: {impl}",
+                    bbox=dict(facecolor="wheat", alpha=0.7),
+                    ha="center",
+                )
+                # Edge: solution -> implementation
+                ax.plot([sx, ix], [sy, iy], "k--", lw=1)
+    # Instead of tight_layout, use subplots_adjust to avoid margin issues
+    fig.subplots_adjust(left=0.15, right=0.85, top=0.85, bottom=0.15)
+
+
+def difficulty_data(dataset):
+    difficulties = {}
+    for diff, count in sorted(
+        dataset.difficulty.counts().items(), key=lambda x: x[0] or ""
+    ):
+        diff = diff or "Unknown"
+        difficulties[diff] = difficulties.get(diff, 0) + count
+    return difficulties
+
+
+@register_chart("difficulty", "Problems by Difficulty", difficulty_data)
+def draw_difficulty_chart(fig, difficulties):
+    # Bar chart: problem count by difficulty
+    ax = fig.add_subplot()
+    ax.bar(list(difficulties.keys()), list(difficulties.values()), color="skyblue")
+    ax.set_title("Problems by Difficulty")
+    ax.set_xlabel("Difficulty")
+    ax.set_ylabel("Count")
+    fig.tight_layout()
+
+
+def tag_data(dataset):
+    tag_counts = dataset.tag_counts() or {"No Tags": 1}
+    return dict(sorted(tag_counts.items(), key=lambda x: -x[1]))
+
+
+@register_chart("tags", "Tag Frequency", tag_data)
+def draw_tag_chart(fig, tag_counts):
+    # Bar chart: tag frequency
+    ax = fig.add_subplot()
+    ax.bar(list(tag_counts.keys()), list(tag_counts.values()), color="orange")
+    ax.set_title("Tag Frequency")
+    ax.set_xlabel("Tag")
+    ax.set_ylabel("Count")
+    ax.tick_params(axis="x", rotation=45)
+    fig.tight_layout()
+
+
+def language_data(dataset):
+    lang_counts = {}
+    for lang, count in dataset.language.counts().items():
+        lang = lang or "Unknown"
+        lang_counts[lang] = lang_counts.get(lang, 0) + count
+    if not lang_counts:
+        lang_counts = {"No Language": 1}
+    return dict(sorted(lang_counts.items(), key=lambda x: -x[1]))
+
+
+@register_chart("languages", "Language Usage", language_data)
+def draw_language_chart(fig, lang_counts):
+    # Bar chart: language usage
+    ax = fig.add_subplot()
+    ax.bar(list(lang_counts.keys()), list(lang_counts.values()), color="green")
+    ax.set_title("Language Usage")
+    ax.set_xlabel("Language")
+    ax.set_ylabel("Count")
+    ax.tick_params(axis="x", rotation=45)
+    fig.tight_layout()
+
+
+def register_crosstab_chart(view):
+    def data(dataset):
+        counts = federated_counts(CROSSTAB_VIEWS[view][0], backend=dataset.backend)
+        rows, cols, matrix = crosstab(view, counts)
+        return [rows, cols, matrix.tolist()]
+
+    def draw(fig, crosstab_input):
+        rows, cols, matrix = crosstab_input
+        fig.set_size_inches(10, 8)
+        draw_heatmap(
+            fig,
+            view,
+            rows,
+            cols,
+            np.array(matrix, np.int64).reshape(len(rows), len(cols)),
+        )
+
+    slug = re.sub(r"[^a-z]+", "-", view.lower()).strip("-")
+    register_chart(f"crosstab-{slug}", view, data)(draw)
+
+
+for _view in CROSSTAB_VIEWS:
+    register_crosstab_chart(_view)
+
+
+# Code metric distributions: column -> (chart title, x label, bins). Long-tailed
+# metrics use power-of-two bins; "linear" bins count each value up to a cap.
+CODE_METRIC_CHARTS = {
+    "code_bytes": ("Code Size", "Bytes", "log"),
+    "code_lines": ("Line Count", "Lines", "log"),
+    "code_branches": (
+        "Branch Points",
+        "Conditionals, loops and boolean operators",
+        "log",
+    ),
+    "code_depth": ("Nesting Depth", "Indentation levels", 12),
+}
+
+
+def metric_bins(values, counts, bins):
+    """Group per-value counts into labelled bins; return ``{label: count}``.
+
+    Labels are ``"lo-hi"``, a single value, or ``"lo+"`` for an open last bin,
+    which ``chart_filter_condition`` turns back into a range.
+    """
+    if not len(values):
+        return {}
+    top = int(values.max())
+    if bins == "log":
+        edges = [0, 1]
+        while edges[-1] <= top:
+            edges.append(edges[-1] * 2)
+        labels = ["0"] + [
+            str(lo) if hi - lo == 1 else f"{lo}-{hi - 1}"
+            for lo, hi in zip(edges[1:], edges[2:])
+        ]
+    else:
+        edges = list(range(min(top, bins) + 2))
+        labels = [str(v) for v in edges[:-1]]
+        if top > bins:
+            edges[-1] = top + 1
+            labels[-1] = f"{bins}+"
+    totals = np.bincount(
+        np.searchsorted(edges, values, side="right") - 1,
+        weights=counts,
+        minlength=len(labels),
+    )
+    return {label: int(total) for label, total in zip(labels, totals)}
+
+
+def register_code_metric_chart(column):
+    title, xlabel, bins = CODE_METRIC_CHARTS[column]
+
+    def data(dataset):
+        counts = federated_counts(
+            f"SELECT {column}, COUNT(*) FROM {{schema}}.implementations WHERE {column} IS NOT NULL GROUP BY {column}",
+            code_metric_schemas(),
+            dataset.backend,
+        )
+        values = np.fromiter(counts.keys(), np.int64, len(counts))
+        totals = np.fromiter(counts.values(), np.int64, len(counts))
+        return metric_bins(values, totals, bins) or {"No Data": 0}
+
+    def draw(fig, metric_counts):
+        ax = fig.add_subplot()
+        ax.bar(list(metric_counts.keys()), list(metric_counts.values()), color="purple")
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel("Implementations")
+        ax.tick_params(axis="x", rotation=45)
+        fig.tight_layout()
+
+    register_chart(f"metric-{column.removeprefix('code_')}", title, data)(draw)
+
+
+for _column in CODE_METRIC_CHARTS:
+    register_code_metric_chart(_column)
+
+
+REPORT_FORMATS = ("png", "svg")
+REPORT_MANIFEST = "report.json"
+
+
+def render_chart(name, chart_input, out_dir, formats):
+    """Render one registered chart to files with the Agg backend; return their names."""
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    CHARTS[name][2](fig, chart_input)
+    files = []
+    for fmt in formats:
+        file_name = f"{name}.{fmt}"
+        fig.savefig(os.path.join(out_dir, file_name), format=fmt, dpi=100)
+        files.append(file_name)
+    return files
+
+
+def write_report_html(out_dir, manifest, dataset):
+    sections = []
+    for name, entry in manifest["charts"].items():
+        # Preview the PNG when there is one, otherwise the SVG
+        images = sorted(entry["files"], key=lambda f: f.endswith(".svg"))
+        links = " ".join(
+            f'<a href="{html.escape(f)}">{html.escape(f.rsplit(".", 1)[1].upper())}</a>'
+            for f in entry["files"]
+        )
+        sections.append(
+            f"<h2>{html.escape(entry['title'])}</h2>\n"
+            + "".join(
+                f'<img src="{html.escape(f)}" alt="{html.escape(entry["title"])}">\n'
+                for f in images[:1]
+            )
+            + f"<p>{links} &middot; rendered {html.escape(entry['rendered_at'])}</p>"
+        )
+    page = f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>CP Dataset Report</title>
+<style>body {{ font-family: sans-serif; margin: 2em; }} img {{ max-width: 100%; }}</style>
+</head>
+<body>
+<h1>CP Dataset Report</h1>
+<p>{len(dataset)} problems, {len(dataset.solution_ids)} solutions,
+{len(dataset.method_name)} implementations. Generated {html.escape(manifest["generated_at"])}.</p>
+{chr(10).join(sections)}
+</body>
+</html>
+"""
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(page)
+
+
+def render_report(
+    out_dir, formats=REPORT_FORMATS, workers=None, force=False, backend="sqlite"
+):
+    """Render every registered chart into ``out_dir`` with a summary index.html.
+
+    Chart data is read through the named storage backend. Charts are rendered
+    in parallel worker processes. A chart is skipped when the hash of its
+    input data and formats matches the previous run and its files still
+    exist. Returns the names of the rendered and skipped charts.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, REPORT_MANIFEST)
+    previous = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            previous = json.load(f).get("charts", {})
+    backend = open_backend(backend)
+    try:
+        dataset = ColumnarDataset.load(backend)
+        inputs = {name: data(dataset) for name, (_, data, _) in CHARTS.items()}
+    finally:
+        backend.close()
+    charts = {}
+    jobs = {}
+    for name, (title, _, _) in CHARTS.items():
+        chart_input = inputs[name]
+        digest = hashlib.sha256(
+            json.dumps([chart_input, list(formats)], sort_keys=True).encode()
+        ).hexdigest()
+        old = previous.get(name, {})
+        charts[name] = {"title": title, "hash": digest}
+        if (
+            not force
+            and old.get("hash") == digest
+            and all(os.path.exists(os.path.join(out_dir, f)) for f in old["files"])
+        ):
+            charts[name].update(files=old["files"], rendered_at=old["rendered_at"])
+        else:
+            jobs[name] = chart_input
+    if jobs:
+        with ProcessPoolExecutor(
+            max_workers=min(workers or os.cpu_count() or 1, len(jobs)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            futures = {
+                name: pool.submit(render_chart, name, chart_input, out_dir, formats)
+                for name, chart_input in jobs.items()
+            }
+            for name, future in futures.items():
+                charts[name].update(
+                    files=future.result(),
+                    rendered_at=datetime.now().isoformat(timespec="seconds"),
+                )
+    manifest = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "charts": charts,
+    }
+    write_report_html(out_dir, manifest, dataset)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return list(jobs), [name for name in charts if name not in jobs]
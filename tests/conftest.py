@@ -0,0 +1,77 @@
+import sqlite3
+
+import pytest
+
+import core
+
+
+def sample_problem(i, **changes):
+    """Return a problem tree with two solutions, long enough to be compressed."""
+    problem = {
+        "platform": ["Codeforces", "AtCoder", None][i % 3],
+        "title": f"Problem {i}",
+        "problem_description": f"Description of problem {i}. " * 10,
+        "url": f"https://example.com/problems/{i}",
+        "difficulty": ["Easy", "Medium", "Hard"][i % 3],
+        "tags": ["dp", "graphs", "math"][: i % 4],
+        "solutions": [
+            {
+                "language": language,
+                "implementations": [
+                    {
+                        "method_name": f"method {k}",
+                        "Explanation": f"Explanation {i}.{k}. " * 12,
+                        "url": "",
+                        "code": f"def solve_{i}_{k}(x):\n"
+                        + "    if x:\n        return x\n" * (k + i % 5 + 8),
+                        "notes": "",
+                    }
+                    for k in range(1 + i % 2)
+                ],
+            }
+            for language in ["Python", "C++"][: 1 + i % 2]
+        ],
+    }
+    problem.update(changes)
+    return problem
+
+
+def insert_problems(path, problems):
+    """Insert problem trees into a dataset file; return their IDs."""
+    conn = sqlite3.connect(path)
+    c = conn.cursor()
+    ids = [core.insert_problem_tree(c, problem) for problem in problems]
+    conn.commit()
+    conn.close()
+    return ids
+
+
+def create_dataset(path, problems=()):
+    """Create a dataset file with the full schema and the given problems."""
+    conn = sqlite3.connect(path)
+    core.create_schema(conn.cursor())
+    conn.commit()
+    conn.close()
+    return insert_problems(path, problems)
+
+
+def all_trees(path):
+    """Return every problem tree of a dataset file in ID order."""
+    conn = sqlite3.connect(path)
+    c = conn.cursor()
+    ids = [row[0] for row in c.execute("SELECT id FROM problems ORDER BY id")]
+    trees = core.fetch_problem_trees(c, ids)
+    conn.close()
+    return trees
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """An empty dataset file in a temporary directory, used as DB_FILE."""
+    path = str(tmp_path / "cp_dataset.db")
+    monkeypatch.setattr(core, "DB_FILE", path)
+    monkeypatch.setattr(core, "ATTACHED_DATABASES", [])
+    # init_db loads the file's codec into this process-wide state
+    monkeypatch.setattr(core, "_compression", dict(core._compression))
+    core.init_db()
+    return path
@@ -0,0 +1,97 @@
+import sqlite3
+
+import pytest
+
+import core
+from core import (
+    COMPRESSION_MAGIC,
+    COMPRESSION_MIN_BYTES,
+    compress_text,
+    decode_text,
+    encode_text,
+    get_setting,
+    migrate_compression,
+)
+from tests.conftest import all_trees, insert_problems, sample_problem
+
+TEXT = "for i in range(n):\n    total += values[i] * weights[i]\n" * 20
+
+
+@pytest.fixture(params=["zlib", "zstd"])
+def codec(request):
+    if request.param == "zstd":
+        pytest.importorskip("zstandard")
+    return request.param
+
+
+def test_round_trip(codec):
+    stored = compress_text(TEXT, codec)
+    assert isinstance(stored, bytes) and stored.startswith(COMPRESSION_MAGIC)
+    assert len(stored) < len(TEXT)
+    assert decode_text(stored) == TEXT
+
+
+def test_values_not_worth_compressing_are_kept(codec):
+    short = "x" * (COMPRESSION_MIN_BYTES - 1)
+    assert compress_text(short, codec) == short
+    for value in (None, 42, b"raw bytes"):
+        assert compress_text(value, codec) == value
+        assert decode_text(value) == value
+    assert compress_text(TEXT, "none") == TEXT
+
+
+def test_unknown_codecs_are_rejected():
+    with pytest.raises(ValueError):
+        compress_text(TEXT, "lz4")
+    with pytest.raises(ValueError):
+        decode_text(COMPRESSION_MAGIC + b"?" + b"data")
+
+
+def test_encode_text_uses_the_active_codec(db):
+    assert encode_text(TEXT) == TEXT
+    core._compression["codec"] = "zlib"
+    assert decode_text(encode_text(TEXT)) == TEXT
+    assert encode_text(TEXT) != TEXT
+
+
+def stored_types(db):
+    conn = sqlite3.connect(db)
+    types = {
+        type(value)
+        for row in conn.execute("SELECT code, explanation FROM implementations")
+        for value in row
+    }
+    changes = conn.execute("SELECT COUNT(*) FROM changelog").fetchone()[0]
+    conn.close()
+    return types, changes
+
+
+@pytest.mark.parametrize("use_dict", [False, True])
+def test_migration_keeps_content(db, codec, use_dict):
+    expected = [sample_problem(i) for i in range(40)]
+    insert_problems(db, expected)
+    types, changes = stored_types(db)
+    assert types == {str}
+    conn = sqlite3.connect(db)
+    try:
+        for target in (codec, "none"):
+            migrate_compression(conn, target, use_dict=use_dict, vacuum=False)
+            assert get_setting(conn.cursor(), "compression_codec") == target
+            assert all_trees(db) == expected
+            types, after = stored_types(db)
+            assert types == ({bytes} if target != "none" else {str})
+            # Re-encoding is not a content change
+            assert after == changes
+        if codec == "zstd":
+            migrate_compression(conn, codec, use_dict=use_dict, vacuum=False)
+            (code,) = conn.execute("SELECT code FROM implementations").fetchone()
+            assert code[4:5] == (b"d" if use_dict else b"s")
+    finally:
+        conn.close()
+
+
+def test_migration_rejects_unknown_codec(db):
+    conn = sqlite3.connect(db)
+    with pytest.raises(ValueError):
+        migrate_compression(conn, "lz4")
+    conn.close()
@@ -0,0 +1,114 @@
+import csv
+import sqlite3
+
+import pytest
+
+from core import CSV_COLUMNS, external_sort_csv_rows, import_csv_file
+from tests.conftest import all_trees, sample_problem
+
+PLATFORMS = ["Codeforces", "AtCoder", "LeetCode"]
+
+
+def problems(count):
+    # Empty CSV fields come back as empty strings, so avoid None values
+    return [sample_problem(i, platform=PLATFORMS[i % 3]) for i in range(count)]
+
+
+def csv_rows(problem):
+    """The flattened rows the CSV export writes for one problem."""
+    return [
+        [
+            problem["platform"],
+            problem["title"],
+            problem["problem_description"],
+            problem["url"],
+            problem["difficulty"],
+            ", ".join(problem["tags"]),
+            solution["language"],
+            impl["method_name"],
+            impl["Explanation"],
+            impl["url"],
+            impl["code"],
+            impl["notes"],
+        ]
+        for solution in problem["solutions"]
+        for impl in solution["implementations"]
+    ]
+
+
+def write_csv(path, rows, header=CSV_COLUMNS):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(path)
+
+
+def sorted_solutions(problem):
+    return {
+        **problem,
+        "solutions": sorted(problem["solutions"], key=lambda s: s["language"]),
+    }
+
+
+@pytest.fixture
+def conn(db):
+    conn = sqlite3.connect(db)
+    yield conn
+    conn.close()
+
+
+def test_grouped_csv_round_trips(conn, db, tmp_path):
+    expected = problems(12)
+    rows = [row for problem in expected for row in csv_rows(problem)]
+    path = write_csv(tmp_path / "export.csv", rows)
+    assert import_csv_file(conn, path) == 12
+    assert not conn.in_transaction
+    assert all_trees(db) == expected
+
+
+def test_columns_are_matched_by_name(conn, db, tmp_path):
+    expected = problems(3)
+    order = list(reversed(range(len(CSV_COLUMNS))))
+    rows = [
+        [row[i] for i in order] for problem in expected for row in csv_rows(problem)
+    ]
+    path = write_csv(tmp_path / "export.csv", rows, [CSV_COLUMNS[i] for i in order])
+    assert import_csv_file(conn, path) == 3
+    assert all_trees(db) == expected
+
+
+def test_ungrouped_csv_is_regrouped(conn, db, tmp_path):
+    expected = problems(9)
+    per_problem = [csv_rows(problem) for problem in expected]
+    # Deal the rows out round-robin so no problem's rows are consecutive
+    rows = [
+        rows[k]
+        for k in range(max(map(len, per_problem)))
+        for rows in per_problem
+        if k < len(rows)
+    ]
+    path = write_csv(tmp_path / "shuffled.csv", rows)
+    assert import_csv_file(conn, path) == 9
+    # The sort orders problems by their fields and solutions by language
+    imported = {tree["title"]: tree for tree in all_trees(db)}
+    assert imported == {p["title"]: sorted_solutions(p) for p in expected}
+    assert conn.execute("SELECT COUNT(*) FROM problems").fetchone()[0] == 9
+
+
+def test_external_sort_spills_runs(tmp_path):
+    rows = [row for problem in problems(6) for row in csv_rows(problem)][::-1]
+    in_memory = list(external_sort_csv_rows(iter(rows)))
+    assert list(external_sort_csv_rows(iter(rows), run_bytes=1)) == in_memory
+    keys = [row[:7] for row in in_memory]
+    assert keys == sorted(keys)
+    assert sorted(in_memory) == sorted(rows)
+
+
+def test_missing_column_is_rejected(conn, db, tmp_path):
+    header = [col for col in CSV_COLUMNS if col != "code"]
+    path = write_csv(tmp_path / "bad.csv", [[""] * len(header)], header)
+    with pytest.raises(ValueError, match="code"):
+        import_csv_file(conn, path)
+    conn.rollback()
+    assert all_trees(db) == []
@@ -0,0 +1,100 @@
+import json
+import sqlite3
+
+import pytest
+
+from core import export_delta, get_setting, transaction_writer
+from tests.conftest import insert_problems, sample_problem
+
+
+@pytest.fixture
+def conn(db):
+    conn = sqlite3.connect(db)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def ids(db):
+    return insert_problems(db, [sample_problem(i) for i in range(10)])
+
+
+def read_delta(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def watermark(conn):
+    return int(get_setting(conn.cursor(), "delta_export_watermark", 0))
+
+
+def test_first_export_contains_everything(conn, ids, tmp_path):
+    path = str(tmp_path / "delta.jsonl")
+    upserts, deletes, seq = export_delta(conn, path)
+    assert (upserts, deletes) == (10, 0)
+    assert seq == watermark(conn) > 0
+    assert read_delta(path) == [
+        {"op": "upsert", "id": pid, **sample_problem(i)} for i, pid in enumerate(ids)
+    ]
+    # Nothing changed since
+    assert export_delta(conn, path) == (0, 0, seq)
+    assert read_delta(path) == []
+
+
+def test_changes_and_tombstones(conn, db, ids, tmp_path):
+    path = str(tmp_path / "delta.jsonl")
+    export_delta(conn, path)
+    # A change to a child row exports its whole problem
+    conn.execute(
+        "UPDATE implementations SET notes = 'changed' WHERE solution_id = "
+        "(SELECT MIN(id) FROM solutions WHERE problem_id = ?)",
+        (ids[2],),
+    )
+    conn.execute("DELETE FROM problems WHERE id = ?", (ids[4],))
+    conn.commit()
+    (new_id,) = insert_problems(db, [sample_problem(42)])
+    # Inserted and deleted again between two exports: only the tombstone remains
+    (gone_id,) = insert_problems(db, [sample_problem(43)])
+    conn.execute("DELETE FROM problems WHERE id = ?", (gone_id,))
+    conn.commit()
+    assert export_delta(conn, path)[:2] == (2, 2)
+    records = read_delta(path)
+    assert [(r["op"], r["id"]) for r in records] == [
+        ("upsert", ids[2]),
+        ("delete", ids[4]),
+        ("upsert", new_id),
+        ("delete", gone_id),
+    ]
+    changed = records[0]["solutions"][0]["implementations"][0]
+    assert changed["notes"] == "changed"
+    assert records[2] == {"op": "upsert", "id": new_id, **sample_problem(42)}
+    assert records[1] == {"op": "delete", "id": ids[4]}
+
+
+def test_watermark_is_only_advanced_on_request(conn, ids, tmp_path):
+    path = str(tmp_path / "delta.jsonl")
+    _, _, seq = export_delta(conn, path, advance=False)
+    assert watermark(conn) == 0
+    calls = []
+
+    def write(fn, solo=False):
+        calls.append(solo)
+        return transaction_writer(conn)(fn, solo)
+
+    assert export_delta(conn, path, write=write) == (10, 0, seq)
+    assert calls == [False]
+    assert watermark(conn) == seq
+    # An explicit starting point overrides the stored watermark
+    assert export_delta(conn, path, since_seq=0, advance=False)[0] == 10
+
+
+def test_old_changes_behind_the_watermark_are_pruned(conn, ids, tmp_path):
+    total = conn.execute("SELECT COUNT(*) FROM changelog").fetchone()[0]
+    conn.execute("UPDATE changelog SET changed_at = 0 WHERE problem_id = ?", (ids[0],))
+    conn.commit()
+    old = conn.execute(
+        "SELECT COUNT(*) FROM changelog WHERE problem_id = ?", (ids[0],)
+    ).fetchone()[0]
+    export_delta(conn, str(tmp_path / "delta.jsonl"))
+    remaining = conn.execute("SELECT COUNT(*) FROM changelog").fetchone()[0]
+    assert remaining == total - old
@@ -0,0 +1,67 @@
+import sqlite3
+
+import pytest
+
+import core
+from core import extract_database, load_compression_settings, set_setting
+from tests.conftest import all_trees, create_dataset, insert_problems, sample_problem
+
+
+@pytest.fixture
+def sources(db, tmp_path):
+    """Compressed main database with 20 problems and an attached one with 10."""
+    conn = sqlite3.connect(db)
+    set_setting(conn.cursor(), "compression_codec", "zlib")
+    conn.commit()
+    load_compression_settings(conn.cursor())
+    conn.close()
+    main_ids = insert_problems(db, [sample_problem(i) for i in range(20)])
+    other = str(tmp_path / "other.db")
+    other_ids = create_dataset(other, [sample_problem(i) for i in range(100, 110)])
+    core.ATTACHED_DATABASES.append(other)
+    return main_ids, other_ids
+
+
+def test_extract_copies_chosen_problems(sources, tmp_path):
+    main_ids, other_ids = sources
+    keys = [("main", pid) for pid in main_ids[::3]] + [("fed1", other_ids[4])]
+    # Repeats and missing IDs are ignored
+    keys += [("main", main_ids[0]), ("main", main_ids[-1] + 100)]
+    path = str(tmp_path / "subset.db")
+    progress = []
+    counts = extract_database(path, keys, lambda *p: progress.append(p))
+    expected = [sample_problem(i) for i in range(0, 20, 3)] + [sample_problem(104)]
+    assert all_trees(path) == expected
+    assert counts == (
+        len(expected),
+        sum(len(t["solutions"]) for t in expected),
+        sum(len(s["implementations"]) for t in expected for s in t["solutions"]),
+    )
+    assert progress == [(1, 2), (2, 2)]
+
+
+def test_extract_renumbers_and_keeps_stored_values(sources, tmp_path):
+    main_ids, _ = sources
+    path = str(tmp_path / "subset.db")
+    extract_database(path, [("main", pid) for pid in main_ids[5:10]])
+    conn = sqlite3.connect(path)
+    assert [r[0] for r in conn.execute("SELECT id FROM problems")] == [1, 2, 3, 4, 5]
+    problem_ids = {r[0] for r in conn.execute("SELECT problem_id FROM solutions")}
+    assert problem_ids == {1, 2, 3, 4, 5}
+    # Compressed values are copied without being decoded, with the codec setting
+    code = conn.execute("SELECT code FROM implementations LIMIT 1").fetchone()[0]
+    assert isinstance(code, bytes)
+    assert core.get_setting(conn.cursor(), "compression_codec") == "zlib"
+    # The changelog starts empty but records later writes
+    assert conn.execute("SELECT COUNT(*) FROM changelog").fetchone()[0] == 0
+    conn.execute("DELETE FROM problems WHERE id = 1")
+    assert conn.execute("SELECT COUNT(*) FROM changelog").fetchone()[0] == 1
+    conn.close()
+
+
+def test_extract_refuses_to_overwrite(sources, tmp_path):
+    path = tmp_path / "subset.db"
+    path.write_bytes(b"")
+    with pytest.raises(FileExistsError):
+        extract_database(str(path), [("main", sources[0][0])])
+    assert path.read_bytes() == b""
@@ -0,0 +1,101 @@
+import gzip
+import json
+import sqlite3
+import threading
+import zipfile
+
+import pytest
+
+import core
+from core import import_jsonl_file, iter_jsonl_records
+from tests.conftest import all_trees, sample_problem
+
+PROBLEMS = [sample_problem(i) for i in range(20)]
+
+
+def jsonl_bytes(problems):
+    return "".join(json.dumps(p) + "\n" for p in problems).encode("utf-8")
+
+
+def write_input(tmp_path, name, problems=PROBLEMS):
+    path = tmp_path / name
+    data = jsonl_bytes(problems)
+    if name.endswith(".gz"):
+        data = gzip.compress(data)
+    elif name.endswith(".zst"):
+        data = pytest.importorskip("zstandard").ZstdCompressor().compress(data)
+    path.write_bytes(data)
+    return str(path)
+
+
+def records(path):
+    return [record for _, _, record in iter_jsonl_records(path)]
+
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    # Split the input into many blocks so lines straddle block boundaries
+    monkeypatch.setattr(core, "IMPORT_READ_BUFFER", 1000)
+    monkeypatch.setattr(core, "IMPORT_QUEUE_DEPTH", 2)
+
+
+@pytest.mark.parametrize("name", ["data.jsonl", "data.jsonl.gz", "data.jsonl.zst"])
+def test_compressed_inputs(tmp_path, name):
+    path = write_input(tmp_path, name)
+    assert records(path) == PROBLEMS
+    sources = {source for source, _, _ in iter_jsonl_records(path)}
+    assert sources == {name}
+
+
+def test_zip_members_in_name_order(tmp_path):
+    path = tmp_path / "shards.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("b/part-1.jsonl.gz", gzip.compress(jsonl_bytes(PROBLEMS[10:])))
+        archive.writestr("a/part-0.jsonl", jsonl_bytes(PROBLEMS[:10]))
+        archive.writestr("README.txt", "not a shard")
+    found = list(iter_jsonl_records(str(path)))
+    assert [record for _, _, record in found] == PROBLEMS
+    assert found[0][:2] == ("shards.zip/a/part-0.jsonl", 1)
+    assert found[10][:2] == ("shards.zip/b/part-1.jsonl.gz", 1)
+
+
+def test_line_numbers_skip_blank_lines(tmp_path):
+    path = tmp_path / "data.jsonl"
+    path.write_bytes(b'{"a": 1}\n\n   \n{"b": 2}')
+    assert [(line, record) for _, line, record in iter_jsonl_records(str(path))] == [
+        (1, {"a": 1}),
+        (4, {"b": 2}),
+    ]
+
+
+def test_bad_json_names_the_line(tmp_path):
+    path = tmp_path / "data.jsonl.gz"
+    data = jsonl_bytes(PROBLEMS[:3]) + b'{"title": \n'
+    path.write_bytes(gzip.compress(data))
+    with pytest.raises(ValueError, match="data.jsonl.gz line 4"):
+        records(str(path))
+
+
+def test_reader_errors_reach_the_caller(tmp_path):
+    path = tmp_path / "data.jsonl.gz"
+    path.write_bytes(gzip.compress(jsonl_bytes(PROBLEMS))[:200])
+    with pytest.raises(EOFError):
+        records(str(path))
+
+
+def test_abandoned_iteration_stops_the_reader(tmp_path):
+    path = write_input(tmp_path, "data.jsonl.gz", PROBLEMS * 10)
+    before = threading.active_count()
+    stream = iter_jsonl_records(path)
+    next(stream)
+    stream.close()
+    assert threading.active_count() == before
+
+
+def test_import_jsonl_file(db, tmp_path):
+    path = write_input(tmp_path, "data.jsonl.gz")
+    conn = sqlite3.connect(db)
+    assert import_jsonl_file(conn.cursor(), path) == len(PROBLEMS)
+    conn.commit()
+    conn.close()
+    assert all_trees(db) == PROBLEMS
@@ -0,0 +1,143 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+from core import (
+    JSONL_INDEX_SUFFIX,
+    JsonlLineIndex,
+    format_record_ranges,
+    import_jsonl_ranges,
+    parse_record_ranges,
+    sample_jsonl,
+)
+from tests.conftest import all_trees, sample_problem
+
+
+def write_jsonl(path, problems, trailing_newline=True):
+    text = "\n".join(json.dumps(p) for p in problems)
+    path.write_text(text + ("\n" if trailing_newline else ""), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def index_of():
+    opened = []
+
+    def open_index(path, **kwargs):
+        index = JsonlLineIndex.open(path, **kwargs)
+        opened.append(index)
+        return index
+
+    yield open_index
+    for index in opened:
+        index.close()
+
+
+@pytest.mark.parametrize("trailing_newline", [True, False])
+def test_lines_match_the_file(tmp_path, index_of, trailing_newline):
+    problems = [sample_problem(i) for i in range(25)]
+    path = write_jsonl(tmp_path / "data.jsonl", problems, trailing_newline)
+    index = index_of(path)
+    assert len(index) == 25
+    assert [index.record(i) for i in range(25)] == problems
+    assert index.line(3) == json.dumps(problems[3])
+    assert index.line(3, limit=10) == json.dumps(problems[3])[:10]
+
+
+def test_blank_and_crlf_lines(tmp_path, index_of):
+    path = tmp_path / "data.jsonl"
+    path.write_bytes(b'{"a": 1}\r\n\n  \n{"b": 2}')
+    index = index_of(str(path))
+    assert len(index) == 4
+    assert [index.record(i) for i in range(4)] == [{"a": 1}, None, None, {"b": 2}]
+    assert index.line(0) == '{"a": 1}'
+
+
+def test_empty_file(tmp_path, index_of):
+    path = tmp_path / "empty.jsonl"
+    path.write_bytes(b"")
+    index = index_of(str(path))
+    assert len(index) == 0
+    assert parse_record_ranges("all", len(index)) == []
+
+
+def test_chunked_scan_matches_single_pass(tmp_path, index_of):
+    path = write_jsonl(tmp_path / "data.jsonl", [sample_problem(i) for i in range(40)])
+    index = index_of(path)
+    progress = []
+    chunked = JsonlLineIndex.scan(index.mm, lambda *p: progress.append(p), chunk=97)
+    assert chunked.tolist() == index.starts.tolist()
+    assert progress[-1] == (index.size, index.size)
+    assert len(progress) == -(-index.size // 97)
+
+
+def test_index_cache_is_reused_until_the_file_changes(tmp_path, index_of):
+    path = write_jsonl(tmp_path / "data.jsonl", [sample_problem(i) for i in range(5)])
+    progress = []
+    index_of(path, progress=lambda *p: progress.append(p))
+    assert os.path.exists(path + JSONL_INDEX_SUFFIX)
+    assert progress
+    progress.clear()
+    assert len(index_of(path, progress=lambda *p: progress.append(p))) == 5
+    assert progress == []
+    write_jsonl(tmp_path / "data.jsonl", [sample_problem(i) for i in range(8)])
+    assert len(index_of(path, progress=lambda *p: progress.append(p))) == 8
+    assert progress
+
+
+def test_record_ranges():
+    assert parse_record_ranges("", 10) == [(0, 10)]
+    assert parse_record_ranges(" 1-3, 2-5 ,7, 9-", 10) == [(0, 5), (6, 7), (8, 10)]
+    assert parse_record_ranges("4, 5, 6", 10) == [(3, 6)]
+    assert parse_record_ranges("8-20", 10) == [(7, 10)]
+    assert format_record_ranges([(0, 5), (6, 7), (8, 10)]) == "1-5, 7, 9-10"
+    for bad in ("0", "5-2", "x", "1-2-3"):
+        with pytest.raises(ValueError):
+            parse_record_ranges(bad, 10)
+
+
+def test_import_ranges(db, tmp_path, index_of):
+    problems = [sample_problem(i) for i in range(10)]
+    path = tmp_path / "data.jsonl"
+    write_jsonl(path, problems[:5])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n" + "\n".join(json.dumps(p) for p in problems[5:]) + "\n")
+    index = index_of(str(path))
+    conn = sqlite3.connect(db)
+    ranges = parse_record_ranges("2-3, 6-8", len(index))
+    assert import_jsonl_ranges(conn.cursor(), index, ranges) == 4
+    conn.commit()
+    conn.close()
+    # Line 6 is blank and skipped
+    assert all_trees(db) == [problems[1], problems[2], problems[5], problems[6]]
+
+
+def test_import_ranges_reports_bad_records(db, tmp_path, index_of):
+    path = tmp_path / "data.jsonl"
+    path.write_text('{"title": "ok"}\n{"title": \n', encoding="utf-8")
+    index = index_of(str(path))
+    conn = sqlite3.connect(db)
+    with pytest.raises(ValueError, match="Record 2"):
+        import_jsonl_ranges(conn.cursor(), index, [(0, 2)])
+    conn.close()
+
+
+def test_sample_summary(tmp_path, index_of):
+    problems = [sample_problem(i) for i in range(30)]
+    path = tmp_path / "data.jsonl"
+    write_jsonl(path, problems)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n[1, 2]\nnot json\n")
+    index = index_of(str(path))
+    stats = sample_jsonl(index)
+    assert (stats["lines"], stats["sampled"], stats["blank"]) == (33, 30, 1)
+    assert [line for line, _ in stats["errors"]] == [32, 33]
+    assert stats["solutions"] == sum(len(p["solutions"]) for p in problems)
+    assert stats["platforms"] == {"Codeforces": 10, "AtCoder": 10, "Unknown": 10}
+    assert stats["fields"]["tags"] == {"list": 30}
+    # A smaller sample reads k lines, the same ones for a given seed
+    small = sample_jsonl(index, k=5, seed=1)
+    assert small["sampled"] + small["blank"] + len(small["errors"]) == 5
+    assert sample_jsonl(index, k=5, seed=1) == small
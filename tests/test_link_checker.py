@@ -0,0 +1,159 @@
+"""LinkChecker against a stand-in HTTP server on 127.0.0.1.
+
+Routes: /ok, /missing, /get-only (405 to HEAD), /redirect (to /ok), /loop
+(redirects to itself), /slow (answers after SLOW seconds) and /busy (answers
+after BUSY seconds, to overlap requests).
+"""
+
+import asyncio
+import http.server
+import threading
+import time
+import urllib.parse
+
+import pytest
+
+from core import LinkChecker
+
+SLOW = 1.0
+BUSY = 0.2
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.stats["connections"] += 1
+
+    def do_HEAD(self):
+        self.respond(head=True)
+
+    def do_GET(self):
+        self.respond(head=False)
+
+    def respond(self, head):
+        stats = self.server.stats
+        host = self.headers.get("Host", "").rsplit(":", 1)[0]
+        path = urllib.parse.urlsplit(self.path).path
+        with self.server.lock:
+            stats["starts"].append((host, time.monotonic()))
+            stats["in_flight"][host] = stats["in_flight"].get(host, 0) + 1
+            total = sum(stats["in_flight"].values())
+            stats["max_total"] = max(stats["max_total"], total)
+            stats["max_per_host"] = max(stats["max_per_host"], stats["in_flight"][host])
+        try:
+            status, location = 200, None
+            if path == "/missing":
+                status = 404
+            elif path == "/get-only" and head:
+                status = 405
+            elif path == "/redirect":
+                status, location = 301, "/ok"
+            elif path == "/loop":
+                status, location = 302, "/loop"
+            elif path == "/slow":
+                time.sleep(SLOW)
+            elif path == "/busy":
+                time.sleep(BUSY)
+            self.send_response(status)
+            if location:
+                self.send_header("Location", location)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        except OSError:
+            # The checker gave up on this request (timeouts)
+            self.close_connection = True
+        finally:
+            with self.server.lock:
+                stats["in_flight"][host] -= 1
+
+
+class StandInServer:
+    def __init__(self):
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def url(self, path, host="127.0.0.1"):
+        return f"http://{host}:{self.port}{path}"
+
+    def run(self, urls, **options):
+        """Check ``urls``; return the results by URL and the server's statistics."""
+        with self.server.lock:
+            self.server.stats = {
+                "connections": 0,
+                "starts": [],
+                "in_flight": {},
+                "max_total": 0,
+                "max_per_host": 0,
+            }
+        options.setdefault("host_interval", 0)
+        checked = asyncio.run(LinkChecker(**options).check_all(urls))
+        return {r["url"]: r for r in checked}, self.server.stats
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = StandInServer()
+    yield server
+    server.close()
+
+
+def test_status_codes(server):
+    # /get-only rejects HEAD, so it is only reported working through the GET fallback
+    expected = {"/ok": (True, 200), "/missing": (False, 404), "/get-only": (True, 200)}
+    got, _ = server.run([server.url(path) for path in expected])
+    for path, want in expected.items():
+        result = got[server.url(path)]
+        assert (result["ok"], result["status"]) == want, path
+
+
+def test_redirects(server):
+    got, _ = server.run([server.url("/redirect"), server.url("/loop")])
+    assert got[server.url("/redirect")]["ok"]
+    assert got[server.url("/redirect")]["final_url"] == server.url("/ok")
+    assert got[server.url("/loop")]["error"] == "Too many redirects"
+
+
+def test_timeout(server):
+    got, _ = server.run([server.url("/slow")], timeout=SLOW / 4)
+    result = got[server.url("/slow")]
+    assert result["error"] == "Timed out"
+    assert result["elapsed_ms"] < 1000 * SLOW
+
+
+def test_concurrency_limits(server):
+    urls = [
+        server.url(f"/busy?{i}", host)
+        for host in ("127.0.0.1", "localhost")
+        for i in range(6)
+    ]
+    _, stats = server.run(urls, concurrency=3, per_host=2)
+    assert stats["max_total"] == 3
+    assert stats["max_per_host"] == 2
+
+
+def test_host_spacing(server):
+    interval = 0.1
+    _, stats = server.run(
+        [server.url(f"/ok?{i}") for i in range(5)], host_interval=interval
+    )
+    starts = sorted(t for _, t in stats["starts"])
+    # Allow for timer granularity
+    assert min(b - a for a, b in zip(starts, starts[1:])) >= 0.8 * interval
+
+
+def test_keep_alive(server):
+    _, stats = server.run([server.url(f"/ok?{i}") for i in range(5)], per_host=1)
+    assert stats["connections"] == 1
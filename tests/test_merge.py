@@ -0,0 +1,126 @@
+import sqlite3
+
+import pytest
+
+from core import MERGE_POLICIES, merge_database
+from tests.conftest import all_trees, create_dataset, insert_problems, sample_problem
+
+
+@pytest.fixture
+def theirs(tmp_path):
+    """Problems 5-14, of which 5-9 are also in the main database."""
+    path = str(tmp_path / "theirs.db")
+    create_dataset(path, [sample_problem(i) for i in range(5, 15)])
+    return path
+
+
+@pytest.fixture
+def conn(db):
+    insert_problems(db, [sample_problem(i) for i in range(10)])
+    conn = sqlite3.connect(db)
+    yield conn
+    conn.close()
+
+
+def merge(conn, path, **kwargs):
+    summary = merge_database(conn, path, **kwargs)
+    assert not conn.in_transaction
+    return summary
+
+
+def edit_description(path, title, text):
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "UPDATE problems SET problem_description = ? WHERE title = ?",
+            (text, title),
+        )
+    conn.close()
+
+
+def set_changed_at(path, title, changed_at):
+    """Pretend every logged change of a problem happened at ``changed_at``."""
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "UPDATE changelog SET changed_at = ? WHERE problem_id = "
+            "(SELECT id FROM problems WHERE title = ?)",
+            (changed_at, title),
+        )
+    conn.close()
+
+
+def titles(path):
+    return sorted(tree["title"] for tree in all_trees(path))
+
+
+@pytest.mark.parametrize("policy", MERGE_POLICIES)
+def test_merge_inserts_unmatched_problems(conn, db, theirs, policy):
+    summary = merge(conn, theirs, policy=policy)
+    assert (summary["insert"], summary["unchanged"], summary["conflicts"]) == (5, 5, 0)
+    trees = all_trees(db)
+    assert trees[:10] == [sample_problem(i) for i in range(10)]
+    # New problems come with their solutions and implementations
+    assert trees[10:] == all_trees(theirs)[5:]
+    assert summary["solutions"] == sum(len(t["solutions"]) for t in trees[10:])
+
+
+@pytest.mark.parametrize("policy", MERGE_POLICIES)
+def test_repeated_merge_is_idempotent(conn, db, theirs, policy):
+    edit_description(theirs, "Problem 7", "Edited on their side")
+    merge(conn, theirs, policy=policy)
+    before = all_trees(db)
+    summary = merge(conn, theirs, policy=policy)
+    assert summary["unchanged"] == 10
+    assert summary["insert"] == summary["conflicts"] == 0
+    assert all_trees(db) == before
+
+
+def test_keep_both_adds_conflicts_as_copies_once(conn, db, theirs):
+    edit_description(theirs, "Problem 7", "Edited on their side")
+    summary = merge(conn, theirs, policy="keep-both")
+    assert (summary["copy"], summary["conflicts"]) == (1, 1)
+    descriptions = [
+        tree["problem_description"]
+        for tree in all_trees(db)
+        if tree["title"] == "Problem 7"
+    ]
+    assert descriptions == [
+        sample_problem(7)["problem_description"],
+        "Edited on their side",
+    ]
+    # Our copy matches theirs, so later merges find nothing new
+    for _ in range(2):
+        summary = merge(conn, theirs, policy="keep-both")
+        assert summary["copy"] == summary["insert"] == 0
+    assert titles(db).count("Problem 7") == 2
+
+
+def test_last_writer_wins(conn, db, theirs):
+    edit_description(theirs, "Problem 6", "Changed there last")
+    edit_description(theirs, "Problem 8", "Changed there first")
+    set_changed_at(theirs, "Problem 6", 2e9)
+    set_changed_at(theirs, "Problem 8", 1e9)
+    set_changed_at(db, "Problem 6", 1.5e9)
+    set_changed_at(db, "Problem 8", 1.5e9)
+    summary = merge(conn, theirs)
+    assert (summary["update"], summary["keep"], summary["conflicts"]) == (1, 1, 2)
+    trees = {tree["title"]: tree for tree in all_trees(db)}
+    theirs_trees = {tree["title"]: tree for tree in all_trees(theirs)}
+    assert trees["Problem 6"] == theirs_trees["Problem 6"]
+    assert trees["Problem 8"] == sample_problem(8)
+    assert len(trees) == 15
+
+
+def test_dry_run_changes_nothing(conn, db, theirs):
+    edit_description(theirs, "Problem 7", "Edited on their side")
+    before = all_trees(db)
+    planned = merge(conn, theirs, policy="keep-both", dry_run=True)
+    assert all_trees(db) == before
+    applied = merge(conn, theirs, policy="keep-both")
+    assert {k: applied[k] for k in planned} == planned
+
+
+def test_merge_rejects_bad_arguments(conn, db, theirs):
+    with pytest.raises(ValueError):
+        merge_database(conn, theirs, policy="newest")
+    with pytest.raises(ValueError):
+        merge_database(conn, db)
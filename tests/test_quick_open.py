@@ -0,0 +1,137 @@
+import pytest
+
+import core
+from core import (
+    QUICK_OPEN_PENDING_MAX,
+    QuickOpenIndex,
+    quick_open_text,
+    update_quick_open_index,
+)
+from tests.conftest import create_dataset, insert_problems, sample_problem
+
+TITLES = [
+    ("Dijkstra Shortest Path", "Codeforces"),
+    ("Shortest Path Queries", "AtCoder"),
+    ("Path", "LeetCode"),
+    ("Longest Increasing Subsequence", "LeetCode"),
+    ("Two Sum", "LeetCode"),
+    ("Sum of Subarray Minimums", "Codeforces"),
+    ("Knapsack with Repetitions", "AtCoder"),
+    ("Minimum Spanning Tree", "Codeforces"),
+    ("Spanning Forest Count", "AtCoder"),
+    ("Subpath Sums", "Codeforces"),
+]
+
+
+def rows(titles=TITLES, schema="main"):
+    return [(schema, i, title, platform) for i, (title, platform) in enumerate(titles)]
+
+
+@pytest.fixture(params=["rebuilt", "pending"])
+def index(request):
+    """The same titles in the CSR arrays or only in the pending list."""
+    index = QuickOpenIndex()
+    index.add(rows(), rebuild=request.param == "rebuilt")
+    assert bool(index.pending) == (request.param == "pending")
+    return index
+
+
+def titles(results):
+    return [title for _, _, title, _ in results]
+
+
+def test_quick_open_text():
+    assert quick_open_text("Two-Sum  (Easy)", None) == " two sum easy "
+    assert quick_open_text(None, "AtCoder") == " atcoder "
+
+
+def test_exact_and_prefix_matches_rank_first(index):
+    assert titles(index.query("dijkstra shortest path"))[0] == "Dijkstra Shortest Path"
+    # The last word may still be typed
+    assert titles(index.query("longest incr"))[0] == "Longest Increasing Subsequence"
+    # Word starts beat matches inside a word, shorter titles win ties
+    assert titles(index.query("path"))[:3] == [
+        "Path",
+        "Shortest Path Queries",
+        "Dijkstra Shortest Path",
+    ]
+    assert "Subpath Sums" in titles(index.query("path"))
+
+
+def test_typos_and_platforms(index):
+    assert titles(index.query("dijkstar"))[0] == "Dijkstra Shortest Path"
+    assert titles(index.query("spaning tree"))[0] == "Minimum Spanning Tree"
+    results = index.query("atcoder knapsack")
+    assert results[0] == ("main", 6, "Knapsack with Repetitions", "AtCoder")
+
+
+def test_short_and_empty_queries(index):
+    assert set(titles(index.query("s"))) == {
+        "Dijkstra Shortest Path",
+        "Shortest Path Queries",
+        "Longest Increasing Subsequence",
+        "Two Sum",
+        "Sum of Subarray Minimums",
+        "Minimum Spanning Tree",
+        "Spanning Forest Count",
+        "Subpath Sums",
+    }
+    assert index.query("  ") == index.query("?!") == []
+    assert len(index.query("s", k=3)) == 3
+    assert index.query("zzzz") == []
+
+
+def test_remove_and_replace(index):
+    index.remove([("main", 0)])
+    assert "Dijkstra Shortest Path" not in titles(index.query("dijkstra"))
+    index.add([("main", 2, "Path Counting", "LeetCode")])
+    assert titles(index.query("path"))[0] == "Path Counting"
+    assert "Path" not in titles(index.query("path"))
+    assert len(index) == len(TITLES) - 1
+    index.rebuild()
+    assert not index.pending
+    assert titles(index.query("path"))[0] == "Path Counting"
+    assert len(index.keys) == len(TITLES) - 1
+
+
+def test_too_many_pending_titles_trigger_a_rebuild():
+    index = QuickOpenIndex()
+    many = [("main", i, f"Problem {i}", "") for i in range(QUICK_OPEN_PENDING_MAX + 1)]
+    index.add(many)
+    assert not index.pending and index.indexed == len(many)
+    assert index.query("problem 777")[0][1] == 777
+
+
+def test_update_from_databases(db, tmp_path):
+    main_ids = insert_problems(
+        db,
+        [sample_problem(i, title=t, platform=p) for i, (t, p) in enumerate(TITLES)],
+    )
+    other = str(tmp_path / "other.db")
+    other_ids = create_dataset(other, [sample_problem(0, title="Dijkstra Variants")])
+    core.ATTACHED_DATABASES.append(other)
+    conn = core.connect_federated()
+    index = QuickOpenIndex()
+    assert update_quick_open_index(conn, index) == len(TITLES) + 1
+    assert index.query("dijkstra")[:2] == [
+        ("fed1", other_ids[0], "Dijkstra Variants", "Codeforces"),
+        ("main", main_ids[0], "Dijkstra Shortest Path", "Codeforces"),
+    ]
+    assert update_quick_open_index(conn, index) == 0
+    # Renamed and deleted problems are applied from the changelog
+    conn.execute(
+        "UPDATE problems SET title = 'Bellman Ford' WHERE id = ?", (main_ids[0],)
+    )
+    conn.execute("DELETE FROM problems WHERE id = ?", (main_ids[4],))
+    conn.commit()
+    assert update_quick_open_index(conn, index) == 1
+    assert titles(index.query("dijkstra")) == ["Dijkstra Variants"]
+    assert titles(index.query("bellman"))[0] == "Bellman Ford"
+    assert "Two Sum" not in titles(index.query("two sum"))
+    # Changelog entries pruned before they were applied force a full reload
+    insert_problems(db, [sample_problem(0, title="Fresh Problem")])
+    conn.execute("DELETE FROM changelog WHERE seq <= ?", (index.synced_seq + 1,))
+    conn.commit()
+    assert update_quick_open_index(conn, index) == len(TITLES) + 1
+    assert titles(index.query("fresh"))[0] == "Fresh Problem"
+    conn.close()
@@ -0,0 +1,141 @@
+import random
+import sqlite3
+
+import numpy as np
+import pytest
+
+from core import (
+    SimilarityIndex,
+    code_features,
+    update_similarity_index,
+)
+from tests.conftest import insert_problems, sample_problem
+
+WORDS = [
+    "total", "count", "left", "right", "graph", "queue", "memo", "dist",
+    "parent", "weight", "answer", "limit", "prefix", "window", "stack", "seen",
+]  # fmt: skip
+
+
+def snippet(seed):
+    """A few lines of code that share little with other seeds."""
+    rng = random.Random(seed)
+    names = rng.sample(WORDS, 6)
+    lines = [f"def solve_{seed}({names[0]}, {names[1]}):"]
+    for _ in range(8):
+        a, b, c = rng.sample(names, 3)
+        op = rng.choice("+-*%")
+        lines.append(f"    {a} = {b} {op} {c} * {rng.randrange(100)}")
+    lines.append(f"    return {names[2]}")
+    return "\n".join(lines)
+
+
+def build(codes, batch=7, feature_bits=16):
+    index = SimilarityIndex(feature_bits)
+    items = [(i, *code_features(code, index.mask)) for i, code in enumerate(codes)]
+    for start in range(0, len(items), batch):
+        assert index.add(items[start : start + batch])
+    return index
+
+
+def live_df(index, codes):
+    """Document frequencies recomputed from the live documents."""
+    df = np.zeros(index.mask + 1, np.int32)
+    for impl_id in index.doc_of:
+        df[code_features(codes[impl_id], index.mask)[0]] += 1
+    return df
+
+
+def test_code_features():
+    feats, counts = code_features("a = b + c\na = b + c\n", (1 << 16) - 1)
+    # Tokens: a = b + c a = b + c -> 8 trigrams, 5 distinct
+    assert counts.sum() == 8 and len(feats) == 5
+    assert np.all(np.diff(feats) > 0)
+    assert len(code_features("")[0]) == 0
+    assert len(code_features("x")[0]) == 1
+
+
+def test_identical_and_near_duplicates_rank_first():
+    codes = [snippet(i) for i in range(60)]
+    index = build(codes)
+    for target in (0, 17, 59):
+        results = index.query(codes[target], k=5)
+        assert results[0] == (target, pytest.approx(1.0))
+        assert all(0 < sim <= 1.0 for _, sim in results)
+        assert [sim for _, sim in results] == sorted(
+            (sim for _, sim in results), reverse=True
+        )
+    # A copy with one line changed still finds its original
+    edited = codes[23].replace("return", "yield", 1)
+    best, similarity = index.query(edited, k=1)[0]
+    assert best == 23 and similarity < 1.0
+    assert 23 not in dict(index.query(codes[23], exclude=23))
+    assert index.query("") == []
+    assert SimilarityIndex(16).query(codes[0]) == []
+
+
+def test_removed_documents_are_dropped_on_merge():
+    codes = [snippet(i) for i in range(50)]
+    index = build(codes, batch=5)
+    # Segments of similar size are merged, so there are only a few of them
+    assert index.stats()["segments"] <= int(np.log2(50 / 5)) + 1
+    index.remove([3, 4, 30])
+    assert 3 not in dict(index.query(codes[3]))
+    assert len(index) == 47 and index.stats()["tombstones"] == 3
+    # Re-adding a document replaces it
+    index.add([(30, *code_features(codes[31], index.mask))])
+    codes[30] = codes[31]
+    assert {impl for impl, _ in index.query(codes[31], k=2)} == {30, 31}
+    assert index.query(codes[31], k=2)[1][1] == pytest.approx(1.0)
+    # A batch as large as the rest merges everything, dropping the postings
+    # of removed and replaced documents from the frequencies
+    index.add([(i, *code_features(codes[i], index.mask)) for i in range(10, 50)])
+    assert index.stats()["segments"] == 1
+    assert np.array_equal(index.df, live_df(index, codes))
+
+
+def test_stale_generation_is_rejected():
+    index = SimilarityIndex(16)
+    generation = index.generation
+    index.clear()
+    assert not index.add([(1, *code_features(snippet(1), index.mask))], generation)
+    assert len(index) == 0
+
+
+def test_update_from_database(db):
+    problems = [
+        sample_problem(i, solutions=[
+            {"language": "Python", "implementations": [{"code": snippet(i)}]}
+        ])
+        for i in range(30)
+    ]  # fmt: skip
+    insert_problems(db, problems)
+    conn = sqlite3.connect(db)
+    index = SimilarityIndex(16)
+    progress = []
+    assert (
+        update_similarity_index(
+            conn, index, batch_size=8, progress=lambda *p: progress.append(p)
+        )
+        == 30
+    )
+    assert progress[-1] == (30, 30)
+    assert update_similarity_index(conn, index) == 0
+    ids = [row[0] for row in conn.execute("SELECT id FROM implementations")]
+    assert index.query(snippet(4), k=1)[0][0] == ids[4]
+    # Only changed implementations are re-indexed
+    conn.execute(
+        "UPDATE implementations SET code = ? WHERE id = ?", (snippet(99), ids[4])
+    )
+    conn.execute("DELETE FROM implementations WHERE id = ?", (ids[5],))
+    conn.commit()
+    assert update_similarity_index(conn, index) == 1
+    assert index.query(snippet(99), k=1)[0] == (ids[4], pytest.approx(1.0))
+    assert ids[5] not in dict(index.query(snippet(5)))
+    assert len(index) == 29
+    # Pruned changelog entries force a full rebuild
+    conn.execute("UPDATE implementations SET notes = 'x' WHERE id = ?", (ids[6],))
+    conn.execute("DELETE FROM changelog WHERE seq <= ?", (index.synced_seq + 1,))
+    conn.commit()
+    assert update_similarity_index(conn, index) == 29
+    conn.close()
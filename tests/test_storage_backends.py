@@ -0,0 +1,176 @@
+"""Conformance checks every storage backend must pass.
+
+Expected results come from direct queries on the SQLite file and from
+``fetch_problem_trees``.
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from core import (
+    CODE_METRIC_COLUMNS,
+    DATASET_ROWS,
+    PROBLEM_GROUP_COLUMNS,
+    SHARD_FETCH_BATCH,
+    StorageBackend,
+    batched_trees,
+    decode_text,
+    fetch_problem_trees,
+    load_compression_settings,
+    open_backend,
+    set_setting,
+)
+from report import CROSSTAB_VIEWS, ColumnarDataset
+from tests.conftest import insert_problems, sample_problem
+
+PROBLEMS = 60
+
+
+@pytest.fixture
+def conn(db):
+    """The dataset with compressed text, a missing problem and orphaned rows."""
+    conn = sqlite3.connect(db)
+    c = conn.cursor()
+    set_setting(c, "compression_codec", "zlib")
+    conn.commit()
+    load_compression_settings(c)
+    ids = insert_problems(db, [sample_problem(i) for i in range(PROBLEMS)])
+    # Foreign keys are not enforced: this leaves its solutions as orphans
+    c.execute("DELETE FROM problems WHERE id = ?", (ids[5],))
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(params=["sqlite", "duckdb"])
+def backend(request, conn):
+    if request.param == "duckdb":
+        pytest.importorskip("duckdb")
+    backend = open_backend(request.param)
+    yield backend
+    backend.close()
+
+
+def problem_ids(conn):
+    return [row[0] for row in conn.execute("SELECT id FROM problems ORDER BY id")]
+
+
+def test_storage_backend_is_abstract():
+    with pytest.raises(TypeError):
+        StorageBackend()
+
+
+def test_fixture_text_is_compressed(conn):
+    code = conn.execute("SELECT code FROM implementations LIMIT 1").fetchone()[0]
+    assert isinstance(code, bytes)
+
+
+def test_counts(backend, conn):
+    expected = {
+        table: conn.execute(f"SELECT COUNT(*) FROM {DATASET_ROWS[table]}").fetchone()[0]
+        for table in DATASET_ROWS
+    }
+    assert expected["problems"] == PROBLEMS - 1
+    assert backend.counts() == expected
+
+
+def test_problem_ids(backend, conn):
+    assert backend.problem_ids() == problem_ids(conn)
+
+
+def test_fetch_problems(backend, conn):
+    ids = problem_ids(conn)
+    # Reverse order, a repeat and an ID that does not exist
+    chosen = ids[::7][::-1]
+    chosen += chosen[:1] + [ids[-1] + 1]
+    assert backend.fetch_problems(chosen) == fetch_problem_trees(conn.cursor(), chosen)
+    assert backend.fetch_problems([]) == []
+
+
+def test_full_scan(backend, conn):
+    ids = problem_ids(conn)
+    scanned = 0
+    for start, batch in enumerate(
+        batched_trees(backend.iter_problems(batch_size=7), SHARD_FETCH_BATCH)
+    ):
+        chunk = ids[start * SHARD_FETCH_BATCH : (start + 1) * SHARD_FETCH_BATCH]
+        assert batch == fetch_problem_trees(conn.cursor(), chunk)
+        scanned += len(batch)
+    assert scanned == len(ids)
+
+
+def test_group_counts(backend, conn):
+    for column in PROBLEM_GROUP_COLUMNS:
+        expected = dict(
+            conn.execute(f"SELECT {column}, COUNT(*) FROM problems GROUP BY 1")
+        )
+        assert backend.problem_counts(column) == expected
+    expected = dict(
+        conn.execute(
+            f"SELECT language, COUNT(*) FROM {DATASET_ROWS['solutions']} GROUP BY 1"
+        )
+    )
+    assert backend.language_counts() == expected
+    with pytest.raises(ValueError):
+        backend.problem_counts("code")
+
+
+def test_code_metrics(backend, conn):
+    for column in CODE_METRIC_COLUMNS:
+        count, mean, top = conn.execute(
+            f"SELECT COUNT({column}), AVG({column}), MAX({column}) "
+            f"FROM {DATASET_ROWS['implementations']}"
+        ).fetchone()
+        got_count, got_mean, got_top = backend.metric_summary(column)
+        assert (got_count, got_top) == (count, top)
+        assert got_mean == pytest.approx(mean)
+    with pytest.raises(ValueError):
+        backend.metric_summary("code")
+
+
+def test_scan_columns(backend, conn):
+    expected = [
+        (impl_id, sid, decode_text(code))
+        for impl_id, sid, code in conn.execute(
+            f"SELECT i.id, i.solution_id, i.code "
+            f"FROM {DATASET_ROWS['implementations']} ORDER BY i.id"
+        )
+    ]
+    columns = ("id", "solution_id", "code")
+    assert list(backend.scan_columns("implementations", columns)) == expected
+    with pytest.raises(ValueError):
+        list(backend.scan_columns("problems", ("id", "code")))
+
+
+def test_aggregate(backend, conn):
+    for query, _ in CROSSTAB_VIEWS.values():
+        expected = {}
+        for *key, count in conn.execute(query.format(schema="main")):
+            expected[tuple(key) if len(key) > 1 else key[0]] = count
+        assert backend.aggregate(query) == expected
+
+
+def test_columnar_dataset(backend, conn):
+    dataset = ColumnarDataset.load(backend)
+    assert dataset.backend is backend
+    assert [prob.id for prob in dataset] == problem_ids(conn)
+    sqlite = open_backend("sqlite")
+    try:
+        assert dataset.to_dicts() == ColumnarDataset.load(sqlite).to_dicts()
+    finally:
+        sqlite.close()
+
+
+def test_jsonl_export(backend, conn, tmp_path):
+    path = str(tmp_path / "export.jsonl")
+    ids = problem_ids(conn)
+    assert backend.export_jsonl(path) == len(ids)
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+    expected = [
+        json.dumps(tree, ensure_ascii=False) + "\n"
+        for tree in fetch_problem_trees(conn.cursor(), ids)
+    ]
+    assert lines == expected